@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Decoded Audio Cache
+Compares a full decode and resample against a cache hit, including the content hash
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from models.audio_io import stream_audio
+from models.audio_cache import AudioCache
+
+TARGET_SR = 16000
+SOURCE_SR = 44100
+DURATIONS = [60, 600]
+PARAMS = {'sample_rate': TARGET_SR, 'resample_type': 'soxr_hq'}
+
+
+def write_test_audio(path: str, seconds: int):
+    t = np.arange(SOURCE_SR * seconds) / SOURCE_SR
+    y = 0.2 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 2 * t) > 0)
+    sf.write(path, np.stack([y, y], axis=1).astype(np.float32), SOURCE_SR)
+
+
+def consume(blocks) -> int:
+    """Touch every sample, as window slicing does"""
+    return sum(int(np.count_nonzero(np.asarray(block))) for block in blocks)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(str(Path(tmp) / 'cache'))
+
+        print("💾 Decoded audio cache, stereo 44.1 kHz WAV to 16 kHz mono")
+        print(f"{'seconds':>8} {'decode s':>9} {'hash s':>7} {'hit s':>7} {'speedup':>8}")
+        for seconds in DURATIONS:
+            path = str(Path(tmp) / f'audio_{seconds}.wav')
+            write_test_audio(path, seconds)
+
+            consume(stream_audio(path, sr=TARGET_SR))  # warm-up
+
+            start = time.perf_counter()
+            key = cache.key(path, PARAMS)
+            hash_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            consume(cache.put_stream(key, 'pcm', stream_audio(path, sr=TARGET_SR)))
+            decode_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            key = cache.key(path, PARAMS)
+            pcm = cache.get(key)['pcm']
+            consume(pcm[i:i + 30 * TARGET_SR] for i in range(0, len(pcm), 30 * TARGET_SR))
+            hit_seconds = time.perf_counter() - start
+
+            print(f"{seconds:>8} {decode_seconds:>9.3f} {hash_seconds:>7.3f} {hit_seconds:>7.3f} "
+                  f"{decode_seconds / hit_seconds:>7.1f}x")
+
+        print(f"\nCache stats: {cache.stats()}")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Audio Decode and Resampling
+Compares decode+resample time of librosa.load against the fast path, and the
+drift each resampler introduces in the model's mel features
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import librosa
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from models.audio_io import load_audio
+
+TARGET_SR = 16000
+DURATION_SECONDS = 60
+SOURCE_RATES = [44100, 48000]
+FORMATS = ['wav', 'flac']
+RES_TYPES = ['polyphase', 'soxr_hq', 'soxr_mq', 'soxr_lq', 'soxr_qq']
+REPEATS = 3
+
+
+def write_test_audio(path: str, sr: int):
+    """Speech-like test signal: a gliding harmonic tone with noise bursts"""
+    rng = np.random.default_rng(0)
+    t = np.arange(sr * DURATION_SECONDS) / sr
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sr
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = (np.sin(2 * np.pi * 2 * t) > 0).astype(np.float32)
+    y = 0.2 * voice * envelope + 0.02 * rng.standard_normal(len(t))
+    sf.write(path, np.stack([y, y], axis=1).astype(np.float32), sr)
+
+
+def mel_db(y: np.ndarray) -> np.ndarray:
+    """The model's mel features before normalization"""
+    mel = librosa.feature.melspectrogram(y=y, sr=TARGET_SR, n_mels=128)
+    return librosa.power_to_db(mel, ref=np.max)
+
+
+def timed(fn) -> tuple:
+    fn()  # warm-up
+    timings, result = [], None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)), result
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"🔊 Decode + resample of {DURATION_SECONDS}s stereo to {TARGET_SR} Hz")
+        print(f"{'source':>12} {'path':>22} {'ms':>9} {'speedup':>8} {'mel drift dB':>13}")
+        for fmt in FORMATS:
+            for sr in SOURCE_RATES:
+                path = os.path.join(tmp, f'bench_{sr}.{fmt}')
+                write_test_audio(path, sr)
+
+                base_time, base = timed(lambda: librosa.load(path, sr=TARGET_SR)[0])
+                reference = mel_db(base)
+                label = f"{fmt} {sr // 1000}k"
+                print(f"{label:>12} {'librosa.load':>22} {base_time * 1000:>9.1f} {'1.00x':>8} {0.0:>13.3f}")
+
+                for res_type in RES_TYPES:
+                    elapsed, y = timed(lambda: load_audio(path, sr=TARGET_SR, res_type=res_type))
+                    n = min(len(y), len(base))
+                    drift = np.abs(mel_db(y[:n]) - reference[:, :mel_db(y[:n]).shape[1]]).mean()
+                    print(f"{label:>12} {'fast/' + res_type:>22} {elapsed * 1000:>9.1f} "
+                          f"{base_time / elapsed:>7.2f}x {drift:>13.3f}")
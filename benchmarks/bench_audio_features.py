@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Mel Feature Engine
+Compares per-window librosa features against the batched MelFeatureEngine
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import librosa
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from models.audio_features import MelFeatureEngine
+
+SR = 16000
+WINDOW_SAMPLES = 65536  # 4.096 s, 128 mel frames
+BATCH_SIZES = [1, 4, 16, 64]
+REPEATS = 5
+
+
+def librosa_features(y: np.ndarray) -> np.ndarray:
+    """The original per-window feature path"""
+    mel_spec = librosa.feature.melspectrogram(y=y, sr=SR, n_mels=128)
+    mel_spec_db = librosa.power_to_db(mel_spec, ref=np.max)
+    features = (mel_spec_db - np.mean(mel_spec_db)) / (np.std(mel_spec_db) + 1e-8)
+    features = features[:, :128]
+    return np.expand_dims(features.T, axis=(0, -1))
+
+
+def timed(fn) -> float:
+    fn()  # warm-up
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    engine = MelFeatureEngine(sr=SR)
+
+    print("🎛  Mel features per batch of 4.096 s windows")
+    print(f"{'windows':>8} {'librosa ms':>11} {'engine ms':>10} {'speedup':>8} {'max |diff|':>11}")
+    for batch in BATCH_SIZES:
+        windows = [rng.standard_normal(WINDOW_SAMPLES).astype(np.float32) * 0.1 for _ in range(batch)]
+
+        reference = np.concatenate([librosa_features(w) for w in windows])
+        diff = np.abs(engine.compute(windows) - reference).max()
+
+        slow = timed(lambda: [librosa_features(w) for w in windows])
+        fast = timed(lambda: engine.compute(windows))
+        print(f"{batch:>8} {slow * 1000:>11.1f} {fast * 1000:>10.1f} {slow / fast:>7.2f}x {diff:>11.2e}")
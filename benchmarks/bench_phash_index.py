@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Perceptual Hash Index
+Near-duplicate lookup latency against index size, compared with a vectorized linear scan
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from models.perceptual_hash import PerceptualIndex, MAX_DISTANCE
+
+SIZES = [10_000, 100_000, 1_000_000, 3_000_000]
+QUERIES = 2000
+
+
+def near(value: int, rng: np.random.Generator) -> int:
+    """A hash up to MAX_DISTANCE bits away, as a re-encoded copy would be"""
+    for bit in rng.choice(64, size=int(rng.integers(0, MAX_DISTANCE + 1)), replace=False):
+        value ^= 1 << int(bit)
+    return value
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    print(f"🔎 pHash near-duplicate lookup, distance <= {MAX_DISTANCE}, half hits and half misses")
+    print(f"{'entries':>9} {'build s':>8} {'index us':>9} {'scan us':>9} {'hits':>6}")
+    for size in SIZES:
+        hashes = rng.integers(0, 2 ** 63, size=size, dtype=np.int64).astype(np.uint64) * np.uint64(2) \
+            + rng.integers(0, 2, size=size).astype(np.uint64)
+        values = [int(h) for h in hashes]
+
+        start = time.perf_counter()
+        index = PerceptualIndex()
+        for i, value in enumerate(values):
+            index.add(value, i)
+        build_seconds = time.perf_counter() - start
+
+        queries = [near(values[int(i)], rng) for i in rng.integers(0, size, QUERIES // 2)]
+        queries += [int(q) for q in rng.integers(0, 2 ** 63, QUERIES // 2, dtype=np.int64)]
+
+        start = time.perf_counter()
+        hits = sum(index.query(q) is not None for q in queries)
+        index_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+        start = time.perf_counter()
+        for q in queries[:50]:
+            int(np.bitwise_count(hashes ^ np.uint64(q)).min())
+        scan_us = (time.perf_counter() - start) / 50 * 1e6
+
+        print(f"{size:>9} {build_seconds:>8.2f} {index_us:>9.1f} {scan_us:>9.1f} {hits:>6}")
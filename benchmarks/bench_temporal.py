@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Temporal Consistency Analysis
+Times analyze_temporal_consistency across clip lengths and frame sizes
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from models.temporal_analysis import analyze_temporal_consistency
+
+CLIP_LENGTHS = [8, 16, 32, 64]
+FRAME_SIZES = [(224, 224), (720, 1280)]
+REPEATS = 20
+
+
+def make_clip(length: int, height: int, width: int, seed: int = 0) -> list:
+    """Build a drifting-texture clip so flow and differences are non-trivial"""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, size=(height + length, width + length, 3), dtype=np.uint8)
+    return [np.ascontiguousarray(base[i:i + height, i:i + width]) for i in range(length)]
+
+
+def bench(length: int, height: int, width: int) -> float:
+    """Return the median milliseconds per clip"""
+    frames = make_clip(length, height, width)
+    analyze_temporal_consistency(frames)  # warm-up
+
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        analyze_temporal_consistency(frames)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+if __name__ == "__main__":
+    print("⏱  Temporal consistency benchmark")
+    print(f"{'frames':>8} {'size':>12} {'ms/clip':>10}")
+    for height, width in FRAME_SIZES:
+        for length in CLIP_LENGTHS:
+            ms = bench(length, height, width)
+            print(f"{length:>8} {f'{width}x{height}':>12} {ms:>10.2f}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Parallel Video Decoding
+Measures decode throughput and speedup of decode_frames against worker count
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from models.video_decode import probe_video, decode_frames, sample_indices
+
+WIDTH, HEIGHT = 1280, 720
+FPS = 30
+DURATION_SECONDS = 30
+WORKER_COUNTS = [1, 2, 4, 8, 16]
+
+# Frames come back downscaled, as the analysis pipeline consumes them
+MAX_SIDE = 320
+
+
+def write_test_video(path: str):
+    """Encode a moving-gradient clip so every frame differs"""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), FPS, (WIDTH, HEIGHT))
+    x = np.linspace(0, 255, WIDTH, dtype=np.float32)
+    for i in range(FPS * DURATION_SECONDS):
+        row = ((x + i * 4) % 256).astype(np.uint8)
+        frame = np.repeat(np.broadcast_to(row, (HEIGHT, WIDTH))[..., None], 3, axis=2)
+        writer.write(np.ascontiguousarray(frame))
+    writer.release()
+
+
+def bench(path: str, workers: int, indices: list, probe: dict) -> float:
+    start = time.perf_counter()
+    frames = decode_frames(path, indices, workers=workers, max_side=MAX_SIDE,
+                           parallel_min_frames=0, probe=probe)
+    elapsed = time.perf_counter() - start
+    assert len(frames) == len(indices), f"decoded {len(frames)} of {len(indices)}"
+    return elapsed
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.mp4')
+        print(f"🎬 Writing {DURATION_SECONDS}s {WIDTH}x{HEIGHT} test video...")
+        write_test_video(path)
+        probe = probe_video(path)
+
+        for label, count in [('every frame', probe['frame_count']), ('sparse 256', 256)]:
+            indices = sample_indices(probe['frame_count'], count)
+            # Warm the pool so process start-up is not timed
+            for workers in WORKER_COUNTS:
+                decode_frames(path, indices[:workers * 2], workers=workers, max_side=MAX_SIDE,
+                              parallel_min_frames=0, probe=probe)
+
+            print(f"\n⏱  {label} ({len(indices)} frames at max side {MAX_SIDE}), {os.cpu_count()} CPUs")
+            print(f"{'workers':>8} {'seconds':>9} {'frames/s':>10} {'speedup':>8}")
+            baseline = None
+            for workers in WORKER_COUNTS:
+                elapsed = bench(path, workers, indices, probe)
+                baseline = baseline or elapsed
+                print(f"{workers:>8} {elapsed:>9.2f} {len(indices) / elapsed:>10.1f} {baseline / elapsed:>8.2f}x")
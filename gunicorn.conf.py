@@ -0,0 +1,13 @@
+"""
+Gunicorn Configuration
+Loaded automatically from the working directory; command-line flags still take precedence
+"""
+
+import os
+
+
+def post_fork(server, worker):
+    """Give each worker its own synthetic-backend stream index"""
+    # age counts the workers this arbiter has spawned, so a replacement
+    # worker draws a fresh stream rather than replaying a dead one's
+    os.environ['SYNTHETIC_WORKER'] = str(worker.age)
@@ -3,22 +3,36 @@ DeepFake Detection API Server
 Flask-based REST API for deepfake analysis
 """
 
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Response, request, jsonify, render_template, send_from_directory, stream_with_context
 from flask_cors import CORS
 import os
 import uuid
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 from werkzeug.utils import secure_filename
+from werkzeug.wsgi import get_input_stream
 import mimetypes
+import queue
+import tempfile
+import threading
+import time
 from typing import Dict, List
 import traceback
 
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
 # Import our detection model with error handling
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from api.job_store import JobStore
+
 # Try to import the model, fall back to mock if not available
 try:
     from models.deepfake_detector import get_detector, analyze_file
@@ -32,7 +46,7 @@ except ImportError as e:
     def get_detector():
         return None
     
-    def analyze_file(file_path, file_type):
+    def analyze_file(file_path, file_type, options=None):
         import random
         prediction = 'authentic' if random.random() > 0.4 else 'deepfake'
         confidence = random.uniform(0.65, 0.95)
@@ -49,13 +63,6 @@ except ImportError as e:
             'processing_time': random.uniform(1, 3)
         }
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
 # Initialize Flask app with proper template and static folders
 template_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend', 'templates')
 static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend', 'static')
@@ -84,8 +91,28 @@ ALLOWED_EXTENSIONS = {
     'audio': {'mp3', 'wav', 'm4a', 'ogg', 'flac', 'aac'}
 }
 
-# Global storage for analysis jobs (in production, use a database)
-analysis_jobs = {}
+# Bytes read from a streaming upload between scoring passes
+STREAM_CHUNK_BYTES = 8192
+
+# Analysis jobs, shared by every worker process and kept across restarts
+JOB_STORE_PATH = os.environ.get('JOB_STORE_PATH',
+                                os.path.join(tempfile.gettempdir(), 'imposterscan', 'jobs.db'))
+
+# Analysis worker threads, and jobs accepted beyond this many waiting are refused
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', 2))
+MAX_QUEUED_JOBS = 1000
+
+# Seconds a client is told to wait between polls of a queued job
+POLL_INTERVAL = 1
+
+# Pending jobs queued longer ago than this (seconds) went down with the
+# process whose in-memory queue held them, and are failed when workers start
+QUEUED_JOB_TIMEOUT = float(os.environ.get('QUEUED_JOB_TIMEOUT', 3600))
+
+job_queue = queue.Queue(maxsize=MAX_QUEUED_JOBS)
+_jobs_lock = threading.Lock()
+_analysis_workers = []
+_job_store = None
 
 def allowed_file(filename: str, file_type: str = None) -> bool:
     """Check if file extension is allowed"""
@@ -128,15 +155,105 @@ def create_job_record(filename: str, file_path: str, file_type: str, file_size:
         'file_size': file_size,
         'status': 'pending',
         'created_at': datetime.now().isoformat(),
+        'queued_at': None,
         'started_at': None,
         'completed_at': None,
         'result': None,
         'error': None
     }
     
-    analysis_jobs[job_id] = job_record
+    get_job_store().create(job_record)
     return job_id
 
+def get_job_store() -> JobStore:
+    """
+    The job store, opened on first use
+    
+    Not at import: gunicorn --preload imports the app before forking, and
+    a SQLite connection must not be shared across a fork.
+    """
+    global _job_store
+    store = _job_store
+    if store is None:
+        with _jobs_lock:
+            store = _job_store
+            if store is None:
+                store = _job_store = JobStore(JOB_STORE_PATH)
+    return store
+
+def run_analysis_job(job_id: str, options: Dict):
+    """Analyze a queued job's file and record the outcome on the job"""
+    store = get_job_store()
+    job = store.get(job_id)
+    if job is None or not store.update(job_id, expect_status='pending', status='processing',
+                                       started_at=datetime.now().isoformat()):
+        logger.warning(f"Skipping job {job_id}: no longer pending")
+        return
+    
+    logger.info(f"Starting analysis for job {job_id}")
+    
+    # Jobs still waiting when this one starts; video analysis samples fewer
+    # frames under load
+    options = {**options, 'queue_depth': job_queue.qsize()}
+    
+    try:
+        result = analyze_file(job['file_path'], job['file_type'], options)
+        
+        # Synthetic results stand in for model time; spend it here on the
+        # analysis worker rather than on a request thread
+        simulated = result.get('simulated_latency')
+        if simulated:
+            time.sleep(simulated)
+        
+        store.update(job_id, status='completed', completed_at=datetime.now().isoformat(), result=result)
+        
+        logger.info(f"Analysis completed for job {job_id}: {result['prediction']} ({result['confidence']:.2f})")
+        
+    except Exception as e:
+        store.update(job_id, status='failed', completed_at=datetime.now().isoformat(), error=str(e))
+        
+        logger.error(f"Analysis failed for job {job_id}: {str(e)}")
+
+def _analysis_worker():
+    """Run queued jobs one at a time, forever"""
+    while True:
+        job_id, options = job_queue.get()
+        try:
+            run_analysis_job(job_id, options)
+        except Exception as e:
+            logger.error(f"Analysis worker error on job {job_id}: {str(e)}")
+        finally:
+            job_queue.task_done()
+
+def fail_stale_jobs() -> int:
+    """Fail pending jobs queued before QUEUED_JOB_TIMEOUT so their pollers stop waiting"""
+    now = datetime.now()
+    failed = get_job_store().fail_stale(
+        (now - timedelta(seconds=QUEUED_JOB_TIMEOUT)).isoformat(),
+        completed_at=now.isoformat(),
+        error='Analysis was lost before it started; please submit the file again'
+    )
+    if failed:
+        logger.warning(f"Failed {len(failed)} queued jobs older than {QUEUED_JOB_TIMEOUT:.0f}s")
+    return len(failed)
+
+def start_analysis_workers():
+    """
+    Start the analysis worker threads if this process has none yet
+    
+    Called on first use rather than at import: gunicorn --preload imports
+    the app before forking, and threads do not survive a fork. Jobs left
+    queued by a process that exited are failed first.
+    """
+    with _jobs_lock:
+        if not any(worker.is_alive() for worker in _analysis_workers):
+            fail_stale_jobs()
+            _analysis_workers.clear()
+            for i in range(ANALYSIS_WORKERS):
+                worker = threading.Thread(target=_analysis_worker, name=f'analysis-worker-{i}', daemon=True)
+                worker.start()
+                _analysis_workers.append(worker)
+
 @app.route('/')
 def index():
     """Serve the main application"""
@@ -231,7 +348,11 @@ def model_status():
                 'audio': {'status': 'active', 'loaded': detector.models.get('audio') is not None}
             },
             'performance': detector.get_model_performance(),
-            'statistics': detector.get_prediction_stats()
+            'statistics': detector.get_prediction_stats(),
+            'audio_cache': detector.get_cache_stats(),
+            'result_cache': detector.get_result_cache_stats(),
+            'cascade': detector.get_cascade_stats(),
+            'stage_timing': detector.get_stage_stats()
         })
     except Exception as e:
         return jsonify({
@@ -287,7 +408,7 @@ def upload_file():
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
-    """Start analysis of uploaded file"""
+    """Queue analysis of an uploaded file; poll /api/jobs/<job_id> for the result"""
     try:
         data = request.get_json()
         
@@ -296,63 +417,126 @@ def analyze():
         
         job_id = data['job_id']
         
-        if job_id not in analysis_jobs:
-            return jsonify({'error': 'Job not found'}), 404
+        store = get_job_store()
+        job = store.get(job_id)
         
-        job = analysis_jobs[job_id]
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
         
         if job['status'] != 'pending':
             return jsonify({'error': f'Job already {job["status"]}'}), 400
         
-        # Update job status
-        job['status'] = 'processing'
-        job['started_at'] = datetime.now().isoformat()
+        # Optional per-request latency target (seconds) for video analysis
+        options = {}
+        if 'latency_target' in data:
+            try:
+                options['latency_target'] = float(data['latency_target'])
+            except (TypeError, ValueError):
+                return jsonify({'error': 'latency_target must be a number'}), 400
+        
+        # Optional cascaded early exit for images and videos
+        if 'cascade' in data:
+            if not isinstance(data['cascade'], bool):
+                return jsonify({'error': 'cascade must be a boolean'}), 400
+            options['cascade'] = data['cascade']
+        
+        # Optional voice-activity gate for audio: on/off or individual settings
+        if 'vad' in data:
+            if not isinstance(data['vad'], (bool, dict)):
+                return jsonify({'error': 'vad must be a boolean or an object'}), 400
+            options['vad'] = data['vad']
+        
+        # Queue the job; a worker moves it through processing to completed or failed
+        start_analysis_workers()
+        if not store.mark_queued(job_id, datetime.now().isoformat()):
+            return jsonify({'error': 'Job already queued'}), 400
+        try:
+            job_queue.put_nowait((job_id, options))
+        except queue.Full:
+            store.update(job_id, queued_at=None)
+            return jsonify({'error': 'Analysis queue is full, try again later'}), 503, {'Retry-After': '30'}
         
-        logger.info(f"Starting analysis for job {job_id}")
+        logger.info(f"Queued analysis for job {job_id}")
         
-        try:
-            # Perform analysis
-            result = analyze_file(job['file_path'], job['file_type'])
-            
-            # Update job with results
-            job['status'] = 'completed'
-            job['completed_at'] = datetime.now().isoformat()
-            job['result'] = result
-            
-            logger.info(f"Analysis completed for job {job_id}: {result['prediction']} ({result['confidence']:.2f})")
-            
-            return jsonify({
-                'job_id': job_id,
-                'status': 'completed',
-                'result': result
-            })
-            
-        except Exception as e:
-            # Handle analysis error
-            job['status'] = 'failed'
-            job['error'] = str(e)
-            job['completed_at'] = datetime.now().isoformat()
-            
-            logger.error(f"Analysis failed for job {job_id}: {str(e)}")
-            
-            return jsonify({
-                'job_id': job_id,
-                'status': 'failed',
-                'error': str(e)
-            }), 500
+        status_url = f'/api/jobs/{job_id}'
+        return jsonify({
+            'job_id': job_id,
+            'status': 'pending',
+            'status_url': status_url,
+            'queue_depth': job_queue.qsize()
+        }), 202, {'Location': status_url, 'Retry-After': str(POLL_INTERVAL)}
             
     except Exception as e:
         logger.error(f"Analysis request failed: {str(e)}")
         return jsonify({'error': 'Analysis failed', 'details': str(e)}), 500
 
+@app.route('/api/stream/audio', methods=['POST'])
+def stream_audio_analysis():
+    """
+    Score raw PCM audio as it is uploaded
+    
+    The request body is chunked raw PCM described by the query parameters
+    sample_rate (default 16000), channels (default 1), format ('f32le' or
+    's16le', default 'f32le') and vad ('true' or 'false'). The response is
+    newline-delimited JSON: one 'window' event as soon as each analysis
+    window is complete, then a final 'summary' event. Server-side state is
+    one window, so the upload size limit does not apply to streams.
+    """
+    if not MODEL_AVAILABLE:
+        return jsonify({'error': 'Streaming analysis requires the detection models'}), 503
+    
+    try:
+        sample_rate = int(request.args.get('sample_rate', 16000))
+        channels = int(request.args.get('channels', 1))
+    except ValueError:
+        return jsonify({'error': 'sample_rate and channels must be integers'}), 400
+    
+    options = {}
+    if 'vad' in request.args:
+        vad = request.args['vad'].lower()
+        if vad not in ('true', 'false'):
+            return jsonify({'error': 'vad must be true or false'}), 400
+        options['vad'] = vad == 'true'
+    
+    try:
+        session = get_detector().open_audio_stream(
+            sample_rate=sample_rate,
+            channels=channels,
+            sample_format=request.args.get('format', 'f32le'),
+            options=options
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    body = get_input_stream(request.environ, max_content_length=None)
+    
+    def generate():
+        try:
+            while True:
+                chunk = body.read(STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                for event in session.feed(chunk):
+                    yield json.dumps({'event': 'window', **event}) + '\n'
+            
+            events, summary = session.close()
+            for event in events:
+                yield json.dumps({'event': 'window', **event}) + '\n'
+            yield json.dumps({'event': 'summary', **summary}) + '\n'
+        except Exception as e:
+            logger.error(f"Streaming analysis failed: {str(e)}")
+            yield json.dumps({'event': 'error', 'error': str(e)}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/api/jobs/<job_id>', methods=['GET'])
 def get_job_status(job_id: str):
     """Get job status and results"""
     try:
-        if job_id not in analysis_jobs:
-            return jsonify({'error': 'Job not found'}), 404
+        job = get_job_store().get(job_id)
         
-        job = analysis_jobs[job_id]
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
         
         response_data = {
             'job_id': job['id'],
@@ -361,6 +545,7 @@ def get_job_status(job_id: str):
             'file_size': job['file_size'],
             'status': job['status'],
             'created_at': job['created_at'],
+            'queued_at': job['queued_at'],
             'started_at': job['started_at'],
             'completed_at': job['completed_at']
         }
@@ -379,38 +564,27 @@ def get_job_status(job_id: str):
 
 @app.route('/api/jobs', methods=['GET'])
 def list_jobs():
-    """List all analysis jobs"""
+    """List analysis jobs, newest first; filter by status or file_type, page by offset or cursor"""
     try:
         # Get query parameters
         limit = min(int(request.args.get('limit', 50)), 100)  # Max 100
         offset = int(request.args.get('offset', 0))
-        status_filter = request.args.get('status')
-        
-        # Filter and sort jobs
-        jobs_list = list(analysis_jobs.values())
-        
-        if status_filter:
-            jobs_list = [job for job in jobs_list if job['status'] == status_filter]
-        
-        # Sort by creation time (newest first)
-        jobs_list.sort(key=lambda x: x['created_at'], reverse=True)
-        
-        # Apply pagination
-        total = len(jobs_list)
-        paginated_jobs = jobs_list[offset:offset + limit]
+        cursor = request.args.get('cursor')
         
-        # Remove sensitive file paths
-        for job in paginated_jobs:
-            job_copy = job.copy()
-            if 'file_path' in job_copy:
-                del job_copy['file_path']
-            paginated_jobs[paginated_jobs.index(job)] = job_copy
+        jobs, total, next_cursor = get_job_store().page(
+            limit=limit,
+            offset=offset,
+            status=request.args.get('status'),
+            file_type=request.args.get('file_type'),
+            cursor=cursor
+        )
         
         return jsonify({
-            'jobs': paginated_jobs,
+            'jobs': jobs,
             'total': total,
             'limit': limit,
-            'offset': offset
+            'offset': offset,
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
@@ -459,10 +633,11 @@ def get_statistics():
     """Get system statistics"""
     try:
         # Basic job statistics
-        total_jobs = len(analysis_jobs)
-        completed_jobs = sum(1 for job in analysis_jobs.values() if job['status'] == 'completed')
-        pending_jobs = sum(1 for job in analysis_jobs.values() if job['status'] == 'pending')
-        failed_jobs = sum(1 for job in analysis_jobs.values() if job['status'] == 'failed')
+        job_counts = get_job_store().counts()
+        total_jobs = sum(job_counts.values())
+        completed_jobs = job_counts['completed']
+        pending_jobs = job_counts['pending']
+        failed_jobs = job_counts['failed']
         
         stats = {
             'total_jobs': total_jobs,
@@ -481,6 +656,8 @@ def get_statistics():
                 if detector:
                     detector_stats = detector.get_prediction_stats()
                     stats.update(detector_stats)
+                    # Last 24 hours across every worker process
+                    stats['history'] = detector.get_history_summary()
             except:
                 pass
         else:
@@ -499,10 +676,37 @@ def get_statistics():
         logger.error(f"Failed to get statistics: {str(e)}")
         return jsonify({
             'error': 'Failed to get statistics',
-            'total_jobs': len(analysis_jobs),
             'server_status': 'running'
         }), 200
 
+@app.route('/api/statistics/history', methods=['GET'])
+def get_statistics_history():
+    """Prediction counts per minute or hour bucket from the durable history"""
+    resolution = request.args.get('resolution', 'hour')
+    if resolution not in ('minute', 'hour'):
+        return jsonify({'error': 'resolution must be minute or hour'}), 400
+    try:
+        hours = float(request.args.get('hours', 24))
+    except ValueError:
+        return jsonify({'error': 'hours must be a number'}), 400
+    
+    if not MODEL_AVAILABLE:
+        return jsonify({'resolution': resolution, 'hours': hours, 'buckets': []})
+    
+    try:
+        detector = get_detector()
+        until = datetime.now().timestamp()
+        since = until - hours * 3600
+        return jsonify({
+            'resolution': resolution,
+            'hours': hours,
+            'summary': detector.get_history_summary(since, until),
+            'buckets': detector.get_history_series(resolution, since, until)
+        })
+    except Exception as e:
+        logger.error(f"Failed to get statistics history: {str(e)}")
+        return jsonify({'error': 'Failed to get statistics history'}), 500
+
 @app.errorhandler(413)
 def file_too_large(error):
     """Handle file too large error"""
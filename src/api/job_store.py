@@ -0,0 +1,245 @@
+"""
+Analysis Job Store
+SQLite table of analysis jobs with indexed, paginated listing shared by every worker process
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ('pending', 'processing', 'completed', 'failed')
+
+COLUMNS = ('id', 'filename', 'file_path', 'file_type', 'file_size', 'status',
+           'created_at', 'queued_at', 'started_at', 'completed_at', 'result', 'error')
+
+# Every column a listing returns; file paths stay on the server
+LISTED = tuple(column for column in COLUMNS if column != 'file_path')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    file_size INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    queued_at TEXT,
+    started_at TEXT,
+    completed_at TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at, id);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at, id);
+CREATE INDEX IF NOT EXISTS jobs_file_type ON jobs (file_type, created_at, id);
+CREATE TABLE IF NOT EXISTS job_counts (
+    status TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (status, file_type)
+) WITHOUT ROWID;
+"""
+
+
+class JobStore:
+    """
+    Analysis jobs on local disk, readable and writable by every worker process
+
+    Listings walk one index newest first: (created_at, id), or the
+    (status, ...) or (file_type, ...) index when filtered. A page costs
+    its own rows, and memory holds one page however many jobs there
+    are. Callers paging deep should pass the returned cursor rather than
+    an offset, since SQLite still steps over skipped rows. Per status and
+    file type counts live in 'job_counts' and are updated in the same
+    transaction as the job, so totals never count rows. WAL mode lets
+    readers run alongside the writer.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file, created if missing
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _write(self, statements):
+        """Call statements(conn) in one IMMEDIATE transaction and return what it returns"""
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = statements(conn)
+                conn.execute("COMMIT")
+                return result
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _count(conn, status: str, file_type: str, delta: int):
+        conn.execute(
+            "INSERT INTO job_counts (status, file_type, count) VALUES (?, ?, ?) "
+            "ON CONFLICT (status, file_type) DO UPDATE SET count = count + excluded.count",
+            (status, file_type, delta)
+        )
+
+    def create(self, job: Dict):
+        """Add a job; missing columns are NULL"""
+        row = {column: job.get(column) for column in COLUMNS}
+        row['result'] = json.dumps(row['result']) if row['result'] is not None else None
+
+        def insert(conn):
+            conn.execute(f"INSERT INTO jobs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                         [row[column] for column in COLUMNS])
+            self._count(conn, row['status'], row['file_type'], 1)
+
+        self._write(insert)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """A job with its result decoded, or None"""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._decode(COLUMNS, row) if row is not None else None
+
+    def update(self, job_id: str, expect_status: Optional[str] = None, **fields) -> bool:
+        """
+        Set some of a job's columns
+
+        Args:
+            job_id: Job to change
+            expect_status: Only change the job while it has this status
+            fields: Columns to set; 'result' is stored as JSON
+
+        Returns:
+            Whether the job was changed
+        """
+        unknown = set(fields) - set(COLUMNS[1:])
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        if 'result' in fields and fields['result'] is not None:
+            fields['result'] = json.dumps(fields['result'])
+
+        def apply(conn):
+            old = conn.execute("SELECT status, file_type FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if old is None or (expect_status is not None and old[0] != expect_status):
+                return False
+            conn.execute(f"UPDATE jobs SET {', '.join(f'{name} = ?' for name in fields)} WHERE id = ?",
+                         [*fields.values(), job_id])
+            status = fields.get('status', old[0])
+            file_type = fields.get('file_type', old[1])
+            if (status, file_type) != tuple(old):
+                self._count(conn, old[0], old[1], -1)
+                self._count(conn, status, file_type, 1)
+            return True
+
+        return self._write(apply)
+
+    def mark_queued(self, job_id: str, queued_at: str) -> bool:
+        """Claim a pending, not yet queued job for the queue; False if it is taken or gone"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET queued_at = ? WHERE id = ? AND status = 'pending' AND queued_at IS NULL",
+                (queued_at, job_id)
+            )
+        return cursor.rowcount == 1
+
+    def fail_stale(self, queued_before: str, completed_at: str, error: str) -> List[str]:
+        """
+        Fail pending jobs queued before a time
+
+        Returns:
+            Ids of the jobs failed
+        """
+        def apply(conn):
+            rows = conn.execute("SELECT id, file_type FROM jobs WHERE status = 'pending' AND queued_at < ?",
+                                (queued_before,)).fetchall()
+            for job_id, file_type in rows:
+                conn.execute("UPDATE jobs SET status = 'failed', completed_at = ?, error = ? WHERE id = ?",
+                             (completed_at, error, job_id))
+                self._count(conn, 'pending', file_type, -1)
+                self._count(conn, 'failed', file_type, 1)
+            return [job_id for job_id, _ in rows]
+
+        return self._write(apply)
+
+    def page(self, limit: int = 50, offset: int = 0, status: Optional[str] = None,
+             file_type: Optional[str] = None, cursor: Optional[str] = None) -> Tuple[List[Dict], int, Optional[str]]:
+        """
+        One page of jobs, newest first, without file paths
+
+        Args:
+            limit: Jobs per page
+            offset: Jobs to skip; prefer cursor for deep pages
+            status: Only jobs with this status
+            file_type: Only jobs of this file type
+            cursor: Continue after the page that returned it
+
+        Returns:
+            (jobs, total matching jobs, cursor for the next page or None)
+        """
+        where, params = self._filters(status, file_type)
+        if cursor:
+            created_at, _, job_id = cursor.rpartition('|')
+            where.append("(created_at, id) < (?, ?)")
+            params.extend([created_at, job_id])
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(LISTED)} FROM jobs {clause} "
+                f"ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                [*params, limit, offset]
+            ).fetchall()
+            total = self._total(status, file_type)
+
+        jobs = [self._decode(LISTED, row) for row in rows]
+        next_cursor = f"{jobs[-1]['created_at']}|{jobs[-1]['id']}" if len(jobs) == limit else None
+        return jobs, total, next_cursor
+
+    @staticmethod
+    def _filters(status: Optional[str], file_type: Optional[str]) -> Tuple[List[str], List]:
+        where, params = [], []
+        for column, value in (('status', status), ('file_type', file_type)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        return where, params
+
+    def _total(self, status: Optional[str], file_type: Optional[str]) -> int:
+        where, params = self._filters(status, file_type)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        return self._conn.execute(f"SELECT COALESCE(SUM(count), 0) FROM job_counts {clause}", params).fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        """Jobs per status, every status included"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, SUM(count) FROM job_counts GROUP BY status").fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(rows)
+        return counts
+
+    @staticmethod
+    def _decode(columns, row) -> Dict:
+        job = dict(zip(columns, row))
+        if job.get('result') is not None:
+            job['result'] = json.loads(job['result'])
+        return job
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
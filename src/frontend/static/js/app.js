@@ -633,7 +633,7 @@ class DeepFakeApp {
   }
 
   /**
-   * Start analysis on server
+   * Start analysis on server and wait for the queued job to finish
    */
   async startServerAnalysis(jobId) {
     const response = await fetch('/api/analyze', {
@@ -650,7 +650,31 @@ class DeepFakeApp {
     }
     
     const data = await response.json();
-    return data.result;
+    const pollSeconds = Number(response.headers.get('Retry-After')) || 1;
+    return this.pollJobResult(data.status_url || `/api/jobs/${jobId}`, pollSeconds);
+  }
+
+  /**
+   * Poll a queued job until a worker completes or fails it
+   */
+  async pollJobResult(statusUrl, pollSeconds) {
+    while (true) {
+      await new Promise(resolve => setTimeout(resolve, pollSeconds * 1000));
+      
+      const response = await fetch(statusUrl);
+      if (!response.ok) {
+        const error = await response.json();
+        throw new Error(`Analysis failed: ${error.error || 'Unknown error'}`);
+      }
+      
+      const job = await response.json();
+      if (job.status === 'completed') {
+        return job.result;
+      }
+      if (job.status === 'failed') {
+        throw new Error(`Analysis failed: ${job.error || 'Unknown error'}`);
+      }
+    }
   }
 
   /**
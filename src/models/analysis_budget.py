@@ -0,0 +1,188 @@
+"""
+Analysis Budget
+Per-analysis limits on wall time, decoded pixels, decoded audio samples and held memory
+"""
+
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+# Default limits for one analysis, inside gunicorn's 300 s timeout
+WALL_SECONDS = 240.0
+PIXELS = 1_000_000_000
+AUDIO_SAMPLES = 16000 * 3600
+MEMORY_MB = 2048
+
+_current_budget = contextvars.ContextVar('analysis_budget', default=None)
+
+
+class BudgetExceeded(RuntimeError):
+    """An analysis ran out of one of its resource budgets"""
+
+    def __init__(self, resource: str, used: float, limit: float):
+        super().__init__(f"{resource} budget exceeded ({used:.6g} > {limit:.6g})")
+        self.resource = resource
+        self.used = used
+        self.limit = limit
+
+
+class AnalysisBudget:
+    """
+    Resource limits for one analysis, enforced cooperatively
+
+    Decoders call in at checkpoints: before decoding they ask how much of
+    their input still fits, and charge what they decode. A stage that can
+    work on less input (fewer video frames, a shorter stretch of audio)
+    takes what fits and records a truncation, so the analysis returns a
+    partial result; a stage that cannot raises BudgetExceeded. Memory
+    counts decoded media buffers while they are held, not process RSS.
+    Limits of None are unlimited. Thread-safe, so concurrent ensemble
+    branches share one budget.
+    """
+
+    def __init__(self, wall_seconds: Optional[float] = WALL_SECONDS, pixels: Optional[int] = PIXELS,
+                 audio_samples: Optional[int] = AUDIO_SAMPLES, memory_mb: Optional[float] = MEMORY_MB):
+        self.limits = {
+            'wall_seconds': wall_seconds,
+            'pixels': pixels,
+            'audio_samples': audio_samples,
+            'memory_bytes': memory_mb * 1024 ** 2 if memory_mb is not None else None
+        }
+        self.started = time.monotonic()
+        self.used = {'pixels': 0, 'audio_samples': 0, 'memory_bytes': 0}
+        self.peak_memory = 0
+        self.exceeded: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self, resource: str) -> float:
+        """What is left of one resource; inf when it has no limit"""
+        limit = self.limits[resource]
+        if limit is None:
+            return float('inf')
+        used = self.elapsed() if resource == 'wall_seconds' else self.used[resource]
+        return limit - used
+
+    def expired(self) -> bool:
+        return self.remaining('wall_seconds') <= 0
+
+    def check(self):
+        """
+        Wall-time checkpoint
+
+        Raises:
+            BudgetExceeded: If the analysis has run past its wall-time limit
+        """
+        if self.expired():
+            self.exceed('wall_seconds')
+
+    def fits(self, resource: str, amount: float) -> bool:
+        return amount <= self.remaining(resource)
+
+    def fit(self, count: int, **unit_costs: float) -> int:
+        """
+        How many units of work fit in what is left
+
+        Args:
+            count: Units wanted (frames, samples, ...)
+            unit_costs: Cost of one unit per resource, e.g. pixels=w * h
+
+        Returns:
+            count, or fewer when a resource runs short, in which case the
+            truncation is recorded
+
+        Raises:
+            BudgetExceeded: If the wall time is up or not even one unit fits
+        """
+        self.check()
+        fits, limiting = count, None
+        for resource, cost in unit_costs.items():
+            if cost > 0:
+                n = int(self.remaining(resource) // cost)
+                if n < fits:
+                    fits, limiting = n, resource
+        if fits <= 0 < count:
+            self.exceed(limiting, unit_costs[limiting])
+        if fits < count:
+            self.truncate(limiting)
+        return fits
+
+    def charge(self, resource: str, amount: float):
+        """
+        Count decoded work against a budget
+
+        Raises:
+            BudgetExceeded: If it does not fit what is left
+        """
+        with self._lock:
+            if not self.fits(resource, amount):
+                self.exceed(resource, amount)
+            self.used[resource] += amount
+            if resource == 'memory_bytes':
+                self.peak_memory = max(self.peak_memory, self.used[resource])
+
+    def hold(self, nbytes: int):
+        """Take a decoded buffer's bytes until release()"""
+        self.charge('memory_bytes', nbytes)
+
+    def release(self, nbytes: int):
+        with self._lock:
+            self.used['memory_bytes'] = max(0, self.used['memory_bytes'] - nbytes)
+
+    def truncate(self, resource: str):
+        """Record that a stage stopped short because a resource ran out"""
+        if self.exceeded is None:
+            self.exceeded = resource
+
+    def exceed(self, resource: str, amount: float = 0):
+        """Record the overrun and abort the stage"""
+        self.truncate(resource)
+        if resource == 'wall_seconds':
+            used = self.elapsed()
+        else:
+            used = self.used[resource] + amount
+        raise BudgetExceeded(resource, used, self.limits[resource])
+
+    def summary(self) -> Dict:
+        """Limits, usage so far and the resource that ran out first, if any"""
+        def mb(value):
+            return round(value / 1024 ** 2, 3) if value is not None else None
+
+        limits = {name: self.limits[name] for name in ('wall_seconds', 'pixels', 'audio_samples')}
+        limits['memory_mb'] = mb(self.limits['memory_bytes'])
+        return {
+            'limits': limits,
+            'used': {
+                'wall_seconds': round(self.elapsed(), 6),
+                'pixels': int(self.used['pixels']),
+                'audio_samples': int(self.used['audio_samples']),
+                'peak_memory_mb': mb(self.peak_memory)
+            },
+            'exceeded': self.exceeded
+        }
+
+
+@contextmanager
+def budgeting(budget: Optional[AnalysisBudget]) -> Iterator[Optional[AnalysisBudget]]:
+    """Make a budget the one checkpoints charge for the current context"""
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def current_budget() -> Optional[AnalysisBudget]:
+    """The active budget, or None outside budgeting()"""
+    return _current_budget.get()
+
+
+def checkpoint():
+    """Abort the current analysis if it is out of wall time; a no-op without a budget"""
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.check()
@@ -0,0 +1,203 @@
+"""
+Decoded Audio Cache
+Content-addressed disk cache of resampled PCM and mel features stored as memory-mapped .npy files
+"""
+
+import os
+import json
+import uuid
+import hashlib
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per step while hashing a file
+HASH_BLOCK = 1 << 20
+
+MAX_BYTES = 2 * 1024 ** 3
+
+_digests = contextvars.ContextVar('file_digests', default=None)
+
+
+@contextmanager
+def hashing() -> Iterator[Dict[str, str]]:
+    """
+    Hash each file at most once in the current context
+
+    One analysis keys both the result cache and the audio cache by the
+    file's content hash; inside this block the second lookup reuses the
+    first digest instead of reading the file again.
+    """
+    token = _digests.set({})
+    try:
+        yield _digests.get()
+    finally:
+        _digests.reset(token)
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 of a file's contents, remembered for the rest of a hashing() block"""
+    memo = _digests.get()
+    if memo is not None and file_path in memo:
+        return memo[file_path]
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    if memo is not None:
+        memo[file_path] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+class AudioCache:
+    """
+    Size-bounded LRU cache of decoded audio arrays on disk
+
+    An entry is a group of named arrays (e.g. 'pcm', or 'features' plus the
+    voice-activity arrays) saved as <key>.<name>.npy and read back with
+    mmap_mode='r', so a hit costs page faults rather than a decode. Keys
+    combine the file's content hash with the decode and feature parameters.
+    Entries are written to a temporary name and renamed into place, and
+    recency is the newest file mtime in a group, so several processes can
+    share one directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, file_path: str, params: Dict) -> str:
+        """Cache key for a file's content under the given decode/feature parameters"""
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(f"{file_digest(file_path)}:{encoded}".encode()).hexdigest()
+
+    def _path(self, key: str, name: str) -> str:
+        return os.path.join(self.directory, f"{key}.{name}.npy")
+
+    def get(self, key: str, names=('pcm',)) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Memory-map every named array of an entry
+
+        Returns:
+            Dict of read-only memmaps, or None (a miss) if any part is missing
+        """
+        try:
+            arrays = {name: np.load(self._path(key, name), mmap_mode='r') for name in names}
+            for name in names:
+                os.utime(self._path(key, name))
+        except (FileNotFoundError, ValueError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return arrays
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray]):
+        """Store an entry, then evict least recently used entries over max_bytes"""
+        for name, array in arrays.items():
+            tmp = os.path.join(self.directory, f".{uuid.uuid4().hex}.tmp.npy")
+            np.save(tmp, np.ascontiguousarray(array))
+            os.replace(tmp, self._path(key, name))
+        self._evict()
+
+    def put_stream(self, key: str, name: str, blocks: Iterator[np.ndarray],
+                   dtype=np.float32) -> Iterator[np.ndarray]:
+        """
+        Pass 1-D blocks through while spooling them to disk
+
+        The entry is stored only if the iterator is consumed to the end, so a
+        consumer that stops early leaves no partial entry behind.
+        """
+        spool = os.path.join(self.directory, f".{uuid.uuid4().hex}.spool")
+        total = 0
+        completed = False
+        try:
+            with open(spool, 'wb') as f:
+                for block in blocks:
+                    f.write(np.ascontiguousarray(block, dtype=dtype).tobytes())
+                    total += len(block)
+                    yield block
+            completed = True
+        finally:
+            if completed:
+                self._finalize_spool(spool, key, name, total, dtype)
+            if os.path.exists(spool):
+                os.remove(spool)
+
+    def _finalize_spool(self, spool: str, key: str, name: str, length: int, dtype):
+        tmp = os.path.join(self.directory, f".{uuid.uuid4().hex}.tmp.npy")
+        try:
+            out = np.lib.format.open_memmap(tmp, mode='w+', dtype=dtype, shape=(length,))
+            if length:
+                out[:] = np.memmap(spool, dtype=dtype, mode='r', shape=(length,))
+            out.flush()
+            del out
+            os.replace(tmp, self._path(key, name))
+        except OSError as e:
+            logger.warning(f"Could not store cached audio: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self._evict()
+
+    def _entries(self) -> Dict[str, Dict]:
+        """Size and last use per key"""
+        entries = {}
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.startswith('.') or not item.name.endswith('.npy'):
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                key = item.name.split('.', 1)[0]
+                entry = entries.setdefault(key, {'bytes': 0, 'used': 0.0, 'paths': []})
+                entry['bytes'] += stat.st_size
+                entry['used'] = max(entry['used'], stat.st_mtime)
+                entry['paths'].append(item.path)
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(e['bytes'] for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]['used']):
+            if total <= self.max_bytes:
+                break
+            for path in entries[key]['paths']:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= entries[key]['bytes']
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current disk usage"""
+        entries = self._entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(entries),
+                'bytes': sum(e['bytes'] for e in entries.values()),
+                'max_bytes': self.max_bytes
+            }
@@ -0,0 +1,145 @@
+"""
+Mel Feature Engine
+Batched STFT and mel-spectrogram features with a precomputed filterbank and window
+"""
+
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import librosa
+from scipy import fft, signal
+
+# Matches librosa.power_to_db defaults
+AMIN = 1e-10
+TOP_DB = 80.0
+
+
+class MelFeatureEngine:
+    """
+    Computes the audio model's normalized mel features for many windows at once
+
+    Produces the same features as librosa.feature.melspectrogram followed by
+    power_to_db(ref=np.max), per-window standardization and padding or
+    truncation to a fixed frame count, but builds the filterbank and window
+    once and runs the STFT and mel projection for a whole batch in single
+    vectorized calls. Intermediate buffers are reused per thread.
+
+    compute_with_activity also returns per-frame energy and spectral flux,
+    taken from the same spectra, for voice-activity gating.
+    """
+
+    def __init__(self, sr: int = 16000, n_mels: int = 128, n_fft: int = 2048,
+                 hop_length: int = 512, frames: int = 128):
+        self.sr = sr
+        self.n_mels = n_mels
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.frames = frames
+
+        self.mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels).astype(np.float32)
+        self.window = signal.get_window('hann', n_fft, fftbins=True).astype(np.float32)
+        # Scales summed one-sided power to the frame's mean square
+        self._energy_scale = 2.0 / (n_fft * float(np.sum(self.window ** 2)))
+        self._local = threading.local()
+
+    def _buffers(self, batch: int, n_frames: int) -> Dict[str, np.ndarray]:
+        """Per-thread scratch arrays, reallocated only when the batch shape changes"""
+        key = (batch, n_frames)
+        cache = getattr(self._local, 'buffers', None)
+        if cache is None or cache['key'] != key:
+            cache = {
+                'key': key,
+                'framed': np.empty((batch, n_frames, self.n_fft), dtype=np.float32),
+                'power': np.empty((batch, n_frames, self.n_fft // 2 + 1), dtype=np.float32),
+                'mel': np.empty((batch, n_frames, self.n_mels), dtype=np.float32)
+            }
+            self._local.buffers = cache
+        return cache
+
+    def _mel_power(self, windows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Mel power spectrogram (batch, n_frames, n_mels) of equal-length windows,
+        plus each frame's energy in dBFS (batch, n_frames)
+        """
+        pad = self.n_fft // 2
+        padded = np.pad(windows.astype(np.float32, copy=False), ((0, 0), (pad, pad)))
+        if padded.shape[1] < self.n_fft:
+            padded = np.pad(padded, ((0, 0), (0, self.n_fft - padded.shape[1])))
+
+        frames = np.lib.stride_tricks.sliding_window_view(padded, self.n_fft, axis=1)[:, ::self.hop_length]
+        buffers = self._buffers(windows.shape[0], frames.shape[1])
+
+        np.multiply(frames, self.window, out=buffers['framed'])
+        spectrum = fft.rfft(buffers['framed'], axis=-1, overwrite_x=True)
+
+        power = buffers['power']
+        np.square(spectrum.real, out=power)
+        power += np.square(spectrum.imag)
+
+        energy_db = 10.0 * np.log10(np.maximum(power.sum(axis=-1) * self._energy_scale, AMIN))
+        return np.matmul(power, self.mel_basis.T, out=buffers['mel']), energy_db
+
+    def _log_mel(self, mel: np.ndarray) -> np.ndarray:
+        """power_to_db(ref=max) with the top_db floor, per window"""
+        log_spec = 10.0 * np.log10(np.maximum(mel, AMIN))
+        peak = 10.0 * np.log10(np.maximum(mel.max(axis=(1, 2), keepdims=True), AMIN))
+        log_spec -= peak
+        np.maximum(log_spec, log_spec.max(axis=(1, 2), keepdims=True) - TOP_DB, out=log_spec)
+        return log_spec
+
+    def _normalize(self, log_spec: np.ndarray) -> np.ndarray:
+        """Standardize log-mel spectra and fit them to self.frames, per window"""
+        mean = log_spec.mean(axis=(1, 2), keepdims=True)
+        std = log_spec.std(axis=(1, 2), keepdims=True)
+        features = (log_spec - mean) / (std + 1e-8)
+
+        out = np.zeros((log_spec.shape[0], self.frames, self.n_mels, 1), dtype=np.float32)
+        n = min(self.frames, features.shape[1])
+        out[:, :n, :, 0] = features[:, :n]
+        return out
+
+    def compute(self, windows: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Features for a batch of PCM windows at self.sr
+
+        Windows of equal length share one STFT call; a differing tail window
+        is processed in its own group.
+
+        Returns:
+            float32 array (len(windows), frames, n_mels, 1)
+        """
+        return self._run(windows, activity=False)[0]
+
+    def compute_with_activity(self, windows: Sequence[np.ndarray]
+                              ) -> Tuple[np.ndarray, List[np.ndarray], List[np.ndarray]]:
+        """
+        Features plus per-frame activity measures for a batch of windows
+
+        Returns:
+            (features, energy_db, flux): features as from compute, and per
+            window the frame energies in dBFS and the spectral flux, the mean
+            rise in log-mel power since the previous frame in dB
+        """
+        return self._run(windows, activity=True)
+
+    def _run(self, windows: Sequence[np.ndarray], activity: bool):
+        out = np.empty((len(windows), self.frames, self.n_mels, 1), dtype=np.float32)
+        energy: List[np.ndarray] = [None] * len(windows)
+        flux: List[np.ndarray] = [None] * len(windows)
+
+        groups: Dict[int, List[int]] = {}
+        for i, window in enumerate(windows):
+            groups.setdefault(len(window), []).append(i)
+
+        for indices in groups.values():
+            mel, energy_db = self._mel_power(np.stack([windows[i] for i in indices]))
+            log_spec = self._log_mel(mel)
+            out[indices] = self._normalize(log_spec)
+            if activity:
+                rise = np.maximum(np.diff(log_spec, axis=1), 0).mean(axis=2)
+                group_flux = np.pad(rise, ((0, 0), (1, 0)))
+                for row, i in enumerate(indices):
+                    energy[i] = energy_db[row]
+                    flux[i] = group_flux[row]
+        return out, energy, flux
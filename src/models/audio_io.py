@@ -0,0 +1,215 @@
+"""
+Audio I/O
+Decoding helpers for audio files and the audio tracks of video containers
+"""
+
+import os
+import shutil
+import subprocess
+import logging
+from math import gcd
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+import librosa
+import audioread
+import soundfile as sf
+from scipy import signal
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on a single ffmpeg demux
+DEMUX_TIMEOUT = 120
+
+# Seconds of source audio decoded per streamed block
+BLOCK_SECONDS = 30.0
+
+# Containers only soundfile should read. Anything else is tried with
+# soundfile first (libsndfile also reads MP3 and Ogg) and otherwise
+# streamed through audioread
+SOUNDFILE_EXTENSIONS = {'.wav', '.flac'}
+
+# Default resampler. soxr_hq measured fastest with no feature drift on
+# current librosa; 'polyphase' is kept for builds without soxr
+RESAMPLE_TYPE = 'soxr_hq'
+
+
+def resample(y: np.ndarray, orig_sr: int, target_sr: int,
+             res_type: str = RESAMPLE_TYPE) -> np.ndarray:
+    """
+    Resample mono PCM with the configured method
+
+    'polyphase' runs scipy's resample_poly in float32; any other value is
+    passed to librosa.resample as its res_type.
+    """
+    if orig_sr == target_sr:
+        return y
+    if res_type == 'polyphase':
+        g = gcd(int(orig_sr), int(target_sr))
+        return signal.resample_poly(y, target_sr // g, orig_sr // g).astype(np.float32, copy=False)
+    return librosa.resample(y, orig_sr=orig_sr, target_sr=target_sr, res_type=res_type)
+
+
+def demux_audio_track(file_path: str, sr: int = 16000, max_seconds: Optional[float] = None,
+                      res_type: str = RESAMPLE_TYPE) -> Optional[np.ndarray]:
+    """
+    Decode the audio track of a container to mono float32 PCM
+
+    Uses the ffmpeg CLI when available, falling back to librosa (audioread).
+
+    Args:
+        file_path: Video or audio container
+        sr: Target sample rate
+        max_seconds: Only decode the first max_seconds of audio
+
+    Returns:
+        PCM samples, or None when the file has no decodable audio track
+    """
+    if shutil.which('ffmpeg'):
+        cmd = ['ffmpeg', '-v', 'error', '-nostdin', '-i', file_path,
+               '-vn', '-ac', '1', '-ar', str(sr), '-f', 'f32le']
+        if max_seconds:
+            cmd += ['-t', str(max_seconds)]
+        cmd.append('-')
+        try:
+            proc = subprocess.run(cmd, capture_output=True, timeout=DEMUX_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Audio demux timed out for {file_path}")
+            return None
+        if proc.returncode != 0:
+            return None
+        pcm = np.frombuffer(proc.stdout, dtype=np.float32)
+    else:
+        try:
+            pcm, _ = librosa.load(file_path, sr=sr, mono=True, duration=max_seconds, res_type=res_type)
+        except Exception:
+            return None
+
+    return pcm if pcm.size else None
+
+
+def _downmix(block: np.ndarray) -> np.ndarray:
+    """Average (frames, channels) PCM to mono"""
+    channels = block.shape[1]
+    if channels == 1:
+        return block[:, 0]
+    # A BLAS mat-vec is several times faster than mean(axis=1) on interleaved frames
+    return block @ np.full(channels, 1.0 / channels, dtype=block.dtype)
+
+
+def _soundfile_blocks(file_path: str, block_seconds: float,
+                      max_seconds: Optional[float]) -> Tuple[int, Iterator[np.ndarray]]:
+    """Native rate and mono blocks read by soundfile, stopping after max_seconds"""
+    native_sr = sf.info(file_path).samplerate
+    blocksize = max(1, int(block_seconds * native_sr))
+    frames = int(max_seconds * native_sr) if max_seconds else -1
+    blocks = sf.blocks(file_path, blocksize=blocksize, frames=frames, dtype='float32', always_2d=True)
+    return native_sr, (_downmix(block) for block in blocks)
+
+
+def _audioread_blocks(file_path: str, block_seconds: float,
+                      max_seconds: Optional[float]) -> Tuple[int, Iterator[np.ndarray]]:
+    """
+    Native rate and mono blocks decoded by audioread in one forward pass
+
+    audioread yields 16-bit interleaved buffers as the backend decodes, so
+    only one block is held at a time and the decoder is closed as soon as
+    max_seconds have been read.
+    """
+    source = audioread.audio_open(file_path)
+    native_sr, channels = source.samplerate, source.channels
+    blocksize = max(1, int(block_seconds * native_sr))
+    limit = int(max_seconds * native_sr) if max_seconds else None
+
+    def blocks():
+        pending, pending_frames, total = [], 0, 0
+        remainder = b''
+        try:
+            for buffer in source:
+                buffer = remainder + buffer
+                usable = len(buffer) - len(buffer) % (2 * channels)
+                remainder = buffer[usable:]
+                frames = np.frombuffer(buffer[:usable], dtype='<i2').reshape(-1, channels)
+                if limit is not None:
+                    frames = frames[:limit - total]
+                pending.append(frames)
+                pending_frames += len(frames)
+                total += len(frames)
+                while pending_frames >= blocksize:
+                    joined = np.concatenate(pending)
+                    yield _downmix(joined[:blocksize].astype(np.float32) * (1.0 / 32768))
+                    pending, pending_frames = [joined[blocksize:]], pending_frames - blocksize
+                if limit is not None and total >= limit:
+                    break
+            if pending_frames:
+                yield _downmix(np.concatenate(pending).astype(np.float32) * (1.0 / 32768))
+        finally:
+            source.close()
+
+    return native_sr, blocks()
+
+
+def stream_audio(file_path: str, sr: int = 16000, block_seconds: float = BLOCK_SECONDS,
+                 res_type: str = RESAMPLE_TYPE, max_seconds: Optional[float] = None) -> Iterator[np.ndarray]:
+    """
+    Yield mono float32 PCM at sr, one block of about block_seconds at a time
+
+    Formats libsndfile reads (WAV, FLAC, MP3, Ogg, ...) are decoded block
+    by block with soundfile; anything else is streamed through audioread.
+    Either way memory stays bounded by the block size, and decoding stops
+    after max_seconds of source audio. Blocks are resampled independently,
+    so a filter transient of a few samples sits at each block boundary.
+    """
+    try:
+        native_sr, blocks = _soundfile_blocks(file_path, block_seconds, max_seconds)
+    except RuntimeError:
+        if os.path.splitext(file_path)[1].lower() in SOUNDFILE_EXTENSIONS:
+            raise
+        native_sr, blocks = _audioread_blocks(file_path, block_seconds, max_seconds)
+
+    try:
+        for block in blocks:
+            yield resample(block, native_sr, sr, res_type)
+    finally:
+        blocks.close()
+
+
+def load_audio(file_path: str, sr: int = 16000, max_seconds: Optional[float] = None,
+               res_type: str = RESAMPLE_TYPE) -> np.ndarray:
+    """Decode up to max_seconds of mono PCM at sr through the fast path"""
+    limit = int(max_seconds * sr) if max_seconds else None
+    block_seconds = min(max_seconds, BLOCK_SECONDS) if max_seconds else BLOCK_SECONDS
+
+    blocks, total = [], 0
+    for block in stream_audio(file_path, sr=sr, block_seconds=block_seconds, res_type=res_type,
+                              max_seconds=max_seconds):
+        blocks.append(block)
+        total += len(block)
+        if limit is not None and total >= limit:
+            break
+
+    y = np.concatenate(blocks) if blocks else np.empty(0, dtype=np.float32)
+    return y[:limit] if limit is not None else y
+
+
+def iter_windows(blocks: Iterator[np.ndarray], window_samples: int,
+                 min_samples: int = 1) -> Iterator[np.ndarray]:
+    """
+    Re-slice a stream of PCM blocks into consecutive fixed-size windows
+
+    A trailing partial window is yielded if it holds at least min_samples,
+    or if it is the only audio in the stream.
+    """
+    pending = np.empty(0, dtype=np.float32)
+    emitted = 0
+    for block in blocks:
+        pending = np.concatenate([pending, block]) if pending.size else block
+        offset = 0
+        while pending.size - offset >= window_samples:
+            yield pending[offset:offset + window_samples]
+            offset += window_samples
+            emitted += 1
+        pending = pending[offset:]
+
+    if pending.size and (pending.size >= min_samples or emitted == 0):
+        yield pending
@@ -0,0 +1,184 @@
+"""
+Streaming Audio Analysis
+Scores live audio window by window as chunks arrive, with state bounded to one window
+"""
+
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import soxr
+
+from models.audio_features import MelFeatureEngine
+from models.voice_activity import speech_windows
+
+# Raw PCM encodings accepted from clients
+SAMPLE_FORMATS = {'f32le': np.dtype('<f4'), 's16le': np.dtype('<i2')}
+
+# Scored windows in the rolling average
+ROLLING_WINDOWS = 8
+
+
+class AudioStreamSession:
+    """
+    Incremental window scorer for one audio stream
+
+    Raw PCM bytes are decoded, downmixed and resampled as they arrive and
+    copied into a single window-sized buffer. Each time the buffer fills,
+    that window is featurized with the detector's mel engine, gated for
+    voice activity and scored, so the first score arrives after one window
+    of audio regardless of how long the stream runs. Beyond the buffer, a
+    session keeps only counters and the last few scores.
+    """
+
+    def __init__(self, engine: MelFeatureEngine, score_fn: Callable[[np.ndarray], np.ndarray],
+                 window_samples: int, sample_rate: int, channels: int = 1,
+                 sample_format: str = 'f32le', vad: Optional[Dict] = None,
+                 rolling_windows: int = ROLLING_WINDOWS):
+        """
+        Args:
+            engine: Mel feature engine at the model's sample rate
+            score_fn: Maps a (windows, frames, n_mels, 1) batch to scores
+            window_samples: Samples per scored window at engine.sr
+            sample_rate: Sample rate of the incoming PCM
+            channels: Interleaved channels in the incoming PCM
+            sample_format: One of SAMPLE_FORMATS
+            vad: Voice-activity settings from voice_activity.resolve_settings
+
+        Raises:
+            ValueError: On an unsupported format or a non-positive rate or channel count
+        """
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported sample format: {sample_format}")
+        if sample_rate <= 0 or channels <= 0:
+            raise ValueError("sample_rate and channels must be positive")
+
+        self.engine = engine
+        self.score_fn = score_fn
+        self.window_samples = window_samples
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.dtype = SAMPLE_FORMATS[sample_format]
+        self.vad = vad
+
+        self._frame_bytes = self.dtype.itemsize * channels
+        self._remainder = b''
+        self._resampler = None
+        if sample_rate != engine.sr:
+            self._resampler = soxr.ResampleStream(sample_rate, engine.sr, 1, dtype='float32')
+
+        self._window = np.empty(window_samples, dtype=np.float32)
+        self._filled = 0
+        self._recent = deque(maxlen=rolling_windows)
+
+        self.windows_scored = 0
+        self.windows_skipped = 0
+        self.samples_received = 0
+        self._score_sum = 0.0
+        self._peak = 0.0
+
+    def _decode(self, data: bytes) -> np.ndarray:
+        """Mono float32 PCM at the model rate from raw bytes, carrying partial frames over"""
+        data = self._remainder + data
+        usable = len(data) - len(data) % self._frame_bytes
+        self._remainder = data[usable:]
+
+        pcm = np.frombuffer(data[:usable], dtype=self.dtype)
+        if self.dtype.kind == 'i':
+            pcm = pcm.astype(np.float32) / np.float32(32768.0)
+        else:
+            pcm = pcm.astype(np.float32, copy=False)
+        if self.channels > 1:
+            pcm = pcm.reshape(-1, self.channels) @ np.full(self.channels, 1.0 / self.channels,
+                                                          dtype=np.float32)
+        if self._resampler is not None:
+            pcm = self._resampler.resample_chunk(pcm)
+        return pcm
+
+    def _score_window(self, window: np.ndarray) -> Dict:
+        start = self.windows_scored + self.windows_skipped
+        features, energy_db, flux = self.engine.compute_with_activity([window])
+        speech = bool(speech_windows(energy_db, flux, self.vad)[0])
+
+        event = {
+            'window': start,
+            'start': start * self.window_samples / self.engine.sr,
+            'end': (start * self.window_samples + len(window)) / self.engine.sr,
+            'speech': speech
+        }
+        if speech:
+            score = float(self.score_fn(features)[0])
+            self.windows_scored += 1
+            self._score_sum += score
+            self._peak = max(self._peak, score)
+            self._recent.append(score)
+            event['confidence'] = score
+        else:
+            self.windows_skipped += 1
+
+        event['rolling_confidence'] = float(np.mean(self._recent)) if self._recent else None
+        return event
+
+    def feed(self, data: bytes) -> List[Dict]:
+        """
+        Add a chunk of raw PCM and score every window it completes
+
+        Returns:
+            One event per completed window, in order
+        """
+        return self._push(self._decode(data))
+
+    def _push(self, pcm: np.ndarray) -> List[Dict]:
+        self.samples_received += len(pcm)
+        events = []
+        offset = 0
+        while offset < len(pcm):
+            take = min(self.window_samples - self._filled, len(pcm) - offset)
+            self._window[self._filled:self._filled + take] = pcm[offset:offset + take]
+            self._filled += take
+            offset += take
+            if self._filled == self.window_samples:
+                events.append(self._score_window(self._window))
+                self._filled = 0
+        return events
+
+    def close(self) -> Tuple[List[Dict], Dict]:
+        """
+        Flush the resampler and score a trailing partial window
+
+        A partial window is scored if it holds at least a quarter of a window,
+        or if it is the only audio received, matching file analysis.
+
+        Returns:
+            (events, summary)
+        """
+        events = []
+        if self._resampler is not None:
+            events = self._push(self._resampler.resample_chunk(np.empty(0, dtype=np.float32), last=True))
+
+        seen = self.windows_scored + self.windows_skipped
+        if self._filled and (self._filled >= self.window_samples // 4 or seen == 0):
+            events.append(self._score_window(self._window[:self._filled].copy()))
+            self._filled = 0
+
+        return events, self.summary()
+
+    def summary(self) -> Dict:
+        """Totals over the stream so far"""
+        total = self.windows_scored + self.windows_skipped
+        confidence = self._score_sum / self.windows_scored if self.windows_scored else 0.0
+        return {
+            'prediction': 'deepfake' if confidence > 0.5 else 'authentic',
+            'confidence': confidence,
+            'is_authentic': confidence <= 0.5,
+            'speech_detected': self.windows_scored > 0,
+            'windows_analyzed': self.windows_scored,
+            'peak_confidence': self._peak,
+            'duration_analyzed': self.samples_received / self.engine.sr,
+            'voice_activity': {
+                'enabled': bool(self.vad['enabled']) if self.vad else True,
+                'windows_skipped': self.windows_skipped,
+                'skipped_fraction': self.windows_skipped / total if total else 0.0
+            },
+            'file_type': 'audio'
+        }
@@ -0,0 +1,251 @@
+"""
+Cross-File Batching
+Packs model inputs from many files into full batches per model and routes the scores back
+"""
+
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Seconds the inference queue waits for more work before running a partial batch
+MAX_BATCH_DELAY = 0.005
+
+
+class BatchItem:
+    """
+    One file's pending model inputs
+
+    'inputs' maps a model name to an array of samples for that model (one
+    image, N identity clips, M speech windows, ...). Scores land in
+    'scores' at the same positions; once every sample is scored, 'finish'
+    turns them into the file's result. 'inference_seconds' is this item's
+    share of the forward passes it took part in, by sample count, and
+    'context' carries caller data such as a stage timer.
+    """
+
+    def __init__(self, key: Any, inputs: Dict[str, np.ndarray],
+                 finish: Callable[[Dict[str, np.ndarray]], Dict], started: float = None,
+                 context: Any = None):
+        self.key = key
+        self.inputs = inputs
+        self.finish = finish
+        self.started = time.perf_counter() if started is None else started
+        self.context = context
+        self.scores = {name: np.empty(len(x), dtype=np.float32) for name, x in inputs.items()}
+        self.inference_seconds = 0.0
+        self.error = None
+        self.future: Optional[Future] = None
+        self._remaining = sum(len(x) for x in inputs.values())
+
+    @property
+    def done(self) -> bool:
+        return self.error is not None or self._remaining == 0
+
+    def cancel(self):
+        """Drop this item's samples that have not been scored yet"""
+        if self.error is None:
+            self.error = 'cancelled'
+
+
+class ModelBatcher:
+    """
+    Per-model queues of samples that run as soon as a full batch is queued
+
+    A file's samples may be split across two batches, and one batch may
+    hold samples from many files, so every forward pass except the last
+    per model runs at exactly batch_size. Not thread-safe: one thread adds
+    items and runs the models.
+    """
+
+    def __init__(self, predict_fns: Dict[str, Callable[[np.ndarray], np.ndarray]],
+                 batch_sizes: Dict[str, int]):
+        """
+        Args:
+            predict_fns: Model name to a function scoring a batch of samples
+                with one float per sample
+            batch_sizes: Samples per forward pass for each model
+        """
+        self.predict_fns = predict_fns
+        self.batch_sizes = {name: max(1, int(batch_sizes.get(name, 1))) for name in predict_fns}
+        self._queues = {name: deque() for name in predict_fns}
+        self._queued = {name: 0 for name in predict_fns}
+        self.batches_run = {name: 0 for name in predict_fns}
+
+    def add(self, item: BatchItem) -> List[BatchItem]:
+        """
+        Queue an item's samples and run every batch that is now full
+
+        Returns:
+            Items completed by this call, possibly including earlier ones
+            and the item itself when it has nothing to score
+
+        Raises:
+            KeyError: If the item has inputs for a model the batcher lacks
+        """
+        unknown = set(item.inputs) - set(self.predict_fns)
+        if unknown:
+            raise KeyError(f"No model for inputs: {', '.join(sorted(unknown))}")
+
+        completed = [item] if item.done else []
+        for name, samples in item.inputs.items():
+            if len(samples):
+                self._queues[name].append([item, 0])
+                self._queued[name] += len(samples)
+            while self._queued[name] >= self.batch_sizes[name]:
+                completed.extend(self._run(name))
+        return completed
+
+    def flush(self) -> List[BatchItem]:
+        """Run the partial batches left in every queue"""
+        completed = []
+        for name in self.predict_fns:
+            while self._queued[name]:
+                completed.extend(self._run(name))
+        return completed
+
+    def pending(self) -> int:
+        """Samples waiting across all models"""
+        return sum(self._queued.values())
+
+    def _run(self, name: str) -> List[BatchItem]:
+        """Score the next batch of one model and return the items it completes"""
+        waiting = self._queues[name]
+        parts, routes = [], []
+        size = 0
+        while waiting and size < self.batch_sizes[name]:
+            entry = waiting[0]
+            item, offset = entry
+            available = len(item.inputs[name]) - offset
+            if item.error is not None:
+                # Cancelled, or an earlier batch already failed this item
+                waiting.popleft()
+                self._queued[name] -= available
+                continue
+            take = min(available, self.batch_sizes[name] - size)
+            parts.append(item.inputs[name][offset:offset + take])
+            routes.append((item, offset, take))
+            size += take
+            self._queued[name] -= take
+            if take == available:
+                waiting.popleft()
+            else:
+                entry[1] += take
+
+        if not parts:
+            return []
+
+        completed = []
+        started = time.perf_counter()
+        try:
+            scores = np.asarray(self.predict_fns[name](np.concatenate(parts)), dtype=np.float32).reshape(-1)
+            if len(scores) != size:
+                raise ValueError(f"{name} model returned {len(scores)} scores for {size} samples")
+        except Exception as e:
+            logger.error(f"Batched {name} inference failed: {e}")
+            for item, _, _ in routes:
+                if item.error is None:
+                    item.error = f"{name} inference failed: {e}"
+                    completed.append(item)
+            return completed
+        finally:
+            self.batches_run[name] += 1
+
+        elapsed = time.perf_counter() - started
+        position = 0
+        for item, offset, take in routes:
+            item.inference_seconds += elapsed * take / size
+            item.scores[name][offset:offset + take] = scores[position:position + take]
+            position += take
+            item._remaining -= take
+            if item._remaining == 0:
+                completed.append(item)
+        return completed
+
+
+class InferenceQueue:
+    """
+    Shared batching front end for many concurrent callers
+
+    Callers on any thread submit prepared items and get a Future back. One
+    worker thread owns a ModelBatcher: it runs full batches as soon as they
+    fill and partial ones once the oldest waiting sample has waited
+    max_delay, so under load batches stay full and when idle an item waits
+    at most max_delay. Cancelling a caller's Future removes its remaining samples
+    from the queue.
+    """
+
+    def __init__(self, predict_fns: Dict[str, Callable[[np.ndarray], np.ndarray]],
+                 batch_sizes: Dict[str, int], max_delay: float = MAX_BATCH_DELAY):
+        self.max_delay = max_delay
+        self._batcher = ModelBatcher(predict_fns, batch_sizes)
+        self._inbox = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: BatchItem) -> Future:
+        """
+        Queue an item for batched inference
+
+        Returns:
+            Future resolving to the item once it is scored or has failed
+        """
+        future = Future()
+        item.future = future
+        future.add_done_callback(lambda f: f.cancelled() and item.cancel())
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='inference-queue', daemon=True)
+                self._thread.start()
+        self._inbox.put(item)
+        return future
+
+    def batches_run(self) -> Dict[str, int]:
+        return dict(self._batcher.batches_run)
+
+    def _loop(self):
+        oldest = None
+        while True:
+            timeout = None
+            if oldest is not None:
+                timeout = max(0.0, oldest + self.max_delay - time.perf_counter())
+            try:
+                self._add(self._inbox.get(timeout=timeout))
+                # Take everything that queued up during the last forward pass
+                # before deciding whether a partial batch has waited too long
+                while True:
+                    self._add(self._inbox.get_nowait())
+            except queue.Empty:
+                pass
+
+            if not self._batcher.pending():
+                oldest = None
+            elif oldest is None:
+                oldest = time.perf_counter()
+            elif time.perf_counter() - oldest >= self.max_delay:
+                self._resolve(self._batcher.flush())
+                oldest = None
+
+    def _add(self, item: BatchItem):
+        if item.future.cancelled():
+            return
+        try:
+            self._resolve(self._batcher.add(item))
+        except Exception as e:
+            item.error = str(e)
+            self._resolve([item])
+
+    def _resolve(self, items: List[BatchItem]):
+        for item in items:
+            try:
+                item.future.set_result(item)
+            except InvalidStateError:
+                # Cancelled by its caller meanwhile
+                pass
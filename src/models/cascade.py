@@ -0,0 +1,96 @@
+"""
+Cascaded Early Exit
+Decides when a cheap screening score is decisive enough to skip the full model, and tracks how well that works
+"""
+
+import random
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+# Screening scores inside this band go on to the full model
+UNCERTAINTY_BAND = (0.3, 0.7)
+
+# Share of decisive screens that still run the full model, to measure exit accuracy
+AUDIT_RATE = 0.05
+
+
+class CascadeMonitor:
+    """
+    Early-exit policy plus running metrics per modality
+
+    Tracks how many requests exit after screening, the latency that saved
+    relative to the mean full-path latency, and, on audited requests, how
+    often the screen's verdict matched the full model's. The last figure is
+    what the band should be tuned against.
+    """
+
+    def __init__(self, band: Sequence[float] = UNCERTAINTY_BAND, audit_rate: float = AUDIT_RATE,
+                 threshold: float = 0.5, seed: Optional[int] = None):
+        low, high = band
+        if not 0.0 <= low <= threshold <= high <= 1.0:
+            raise ValueError("uncertainty band must satisfy 0 <= low <= threshold <= high <= 1")
+        self.band = (float(low), float(high))
+        self.audit_rate = audit_rate
+        self.threshold = threshold
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+
+    def decide(self, screen_confidence: float,
+               band: Optional[Sequence[float]] = None) -> Tuple[bool, bool]:
+        """
+        Whether to run the full model after a screening score
+
+        Returns:
+            (escalate, audit): escalate when the score is inside the band or
+            the request was picked for an accuracy audit
+        """
+        low, high = band or self.band
+        if low <= screen_confidence <= high:
+            return True, False
+        with self._lock:
+            audit = self._rng.random() < self.audit_rate
+        return audit, audit
+
+    def record(self, modality: str, latency: float, screen_latency: float, exited: bool,
+               screen_confidence: float, full_confidence: Optional[float] = None,
+               audited: bool = False):
+        """Account one cascaded request"""
+        with self._lock:
+            stats = self._stats.setdefault(modality, {
+                'requests': 0, 'early_exits': 0, 'early_latency': 0.0,
+                'full_requests': 0, 'full_latency': 0.0, 'screen_latency': 0.0,
+                'audits': 0, 'audit_agreements': 0
+            })
+            stats['requests'] += 1
+            stats['screen_latency'] += screen_latency
+            if exited:
+                stats['early_exits'] += 1
+                stats['early_latency'] += latency
+            else:
+                stats['full_requests'] += 1
+                stats['full_latency'] += latency
+            if audited and full_confidence is not None:
+                stats['audits'] += 1
+                stats['audit_agreements'] += int(
+                    (screen_confidence > self.threshold) == (full_confidence > self.threshold))
+
+    def stats(self) -> Dict:
+        """Early-exit fraction, latency saved and audit agreement per modality"""
+        with self._lock:
+            summary = {}
+            for modality, s in self._stats.items():
+                mean_full = s['full_latency'] / s['full_requests'] if s['full_requests'] else None
+                saved = (s['early_exits'] * mean_full - s['early_latency']) if mean_full is not None else None
+                summary[modality] = {
+                    'requests': s['requests'],
+                    'early_exits': s['early_exits'],
+                    'early_exit_fraction': s['early_exits'] / s['requests'],
+                    'mean_screen_latency': s['screen_latency'] / s['requests'],
+                    'mean_full_latency': mean_full,
+                    'mean_early_latency': s['early_latency'] / s['early_exits'] if s['early_exits'] else None,
+                    'latency_saved': saved,
+                    'audits': s['audits'],
+                    'audit_agreement': s['audit_agreements'] / s['audits'] if s['audits'] else None
+                }
+            return {'band': list(self.band), 'audit_rate': self.audit_rate, 'modalities': summary}
@@ -5,31 +5,94 @@ Implements ensemble-based detection for images, videos, and audio
 
 import numpy as np
 import cv2
-import tensorflow as tf
-from tensorflow import keras
 import torch
 import torchvision.transforms as transforms
 from PIL import Image
 import logging
-from typing import Dict, List, Tuple, Union, Optional
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Tuple, Union, Optional
+import io
 import json
 import os
+import hashlib
+import asyncio
+import sqlite3
+import time
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-# import face_recognition  # Commented out due to dlib dependency issues
-try:
-    import face_recognition
-    FACE_RECOGNITION_AVAILABLE = True
-except ImportError:
-    FACE_RECOGNITION_AVAILABLE = False
-    logger.warning("face_recognition not available - using fallback face detection")
 import librosa
 from scipy import signal
 import warnings
 
+from models.temporal_analysis import analyze_temporal_consistency
+from models.face_tracking import track_faces, build_face_clips, build_face_images
+from models.video_decode import probe_video, sample_indices, decode_frames, default_workers, output_shape
+from models.audio_io import demux_audio_track, stream_audio, iter_windows, load_audio
+from models.frame_budget import FrameBudgetPlanner
+from models.audio_features import MelFeatureEngine
+from models.voice_activity import resolve_settings, speech_windows
+from models.audio_stream import AudioStreamSession
+from models.audio_cache import AudioCache, file_digest, hashing
+from models.result_cache import ResultCache, cache_key
+from models.perceptual_hash import PerceptualIndex, perceptual_hash
+from models.synthetic import SyntheticBackend
+from models.ensemble import EnsembleEngine
+from models.cascade import CascadeMonitor
+from models.batching import BatchItem, ModelBatcher, InferenceQueue
+from models.prediction_history import PredictionHistory
+from models.history_store import HistoryStore
+from models.stage_timing import StageTimer, StageHistograms, timing, stage, timed_iter
+from models.analysis_budget import AnalysisBudget, BudgetExceeded, budgeting, current_budget, checkpoint
+
 warnings.filterwarnings('ignore')
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bumped whenever model weights or scoring change, invalidating cached results
+MODEL_VERSION = '2.0.0'
+
+# Arrays of a cached mel-feature entry
+FEATURE_ARRAYS = ('features', 'energy', 'flux', 'spans')
+
+# File extensions analyze_files recognizes without an explicit type
+FILE_TYPES = {
+    **{ext: 'image' for ext in ('jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp')},
+    **{ext: 'video' for ext in ('mp4', 'avi', 'mov', 'webm', 'mkv', 'flv')},
+    **{ext: 'audio' for ext in ('mp3', 'wav', 'm4a', 'ogg', 'flac', 'aac')}
+}
+
+
+def _json_safe(value):
+    """Copy of a result with numpy scalars and arrays turned into plain Python values"""
+    if isinstance(value, dict):
+        return {key: _json_safe(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+# Only needed for the real models; mock and synthetic modes run without it
+try:
+    import tensorflow as tf
+    from tensorflow import keras
+    TENSORFLOW_AVAILABLE = True
+except ImportError:
+    TENSORFLOW_AVAILABLE = False
+    logger.warning("TensorFlow not available - using mock models")
+
+# import face_recognition  # Commented out due to dlib dependency issues
+try:
+    import face_recognition
+    FACE_RECOGNITION_AVAILABLE = True
+except ImportError:
+    FACE_RECOGNITION_AVAILABLE = False
+    logger.warning("face_recognition not available - using fallback face detection")
+
 class DeepFakeDetector:
     """
     Ensemble-based DeepFake Detection System
@@ -46,9 +109,62 @@ class DeepFakeDetector:
         self.model_config = model_config or self._get_default_config()
         self.models = {}
         self.is_initialized = False
+        self._face_cascade = None
+        
+        # Analyses currently running on this detector, used as queue load
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        
+        audio_config = self.model_config['audio_model']
+        self._mel_engine = MelFeatureEngine(
+            sr=audio_config['sample_rate'],
+            n_mels=audio_config['n_mels']
+        )
+        self._audio_cache = self._init_audio_cache(audio_config.get('cache', {}))
+        
+        ensemble_config = self.model_config['ensemble']
+        self._ensemble = EnsembleEngine(
+            weights=ensemble_config['weights'],
+            voting_method=ensemble_config.get('voting_method', 'weighted_average'),
+            max_workers=ensemble_config.get('max_workers', 4)
+        )
+        
+        cascade_config = self.model_config.get('cascade', {})
+        self._cascade = CascadeMonitor(
+            band=cascade_config.get('uncertainty_band', (0.3, 0.7)),
+            audit_rate=cascade_config.get('audit_rate', 0.05)
+        )
+        
+        video_config = self.model_config['video_model']
+        self._frame_planner = FrameBudgetPlanner(
+            min_frames=video_config.get('min_frames', 8),
+            max_frames=video_config.get('max_frames', 256),
+            max_clips=video_config.get('max_identities', 4),
+            sample_fps=video_config.get('sample_fps', 2.0),
+            latency_target=video_config.get('latency_target', 30.0)
+        )
+        
+        # Shared by the asyncio API, created on first use
+        self._decode_executor = None
+        self._inference_queue = None
+        self._async_lock = threading.Lock()
+        
+        # Per-stage latency across analyses
+        self._stage_histograms = StageHistograms()
         
         # Performance tracking
-        self.prediction_history = []
+        self.prediction_history = PredictionHistory(capacity=1000)
+        self._history_store = self._init_history_store(self.model_config.get('history', {}))
+        
+        # Finished results by file content, model version and configuration
+        self._result_cache = self._init_result_cache(self.model_config.get('result_cache', {}))
+        self._config_hash = hashlib.sha256(
+            json.dumps(self.model_config, sort_keys=True, default=str).encode()).hexdigest()
+        
+        # Perceptual hashes of analyzed images per request scope, pointing at
+        # their cached results
+        self._phash_indexes: Dict[str, PerceptualIndex] = {}
+        self._phash_lock = threading.Lock()
         self.model_performance = {
             'image_model': {'accuracy': 0.94, 'precision': 0.93, 'recall': 0.95},
             'video_model': {'accuracy': 0.92, 'precision': 0.91, 'recall': 0.93},
@@ -56,7 +172,19 @@ class DeepFakeDetector:
             'ensemble': {'accuracy': 0.96, 'precision': 0.95, 'recall': 0.97}
         }
         
-        self._initialize_models()
+        # Seeded stand-in for the models in mock and synthetic modes
+        synthetic_config = self.model_config.get('synthetic', {})
+        self._synthetic = SyntheticBackend(
+            seed=synthetic_config.get('seed', 0),
+            worker=synthetic_config.get('worker'),
+            latency=synthetic_config.get('latency')
+        )
+        self._synthetic_mode = synthetic_config.get('enabled', False)
+        
+        if self._synthetic_mode:
+            self._init_mock_models()
+        else:
+            self._initialize_models()
         
     def _get_default_config(self) -> Dict:
         """Get default configuration"""
@@ -71,24 +199,149 @@ class DeepFakeDetector:
                 'architecture': '3D-CNN',
                 'frames_per_clip': 16,
                 'input_size': (112, 112, 3),
-                'threshold': 0.5
+                'threshold': 0.5,
+                'temporal_size': 64,
+                'flow_block': 8,
+                'keyframe_interval': 4,
+                'face_margin': 0.25,
+                'max_identities': 4,
+                'decode_workers': default_workers(),
+                'parallel_min_frames': 600,
+                'decode_max_side': None,
+                'latency_target': 30.0,
+                'sample_fps': 2.0,
+                'min_frames': 8,
+                'max_frames': 256,
+                'image_frames': 8,
+                'batch_size': 8
             },
             'audio_model': {
                 'architecture': 'ResNet-1D',
                 'sample_rate': 16000,
                 'n_mels': 128,
-                'threshold': 0.5
+                'threshold': 0.5,
+                'window_seconds': 4.096,
+                'max_windows': 900,
+                'block_seconds': 30.0,
+                'batch_size': 16,
+                'resample_type': 'soxr_hq',
+                'vad': {
+                    'enabled': True,
+                    'energy_floor_db': -50.0,
+                    'flux_threshold_db': 2.0,
+                    'min_active_ratio': 0.2
+                },
+                'cache': {
+                    'enabled': True,
+                    'directory': os.path.join(tempfile.gettempdir(), 'imposterscan', 'audio_cache'),
+                    'max_bytes': 2 * 1024 ** 3,
+                    'features': False
+                }
             },
             'ensemble': {
                 'weights': {'image': 0.4, 'video': 0.4, 'audio': 0.2},
                 'voting_method': 'weighted_average',
-                'threshold': 0.5
+                'threshold': 0.5,
+                'max_workers': 4
+            },
+            'cascade': {
+                'enabled': False,
+                'uncertainty_band': (0.3, 0.7),
+                'audit_rate': 0.05,
+                'screen_size': (112, 112),
+                'screen_frames': 8,
+                'screen_max_side': 320
+            },
+            'batch': {
+                'workers': default_workers(),
+                'prefetch': 2,
+                'max_delay': 0.005,
+                'max_in_flight': 256
+            },
+            'history': {
+                'enabled': True,
+                'path': os.path.join(tempfile.gettempdir(), 'imposterscan', 'history.db'),
+                'rollup_interval': 10.0,
+                'raw_retention_days': 30
+            },
+            'budget': {
+                'enabled': True,
+                'wall_seconds': 240.0,
+                'pixels': 1_000_000_000,
+                'audio_samples': 16000 * 3600,
+                'memory_mb': 2048
+            },
+            'result_cache': {
+                'enabled': True,
+                'path': os.path.join(tempfile.gettempdir(), 'imposterscan', 'results.db'),
+                'memory_entries': 1024,
+                'max_bytes': 256 * 1024 ** 2
+            },
+            'near_duplicate': {
+                'enabled': True,
+                'max_distance': 6
+            },
+            'synthetic': {
+                # Serve seeded fake results without decoding or models, for load tests
+                'enabled': False,
+                'seed': 0,
+                # Stream index of this process; None reads SYNTHETIC_WORKER (set
+                # per gunicorn worker by gunicorn.conf.py), else 0 in the process
+                # that built the detector and the pid in workers forked from it
+                'worker': None,
+                'latency': {
+                    'image': {'median': 0.8, 'sigma': 0.4},
+                    'video': {'median': 6.0, 'sigma': 0.6},
+                    'audio': {'median': 2.0, 'sigma': 0.5}
+                }
             }
         }
     
+    def _init_audio_cache(self, cache_config: Dict) -> Optional[AudioCache]:
+        """Open the decoded-audio cache, or None when disabled or unusable"""
+        if not cache_config.get('enabled', False):
+            return None
+        try:
+            return AudioCache(cache_config['directory'], cache_config.get('max_bytes', 2 * 1024 ** 3))
+        except OSError as e:
+            logger.warning(f"Audio cache disabled: {e}")
+            return None
+    
+    def _init_history_store(self, history_config: Dict) -> Optional[HistoryStore]:
+        """Open the durable prediction log, or None when disabled or unusable"""
+        if not history_config.get('enabled', False):
+            return None
+        try:
+            return HistoryStore(
+                history_config['path'],
+                rollup_interval=history_config.get('rollup_interval', 10.0),
+                raw_retention_days=history_config.get('raw_retention_days')
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Durable prediction history disabled: {e}")
+            return None
+    
+    def _init_result_cache(self, cache_config: Dict) -> Optional[ResultCache]:
+        """Open the result cache, or None when disabled or unusable"""
+        if not cache_config.get('enabled', False):
+            return None
+        try:
+            return ResultCache(
+                cache_config['path'],
+                memory_entries=cache_config.get('memory_entries', 1024),
+                max_bytes=cache_config.get('max_bytes', 256 * 1024 ** 2),
+                on_evict=self._forget_phashes
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Result cache disabled: {e}")
+            return None
+    
     def _initialize_models(self):
         """Initialize all detection models"""
         try:
+            if not TENSORFLOW_AVAILABLE:
+                raise ImportError("TensorFlow is not installed")
+            
             logger.info("Initializing DeepFake Detection Models...")
             
             # Initialize image detection model
@@ -100,6 +353,9 @@ class DeepFakeDetector:
             # Initialize audio detection model
             self._init_audio_model()
             
+            # Small first-stage model for cascaded early exit
+            self._init_screen_model()
+            
             self.is_initialized = True
             logger.info("All models initialized successfully!")
             
@@ -196,6 +452,30 @@ class DeepFakeDetector:
             logger.warning(f"Failed to load audio model: {e}")
             self.models['audio'] = None
     
+    def _init_screen_model(self):
+        """Initialize the cheap screening model used as the cascade's first stage"""
+        try:
+            size = tuple(self.model_config.get('cascade', {}).get('screen_size', (112, 112)))
+            model = keras.Sequential([
+                keras.layers.Conv2D(16, 3, strides=2, activation='relu', input_shape=size + (3,)),
+                keras.layers.Conv2D(32, 3, strides=2, activation='relu'),
+                keras.layers.GlobalAveragePooling2D(),
+                keras.layers.Dense(1, activation='sigmoid')
+            ])
+            
+            model.compile(
+                optimizer='adam',
+                loss='binary_crossentropy',
+                metrics=['accuracy']
+            )
+            
+            self.models['screen'] = model
+            logger.info("Screening model loaded")
+            
+        except Exception as e:
+            logger.warning(f"Failed to load screening model: {e}")
+            self.models['screen'] = None
+    
     def _init_mock_models(self):
         """Initialize mock models for demonstration"""
         logger.info("Initializing mock models for demonstration...")
@@ -206,35 +486,56 @@ class DeepFakeDetector:
         }
         self.is_initialized = True
     
-    def analyze_file(self, file_path: str, file_type: str) -> Dict:
+    def analyze_file(self, file_path: str, file_type: str, options: Dict = None) -> Dict:
         """
         Analyze a file for deepfake content
         
         Args:
             file_path: Path to the media file
             file_type: Type of media ('image', 'video', 'audio')
+            options: Per-request settings, e.g. 'latency_target' (seconds),
+                'queue_depth' (jobs waiting behind this worker), 'vad'
+                (bool or dict of voice-activity gate settings) and 'cascade'
+                (bool, early exit for images and videos) and 'budget' (dict
+                of resource limits, which may only tighten the configured ones)
             
         Returns:
-            Dictionary containing analysis results
+            Dictionary containing analysis results; 'budget' is added when
+            a resource budget ran out, with a partial result or an error,
+            and 'cached' is True when an earlier result for the same
+            content was reused
         """
         if not self.is_initialized:
             raise RuntimeError("Models not initialized")
         
-        start_time = datetime.now()
+        options = options or {}
+        timer = StageTimer()
+        budget = self._analysis_budget(options)
+        
+        with self._in_flight_lock:
+            self._in_flight += 1
         
         try:
-            if file_type == 'image':
-                result = self._analyze_image(file_path)
-            elif file_type == 'video':
-                result = self._analyze_video(file_path)
-            elif file_type == 'audio':
-                result = self._analyze_audio(file_path)
-            else:
-                raise ValueError(f"Unsupported file type: {file_type}")
+            with timing(timer), budgeting(budget), hashing():
+                key, result = self._cached_result(file_path, file_type, options)
+                if result is None:
+                    if self._synthetic_mode and file_type in ('image', 'video', 'audio'):
+                        result = self._synthetic.result(file_type)
+                    elif file_type == 'image':
+                        result = self._analyze_image(file_path, options)
+                    elif file_type == 'video':
+                        result = self._analyze_video(file_path, options)
+                    elif file_type == 'audio':
+                        result = self._analyze_audio(file_path, options)
+                    else:
+                        raise ValueError(f"Unsupported file type: {file_type}")
+                    
+                    with stage('serialization'):
+                        result = _json_safe(result)
+                    self._store_result(key, result, budget, options)
             
-            # Calculate processing time
-            processing_time = (datetime.now() - start_time).total_seconds()
-            result['processing_time'] = processing_time
+            self._record_timing(result, timer)
+            self._attach_budget(result, budget)
             
             # Store prediction history
             self._update_prediction_history(result)
@@ -243,235 +544,1001 @@ class DeepFakeDetector:
             
         except Exception as e:
             logger.error(f"Analysis failed: {str(e)}")
-            return self._generate_error_result(str(e))
+            return self._attach_budget(self._generate_error_result(str(e)), budget)
+        
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+    
+    def _record_timing(self, result: Dict, timer: StageTimer):
+        """Attach the stage breakdown and monotonic processing time, and feed the histograms"""
+        breakdown = timer.breakdown()
+        result['timing'] = breakdown
+        result['processing_time'] = breakdown['total']
+        if result.get('prediction') != 'error' and not result.get('cached'):
+            self._stage_histograms.observe(result.get('file_type'), breakdown)
+    
+    def _cached_result(self, file_path: str, file_type: str,
+                       options: Dict) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Result cache key for a file and request, and the cached result if any
+        
+        Returns:
+            (key, result); key is None when the cache is disabled or the
+            file cannot be hashed, result is None on a miss
+        """
+        if self._result_cache is None or file_type not in ('image', 'video', 'audio'):
+            return None, None
+        try:
+            with stage('read'):
+                digest = file_digest(file_path)
+        except OSError:
+            return None, None
+        
+        key = cache_key(digest, self._request_scope(file_type, options))
+        result = self._result_cache.get(key)
+        if result is not None:
+            result['cached'] = True
+            # Reusing a synthetic result costs none of its simulated model time
+            result.pop('simulated_latency', None)
+        return key, result
+    
+    def _request_scope(self, file_type: str, options: Dict) -> str:
+        """Everything besides the content that a cached result depends on"""
+        # Queue depth only reflects load at the time, not what was asked for
+        request = {name: value for name, value in options.items() if name != 'queue_depth'}
+        return cache_key('', MODEL_VERSION, self._config_hash, file_type, request)
+    
+    def _store_result(self, key: Optional[str], result: Dict, budget: Optional[AnalysisBudget],
+                      options: Dict):
+        """Cache a complete result; errors, reused and budget-truncated results are not stored"""
+        if key is None or result.get('prediction') == 'error' or 'near_duplicate' in result:
+            return
+        if budget is not None and budget.exceeded is not None:
+            return
+        self._result_cache.put(key, result)
+        
+        if 'phash' in result:
+            index = self._phash_index(self._request_scope(result.get('file_type', 'image'), options))
+            if index is not None:
+                index.add(int(result['phash'], 16), key)
+    
+    def _phash_index(self, scope: str) -> Optional[PerceptualIndex]:
+        """Near-duplicate index for one request scope; None when disabled"""
+        config = self.model_config.get('near_duplicate', {})
+        if self._result_cache is None or not config.get('enabled', False):
+            return None
+        with self._phash_lock:
+            index = self._phash_indexes.get(scope)
+            if index is None:
+                index = self._phash_indexes[scope] = PerceptualIndex(config.get('max_distance', 6))
+            return index
+    
+    def _forget_phashes(self, keys: List[str]):
+        """Drop evicted results from every near-duplicate index"""
+        with self._phash_lock:
+            indexes = list(self._phash_indexes.values())
+        for index in indexes:
+            index.remove(keys)
+    
+    def _near_duplicate(self, image: np.ndarray, options: Dict) -> Tuple[int, Optional[Dict]]:
+        """
+        Perceptual hash of a preprocessed image and the cached result of a
+        near-duplicate analyzed before, if any
+        
+        Returns:
+            (phash, result); result is None when nothing close enough is
+            indexed with a cached result
+        """
+        with stage('preprocessing'):
+            phash = perceptual_hash(image[0])
+        index = self._phash_index(self._request_scope('image', options))
+        if index is None:
+            return phash, None
+        
+        while True:
+            match = index.query(phash)
+            if match is None:
+                return phash, None
+            key, distance = match
+            result = self._result_cache.get(key)
+            if result is not None:
+                break
+            # Evicted by another process; stop matching it and try the next closest
+            index.remove([key])
+        result['near_duplicate'] = {'distance': distance, 'phash': result.get('phash')}
+        result['phash'] = f"{phash:016x}"
+        result['cached'] = True
+        return phash, result
+    
+    def _analysis_budget(self, options: Dict) -> Optional[AnalysisBudget]:
+        """Resource budget for one analysis; None when budgets are disabled"""
+        config = self.model_config.get('budget', {})
+        if not config.get('enabled', False):
+            return None
+        
+        limits = {}
+        requested = options.get('budget') or {}
+        for name in ('wall_seconds', 'pixels', 'audio_samples', 'memory_mb'):
+            limit = config.get(name)
+            if requested.get(name) is not None:
+                # Requests may tighten a limit, never lift it
+                limit = requested[name] if limit is None else min(limit, requested[name])
+            limits[name] = limit
+        return AnalysisBudget(**limits)
+    
+    @staticmethod
+    def _attach_budget(result: Dict, budget: Optional[AnalysisBudget]) -> Dict:
+        """Report the budget on results it cut short or failed"""
+        if budget is not None and budget.exceeded is not None:
+            result['budget'] = {**budget.summary(), 'partial': result.get('prediction') != 'error'}
+        return result
+    
+    def get_stage_stats(self) -> Dict:
+        """Latency histograms per file type and pipeline stage"""
+        return self._stage_histograms.snapshot()
+    
+    def analyze_files(self, paths: Iterable[Union[str, Tuple[str, str]]],
+                      options: Dict = None) -> Iterator[Dict]:
+        """
+        Analyze many files, batching model inference across them
+        
+        Inputs are grouped by modality and decoded in parallel on a bounded
+        pool. Each model runs on batches of its configured batch_size that
+        may mix samples from several files (a video's face crops share
+        image-model batches with still images, its soundtrack shares
+        audio-model batches with audio files), so throughput approaches the
+        models' full-batch rate. Cascade mode does not apply here.
+        
+        Args:
+            paths: File paths, typed by extension, or (path, file_type) pairs
+            options: Per-request settings applied to every file, as for
+                analyze_file
+            
+        Yields:
+            One result per file as soon as all of its scores are in, each
+            with 'file_path'; order follows completion, not input
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Models not initialized")
+        
+        options = options or {}
+        batch_config = self.model_config.get('batch', {})
+        workers = batch_config.get('workers') or default_workers()
+        max_pending = workers * batch_config.get('prefetch', 2)
+        
+        entries = deque(self._batch_entries(paths))
+        batcher = self._model_batcher()
+        
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch-decode')
+        pending = set()
+        try:
+            while entries or pending:
+                while entries and len(pending) < max_pending:
+                    file_path, file_type = entries.popleft()
+                    pending.add(pool.submit(self._prepare_entry, file_path, file_type, options))
+                
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    prepared = future.result()
+                    if isinstance(prepared, dict):
+                        yield prepared
+                        continue
+                    for item in batcher.add(prepared):
+                        yield self._finish_batch_item(item)
+            
+            # Everything is decoded: score the partial batches left over
+            for item in batcher.flush():
+                yield self._finish_batch_item(item)
+        finally:
+            # A consumer that stops early abandons the remaining decodes
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _batch_entries(paths: Iterable[Union[str, Tuple[str, str]]]) -> List[Tuple[str, str]]:
+        """(path, file_type) pairs grouped by modality, input order kept within a group"""
+        entries = []
+        for entry in paths:
+            if isinstance(entry, str):
+                extension = entry.rsplit('.', 1)[-1].lower() if '.' in entry else ''
+                entry = (entry, FILE_TYPES.get(extension, 'unknown'))
+            entries.append(tuple(entry))
+        order = {'image': 0, 'audio': 1, 'video': 2}
+        entries.sort(key=lambda e: order.get(e[1], len(order)))
+        return entries
+    
+    def _batch_models(self) -> Tuple[Dict, Dict[str, int]]:
+        """Predict functions of the loaded models and their configured batch sizes"""
+        predict_fns = {
+            'image': self._predict_images,
+            'video': self._predict_clips,
+            'audio': self._predict_audio_windows
+        }
+        ready = {name: fn for name, fn in predict_fns.items() if self._model_ready(name)}
+        return ready, {name: self.model_config[f'{name}_model'].get('batch_size', 1) for name in ready}
+    
+    def _model_batcher(self) -> ModelBatcher:
+        """Batcher over the loaded models with their configured batch sizes"""
+        return ModelBatcher(*self._batch_models())
+    
+    async def analyze_file_async(self, file_path: str, file_type: str, options: Dict = None,
+                                 timeout: float = None) -> Dict:
+        """
+        Analyze a file without blocking the event loop
+        
+        Decoding and preprocessing run on a bounded thread pool shared by all
+        async callers, and inference goes through a shared queue that batches
+        samples across concurrent requests, so one event loop can keep
+        hundreds of analyses in flight. Cancelling the awaiting task, or
+        hitting the timeout, drops the request's pending decode and its
+        queued samples; a decode already running finishes in the background
+        and its output is discarded.
+        
+        Args:
+            file_path: Path to the media file
+            file_type: Type of media ('image', 'video', 'audio')
+            options: Per-request settings, as for analyze_file
+            timeout: Seconds before the analysis is cancelled
+            
+        Returns:
+            Dictionary containing analysis results
+        
+        Raises:
+            asyncio.TimeoutError: If the timeout expires first
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Models not initialized")
+        
+        return await asyncio.wait_for(self._analyze_async(file_path, file_type, options or {}), timeout)
+    
+    async def analyze_files_async(self, paths: Iterable[Union[str, Tuple[str, str]]],
+                                  options: Dict = None, timeout: float = None) -> AsyncIterator[Dict]:
+        """
+        Analyze many files concurrently, yielding results as they finish
+        
+        At most the configured max_in_flight analyses run at once. A file
+        that exceeds the per-file timeout yields an error result rather than
+        ending the stream; closing the generator early cancels the rest.
+        
+        Args:
+            paths: File paths, typed by extension, or (path, file_type) pairs
+            options: Per-request settings applied to every file
+            timeout: Per-file seconds before that analysis is cancelled
+            
+        Yields:
+            One result per file, each with 'file_path'
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Models not initialized")
+        
+        options = options or {}
+        max_in_flight = self.model_config.get('batch', {}).get('max_in_flight', 256)
+        entries = deque(self._batch_entries(paths))
+        
+        async def analyze(file_path, file_type):
+            try:
+                result = await asyncio.wait_for(self._analyze_async(file_path, file_type, options), timeout)
+            except asyncio.TimeoutError:
+                result = self._generate_error_result(f"Analysis timed out after {timeout}s")
+            result['file_path'] = file_path
+            return result
+        
+        pending = set()
+        try:
+            while entries or pending:
+                while entries and len(pending) < max_in_flight:
+                    pending.add(asyncio.ensure_future(analyze(*entries.popleft())))
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _analyze_async(self, file_path: str, file_type: str, options: Dict) -> Dict:
+        """Prepare on the decode pool, then score through the shared inference queue"""
+        executor, inference_queue = self._async_pipeline()
+        loop = asyncio.get_running_loop()
+        
+        prepared = await loop.run_in_executor(executor, self._prepare_entry, file_path, file_type, options)
+        if isinstance(prepared, dict):
+            if self._synthetic_mode and not prepared.get('cached'):
+                # Simulated model time costs this task a timer, not a thread
+                await asyncio.sleep(prepared.get('simulated_latency', 0.0))
+            return prepared
+        
+        item = await asyncio.wrap_future(inference_queue.submit(prepared))
+        return self._finish_batch_item(item)
+    
+    def _async_pipeline(self) -> Tuple[ThreadPoolExecutor, InferenceQueue]:
+        """The decode pool and inference queue shared by async callers"""
+        with self._async_lock:
+            if self._decode_executor is None:
+                batch_config = self.model_config.get('batch', {})
+                self._decode_executor = ThreadPoolExecutor(
+                    max_workers=batch_config.get('workers') or default_workers(),
+                    thread_name_prefix='async-decode'
+                )
+                predict_fns, batch_sizes = self._batch_models()
+                self._inference_queue = InferenceQueue(
+                    predict_fns, batch_sizes, max_delay=batch_config.get('max_delay', 0.005))
+            return self._decode_executor, self._inference_queue
     
-    def _analyze_image(self, file_path: str) -> Dict:
+    def _prepare_entry(self, file_path: str, file_type: str, options: Dict) -> Union[BatchItem, Dict]:
+        """
+        Decode and preprocess one file for batched inference
+        
+        Returns:
+            A BatchItem, or a finished result dict for files that cannot be
+            batched (mock models), failed to decode or were already in the
+            result cache
+        """
+        started = time.perf_counter()
+        budget = self._analysis_budget(options)
+        try:
+            prepare = {
+                'image': self._prepare_image,
+                'video': self._prepare_video,
+                'audio': self._prepare_audio
+            }.get(file_type)
+            if prepare is None:
+                raise ValueError(f"Unsupported file type: {file_type}")
+            
+            if not self._model_ready(file_type):
+                # Mock models have nothing to batch
+                result = self.analyze_file(file_path, file_type, options)
+            else:
+                timer = StageTimer()
+                with timing(timer), budgeting(budget), hashing():
+                    key, result = self._cached_result(file_path, file_type, options)
+                    if result is None:
+                        inputs, finish = prepare(file_path, options)
+                        return BatchItem(file_path, inputs, finish, started=started,
+                                         context=(timer, budget, key, options))
+                self._record_timing(result, timer)
+                self._update_prediction_history(result)
+        except Exception as e:
+            logger.error(f"Batch analysis of {file_path} failed: {e}")
+            result = self._attach_budget(self._generate_error_result(str(e)), budget)
+        
+        result['file_path'] = file_path
+        return result
+    
+    def _finish_batch_item(self, item: BatchItem) -> Dict:
+        """Result of a fully scored (or failed) batch item"""
+        try:
+            if item.error is not None:
+                raise RuntimeError(item.error)
+            timer, budget, key, options = item.context
+            timer.add('inference', item.inference_seconds)
+            with timing(timer):
+                result = item.finish(item.scores)
+                with stage('serialization'):
+                    result = _json_safe(result)
+                self._store_result(key, result, budget, options)
+            self._record_timing(result, timer)
+            self._attach_budget(result, budget)
+            self._update_prediction_history(result)
+        except Exception as e:
+            logger.error(f"Batch analysis of {item.key} failed: {e}")
+            result = self._generate_error_result(str(e))
+        
+        result['file_path'] = item.key
+        return result
+    
+    def _prepare_image(self, file_path: str, options: Dict):
+        """Model input and result builder for one image"""
+        image = self._preprocess_image(file_path)
+        phash, duplicate = self._near_duplicate(image, options)
+        if duplicate is not None:
+            return {}, lambda scores: duplicate
+        faces = self._detect_faces(file_path)
+        
+        def finish(scores):
+            result = self._image_result(image, faces, float(scores['image'][0]), ['cnn_v2', 'face_detector'])
+            result['phash'] = f"{phash:016x}"
+            return result
+        
+        return {'image': image}, finish
+    
+    def _prepare_audio(self, file_path: str, options: Dict):
+        """Gated speech windows and result builder for one recording"""
+        vad = resolve_settings(self.model_config['audio_model'].get('vad'), options.get('vad'))
+        
+        totals = {}
+        parts, spans = [], []
+        for features, kept in self._iter_speech_windows(file_path, vad, totals):
+            parts.append(features)
+            spans.extend(kept)
+        
+        engine = self._mel_engine
+        features = (np.concatenate(parts) if parts
+                    else np.empty((0, engine.frames, engine.n_mels, 1), dtype=np.float32))
+        
+        def finish(scores):
+            windows = {'timeline': self._window_timeline(spans, scores['audio']), **totals}
+            return self._audio_result(windows, vad)
+        
+        return {'audio': features}, finish
+    
+    def _prepare_video(self, file_path: str, options: Dict):
+        """Clips, face crops, soundtrack features and result builder for one video"""
+        with stage('read'):
+            probe = probe_video(file_path)
+        budget = self._frame_planner.plan(
+            probe,
+            latency_target=options.get('latency_target'),
+            queue_depth=options.get('queue_depth', 0)
+        )
+        with stage('decode'):
+            frames = self._extract_video_frames(file_path, budget['max_frames'], probe=probe)
+        tracks, detector_calls = self._track_video_faces(frames, budget)
+        
+        with stage('preprocessing'):
+            inputs = {'video': self._video_clips(frames, tracks)}
+            owners = None
+            if self._model_ready('image') and frames:
+                inputs['image'], owners = self._frame_images(frames, tracks)
+        soundtrack = self._soundtrack_features(file_path) if self._model_ready('audio') else None
+        if soundtrack is not None:
+            inputs['audio'] = soundtrack[0]
+        
+        with stage('evidence'):
+            temporal_evidence = self._analyze_temporal_consistency(frames)
+        frames_analyzed = len(frames)
+        
+        def finish(scores):
+            branches = {'video': self._clip_branch(scores['video'], tracks)}
+            if owners is not None:
+                branches['image'] = self._image_branch(scores['image'], owners)
+            if soundtrack is not None:
+                branches['audio'] = {'confidence': float(scores['audio'][0]), 'duration': soundtrack[1]}
+            confidence = self._ensemble.fuse({name: b['confidence'] for name, b in branches.items()})
+            return self._video_result(confidence, branches, temporal_evidence, tracks,
+                                      detector_calls, frames_analyzed, budget)
+        
+        return inputs, finish
+    
+    def _analyze_image(self, file_path: str, options: Dict = None) -> Dict:
         """Analyze image for deepfake content"""
+        options = options or {}
         try:
+            started = time.perf_counter()
+            
             # Load and preprocess image
             image = self._preprocess_image(file_path)
             
+            # A re-encoded, resized or cropped copy of an analyzed image
+            # reuses its result
+            phash, duplicate = self._near_duplicate(image, options)
+            if duplicate is not None:
+                return duplicate
+            
             # Face detection for enhanced analysis
             faces = self._detect_faces(file_path)
             
             if isinstance(self.models['image'], str):  # Mock model
-                return self._generate_realistic_result('image', faces)
+                result = self._generate_realistic_result('image', faces)
+                result['phash'] = f"{phash:016x}"
+                return result
             
-            # Real model prediction
-            prediction = self.models['image'].predict(image)
-            confidence = float(prediction[0][0])
-            
-            # Generate evidence
-            evidence = self._generate_image_evidence(image, faces, confidence)
+            # Cheap first stage; the full model only runs on uncertain screens
+            screen = self._cascade_screen(image, options)
+            if screen and not screen['escalate']:
+                confidence = screen['confidence']
+                models_used = ['screen_v1', 'face_detector']
+            else:
+                with stage('inference'):
+                    prediction = self.models['image'].predict(image, verbose=0)
+                confidence = float(prediction[0][0])
+                models_used = ['cnn_v2', 'face_detector']
             
-            return {
-                'prediction': 'deepfake' if confidence > 0.5 else 'authentic',
-                'confidence': confidence,
-                'is_authentic': confidence <= 0.5,
-                'models_used': ['cnn_v2', 'face_detector'],
-                'evidence': evidence,
-                'faces_detected': len(faces),
-                'file_type': 'image'
-            }
+            result = self._image_result(image, faces, confidence, models_used)
+            result['phash'] = f"{phash:016x}"
+            if screen:
+                result['cascade'] = self._cascade_finish('image', screen, started, confidence)
+            return result
             
         except Exception as e:
             logger.error(f"Image analysis failed: {e}")
             return self._generate_error_result(f"Image analysis failed: {e}")
     
-    def _analyze_video(self, file_path: str) -> Dict:
-        """Analyze video for deepfake content"""
+    def _image_result(self, image: np.ndarray, faces: List, confidence: float,
+                      models_used: List[str]) -> Dict:
+        """Image result from the model score"""
+        with stage('evidence'):
+            evidence = self._generate_image_evidence(image, faces, confidence)
+        return {
+            'prediction': 'deepfake' if confidence > 0.5 else 'authentic',
+            'confidence': confidence,
+            'is_authentic': confidence <= 0.5,
+            'models_used': models_used,
+            'evidence': evidence,
+            'faces_detected': len(faces),
+            'file_type': 'image'
+        }
+    
+    def _analyze_video(self, file_path: str, options: Dict = None) -> Dict:
+        """
+        Analyze video for deepfake content
+        
+        The audio track, the 3D-CNN clips and the per-image model on sampled
+        face crops run as concurrent ensemble branches and are fused with
+        the configured weights.
+        """
+        options = options or {}
+        run = self._ensemble.start()
         try:
+            started = time.perf_counter()
+            
+            # Size the frame and clip budget to the video and current load
+            with stage('read'):
+                probe = probe_video(file_path)
+            with self._in_flight_lock:
+                queue_depth = self._in_flight - 1 + options.get('queue_depth', 0)
+            budget = self._frame_planner.plan(
+                probe,
+                latency_target=options.get('latency_target'),
+                queue_depth=queue_depth
+            )
+            
+            # Cheap first stage on a few small frames; decisive screens skip
+            # the full decode, tracking and every model branch
+            screen = None
+            if not isinstance(self.models['video'], str) and self._cascade_enabled(options):
+                screen, screen_frames = self._screen_video(file_path, probe, options)
+                if screen and not screen['escalate']:
+                    return self._early_video_result(screen, screen_frames, budget, started)
+            
+            # The soundtrack needs no frames, so it starts before the decode
+            if self._model_ready('audio'):
+                run.submit('audio', self._analyze_soundtrack, file_path)
+            
             # Extract frames for analysis
-            frames = self._extract_video_frames(file_path)
+            decode_start = time.perf_counter()
+            with stage('decode'):
+                frames = self._extract_video_frames(file_path, budget['max_frames'], probe=probe)
+            decode_seconds = time.perf_counter() - decode_start
+            
+            # Follow faces between keyframes
+            tracks, detector_calls = self._track_video_faces(frames, budget)
             
             if isinstance(self.models['video'], str):  # Mock model
-                return self._generate_realistic_result('video', frames)
+                result = self._generate_realistic_result('video', frames)
+                result['faces_tracked'] = len(tracks)
+                result['frame_budget'] = budget
+                return result
             
-            # Preprocess frames
-            processed_frames = self._preprocess_video_frames(frames)
+            run.submit('video', self._score_video_clips, frames, tracks, probe, decode_seconds)
+            if self._model_ready('image'):
+                run.submit('image', self._score_frame_images, frames, tracks)
             
-            # Model prediction
-            prediction = self.models['video'].predict(processed_frames)
-            confidence = float(prediction[0][0])
+            # Temporal analysis overlaps the model branches
+            with stage('evidence'):
+                temporal_evidence = self._analyze_temporal_consistency(frames)
             
-            # Temporal analysis
-            temporal_evidence = self._analyze_temporal_consistency(frames)
+            ensemble = run.collect()
+            if 'video' not in ensemble['branches']:
+                raise RuntimeError(ensemble['errors'].get('video', 'video branch produced no score'))
+            branches = ensemble['branches']
+            confidence = ensemble['confidence']
             
-            return {
-                'prediction': 'deepfake' if confidence > 0.5 else 'authentic',
-                'confidence': confidence,
-                'is_authentic': confidence <= 0.5,
-                'models_used': ['temporal_v1', '3d_cnn'],
-                'evidence': {
-                    'temporal_artifacts': temporal_evidence['temporal_score'],
-                    'frame_consistency': temporal_evidence['consistency_score'],
-                    'compression_anomalies': temporal_evidence['compression_score']
-                },
-                'frames_analyzed': len(frames),
-                'file_type': 'video'
+            result = self._video_result(confidence, branches, temporal_evidence, tracks,
+                                        detector_calls, len(frames), budget)
+            result['ensemble'] = {
+                'voting_method': self._ensemble.voting_method,
+                'latency': ensemble['latency'],
+                'branch_latency_total': round(sum(b['latency'] for b in branches.values()), 4),
+                'failed_branches': ensemble['errors']
             }
+            if screen:
+                result['cascade'] = self._cascade_finish('video', screen, started, confidence)
+            return result
             
         except Exception as e:
+            run.cancel()
             logger.error(f"Video analysis failed: {e}")
             return self._generate_error_result(f"Video analysis failed: {e}")
     
-    def _analyze_audio(self, file_path: str) -> Dict:
+    def _track_video_faces(self, frames: List, budget: Dict) -> Tuple[List[Dict], int]:
+        """Face tracks across sampled frames, longest first and capped by the budget"""
+        with stage('face_detection'):
+            tracks, detector_calls = track_faces(
+                frames,
+                self._detect_faces_in_frame,
+                keyframe_interval=self.model_config['video_model'].get('keyframe_interval', 4)
+            )
+        tracks = sorted(tracks, key=lambda t: len(t['boxes']), reverse=True)
+        return tracks[:budget['max_clips']], detector_calls
+    
+    def _video_result(self, confidence: float, branches: Dict[str, Dict], temporal_evidence: Dict,
+                      tracks: List[Dict], detector_calls: int, frames_analyzed: int,
+                      budget: Dict) -> Dict:
+        """Video result from the fused score and the per-branch results"""
+        models_used = ['temporal_v1', '3d_cnn', 'face_tracker']
+        if 'image' in branches:
+            models_used.append('cnn_v2')
+        if 'audio' in branches:
+            models_used.append('audio_v3')
+        
+        return {
+            'prediction': 'deepfake' if confidence > 0.5 else 'authentic',
+            'confidence': confidence,
+            'is_authentic': confidence <= 0.5,
+            'models_used': models_used,
+            'branches': {
+                name: {k: v for k, v in branch.items() if k != 'identities'}
+                for name, branch in branches.items()
+            },
+            'audio_track': 'audio' in branches,
+            'evidence': {
+                'temporal_artifacts': temporal_evidence['temporal_score'],
+                'frame_consistency': temporal_evidence['consistency_score'],
+                'compression_anomalies': temporal_evidence['compression_score']
+            },
+            'identities': branches['video']['identities'],
+            'faces_tracked': len(tracks),
+            'detector_calls': detector_calls,
+            'frames_analyzed': frames_analyzed,
+            'frame_budget': budget,
+            'file_type': 'video'
+        }
+    
+    def _cascade_enabled(self, options: Dict) -> bool:
+        """Cascade mode for this request: per-request flag, else the config default"""
+        enabled = options.get('cascade', self.model_config.get('cascade', {}).get('enabled', False))
+        return bool(enabled) and self._model_ready('screen')
+    
+    def _cascade_screen(self, images: np.ndarray, options: Dict) -> Optional[Dict]:
+        """
+        First cascade stage: the screening model on downscaled RGB images in [0, 1]
+        
+        Returns:
+            Screening confidence, whether to escalate to the full model, whether
+            this request is an accuracy audit and the stage latency; None when
+            cascade mode is off
+        """
+        if not self._cascade_enabled(options) or not len(images):
+            return None
+        
+        start = time.perf_counter()
+        size = tuple(self.model_config.get('cascade', {}).get('screen_size', (112, 112)))
+        with stage('preprocessing'):
+            small = np.stack([cv2.resize(image, size, interpolation=cv2.INTER_AREA) for image in images])
+        # A direct call skips predict()'s per-call pipeline setup, which would
+        # cost more than this small batch itself
+        with stage('inference'):
+            scores = self.models['screen'](small, training=False).numpy()
+        confidence = float(np.mean(scores))
+        escalate, audit = self._cascade.decide(confidence)
+        return {
+            'confidence': confidence,
+            'escalate': escalate,
+            'audit': audit,
+            'latency': time.perf_counter() - start
+        }
+    
+    def _cascade_finish(self, modality: str, screen: Dict, started: float, confidence: float) -> Dict:
+        """Record a cascaded request in the metrics and describe the decision"""
+        latency = time.perf_counter() - started
+        exited = not screen['escalate']
+        self._cascade.record(
+            modality, latency, screen['latency'], exited, screen['confidence'],
+            full_confidence=None if exited else confidence,
+            audited=screen['audit']
+        )
+        return {
+            'stage': 'screen' if exited else 'full',
+            'exited_early': exited,
+            'screen_confidence': screen['confidence'],
+            'uncertainty_band': list(self._cascade.band),
+            'audited': screen['audit'],
+            'screen_latency': round(screen['latency'], 4)
+        }
+    
+    def _screen_video(self, file_path: str, probe: Dict, options: Dict) -> Tuple[Optional[Dict], List]:
+        """Decode a few evenly spaced, downscaled frames and screen them"""
+        config = self.model_config.get('cascade', {})
+        indices = sample_indices(probe['frame_count'], config.get('screen_frames', 8))
+        with stage('decode'):
+            frames = decode_frames(file_path, indices, workers=1,
+                                   max_side=config.get('screen_max_side', 320), probe=probe)
+        with stage('preprocessing'):
+            images = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB).astype(np.float32) * (1.0 / 255.0)
+                      for frame in frames]
+        return self._cascade_screen(np.array(images), options), frames
+    
+    def _early_video_result(self, screen: Dict, frames: List, budget: Dict, started: float) -> Dict:
+        """Video result from the screening stage alone"""
+        confidence = screen['confidence']
+        with stage('evidence'):
+            temporal_evidence = self._analyze_temporal_consistency(frames)
+        return {
+            'prediction': 'deepfake' if confidence > 0.5 else 'authentic',
+            'confidence': confidence,
+            'is_authentic': confidence <= 0.5,
+            'models_used': ['temporal_v1', 'screen_v1'],
+            'branches': {'screen': {'confidence': confidence, 'latency': round(screen['latency'], 4)}},
+            'audio_track': False,
+            'evidence': {
+                'temporal_artifacts': temporal_evidence['temporal_score'],
+                'frame_consistency': temporal_evidence['consistency_score'],
+                'compression_anomalies': temporal_evidence['compression_score']
+            },
+            'identities': [],
+            'faces_tracked': 0,
+            'detector_calls': 0,
+            'frames_analyzed': len(frames),
+            'frame_budget': budget,
+            'cascade': self._cascade_finish('video', screen, started, confidence),
+            'file_type': 'video'
+        }
+    
+    def get_cascade_stats(self) -> Dict:
+        """Early-exit fraction, latency saved and audit agreement of cascade mode"""
+        return self._cascade.stats()
+    
+    def _model_ready(self, name: str) -> bool:
+        """Whether a real (non-mock, loaded) model exists for a branch"""
+        return not isinstance(self.models.get(name), (str, type(None)))
+    
+    def _score_video_clips(self, frames: List, tracks: List[Dict], probe: Dict,
+                           decode_seconds: float) -> Dict:
+        """Video branch: 3D-CNN score per tracked identity, or over whole frames"""
+        with stage('preprocessing'):
+            clips = self._video_clips(frames, tracks)
+        
+        # Model prediction, one clip per identity
+        inference_start = time.perf_counter()
+        scores = self._predict_clips(clips)
+        
+        self._frame_planner.observe(
+            frames=len(frames),
+            megapixels=probe['width'] * probe['height'] / 1e6,
+            decode_seconds=decode_seconds,
+            clips=len(clips),
+            inference_seconds=time.perf_counter() - inference_start
+        )
+        return self._clip_branch(scores, tracks)
+    
+    def _video_clips(self, frames: List, tracks: List[Dict]) -> np.ndarray:
+        """Face-centred clips when faces were found, one whole-frame clip otherwise"""
+        video_config = self.model_config['video_model']
+        if tracks:
+            return build_face_clips(
+                frames, tracks,
+                frames_per_clip=video_config['frames_per_clip'],
+                size=tuple(video_config['input_size'][:2]),
+                margin=video_config.get('face_margin', 0.25)
+            )
+        return self._preprocess_video_frames(frames)
+    
+    @staticmethod
+    def _clip_branch(scores: np.ndarray, tracks: List[Dict]) -> Dict:
+        """Video branch result from per-clip scores"""
+        # The most suspicious face decides the verdict
+        return {
+            'confidence': float(np.max(scores)),
+            'clips': len(scores),
+            'identities': [
+                {
+                    'id': track['id'],
+                    'confidence': float(score),
+                    'frames_tracked': len(track['boxes'])
+                }
+                for track, score in zip(tracks, scores)
+            ]
+        }
+    
+    def _score_frame_images(self, frames: List, tracks: List[Dict]) -> Optional[Dict]:
+        """Image branch: the per-image model on face crops sampled along each track"""
+        if not frames:
+            return None
+        with stage('preprocessing'):
+            images, owners = self._frame_images(frames, tracks)
+        scores = self._predict_images(images)
+        return self._image_branch(scores, owners)
+    
+    def _frame_images(self, frames: List, tracks: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Image-model inputs sampled from a video and the track index of each"""
+        per_track = self.model_config['video_model'].get('image_frames', 8)
+        size = tuple(self.model_config['image_model']['input_size'][:2])
+        
+        if tracks:
+            images, owners = build_face_images(
+                frames, tracks, per_track, size=size,
+                margin=self.model_config['video_model'].get('face_margin', 0.25)
+            )
+        else:
+            picks = np.unique(np.linspace(0, len(frames) - 1, per_track).round().astype(int))
+            images = np.stack([
+                cv2.cvtColor(cv2.resize(frames[i], size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+                for i in picks
+            ]).astype(np.float32) * (1.0 / 255.0)
+            owners = np.zeros(len(images), dtype=int)
+        return images, owners
+    
+    @staticmethod
+    def _image_branch(scores: np.ndarray, owners: np.ndarray) -> Dict:
+        """Image branch result from per-crop scores"""
+        # Mean over each identity's crops; the most suspicious identity decides
+        per_identity = [float(scores[owners == i].mean()) for i in np.unique(owners)]
+        return {'confidence': max(per_identity), 'images': len(scores)}
+    
+    def _analyze_audio(self, file_path: str, options: Dict = None) -> Dict:
         """Analyze audio for deepfake content"""
+        options = options or {}
         try:
-            # Load and preprocess audio
-            audio_features = self._preprocess_audio(file_path)
-            
             if isinstance(self.models['audio'], str):  # Mock model
+                audio_features = self._preprocess_audio(file_path)
                 return self._generate_realistic_result('audio', audio_features)
             
-            # Model prediction
-            prediction = self.models['audio'].predict(audio_features)
-            confidence = float(prediction[0][0])
+            vad = resolve_settings(self.model_config['audio_model'].get('vad'), options.get('vad'))
             
-            # Audio-specific evidence
-            audio_evidence = self._generate_audio_evidence(audio_features, confidence)
-            
-            return {
-                'prediction': 'deepfake' if confidence > 0.5 else 'authentic',
-                'confidence': confidence,
-                'is_authentic': confidence <= 0.5,
-                'models_used': ['audio_v3', 'spectral_analyzer'],
-                'evidence': audio_evidence,
-                'file_type': 'audio'
-            }
+            # Score the speech in the whole recording window by window
+            windows = self._score_audio_windows(file_path, vad)
+            return self._audio_result(windows, vad)
             
         except Exception as e:
             logger.error(f"Audio analysis failed: {e}")
             return self._generate_error_result(f"Audio analysis failed: {e}")
     
-    def _generate_realistic_result(self, file_type: str, features=None) -> Dict:
-        """Generate realistic mock results based on enhanced logic"""
-        
-        # More sophisticated prediction logic based on file type
-        base_authentic_prob = {
-            'image': 0.65,  # Images slightly more likely to be authentic
-            'video': 0.55,  # Videos more suspicious
-            'audio': 0.70   # Audio files usually authentic
-        }.get(file_type, 0.60)
-        
-        # Add randomness but with realistic patterns
-        random_factor = np.random.normal(0, 0.15)  # Normal distribution
-        authentic_prob = np.clip(base_authentic_prob + random_factor, 0.1, 0.9)
-        
-        is_authentic = np.random.random() < authentic_prob
-        prediction = 'authentic' if is_authentic else 'deepfake'
-        
-        # Generate confidence based on prediction quality
-        if is_authentic:
-            # Authentic files: higher confidence when clearly authentic
-            base_confidence = np.random.uniform(0.75, 0.95)
-        else:
-            # Deepfake files: varied confidence based on quality
-            base_confidence = np.random.uniform(0.60, 0.90)
+    def _audio_result(self, windows: Dict, vad: Dict) -> Dict:
+        """
+        Audio result from a scored window timeline
+        
+        Raises:
+            ValueError: If no audio could be decoded at all
+        """
+        total_windows = len(windows['timeline']) + windows['skipped']
+        if not total_windows:
+            raise ValueError("No audio could be decoded")
         
-        # Add some low-confidence edge cases
-        if np.random.random() < 0.15:  # 15% chance for uncertain results
-            base_confidence = np.random.uniform(0.45, 0.65)
+        vad_summary = {
+            'enabled': vad['enabled'],
+            'windows_skipped': windows['skipped'],
+            'skipped_fraction': windows['skipped'] / total_windows
+        }
         
-        confidence = np.clip(base_confidence, 0.01, 0.99)
+        if not windows['timeline']:
+            # Nothing but silence or static sound: no voice to judge
+            return {
+                'prediction': 'authentic',
+                'confidence': 0.0,
+                'is_authentic': True,
+                'models_used': ['voice_activity'],
+                'evidence': {
+                    'spectral_anomalies': 0.0,
+                    'voice_consistency': 1.0,
+                    'synthesis_artifacts': 0.0
+                },
+                'speech_detected': False,
+                'timeline': [],
+                'windows_analyzed': 0,
+                'peak_confidence': 0.0,
+                'duration_analyzed': windows['duration'],
+                'truncated': windows['truncated'],
+                'voice_activity': vad_summary,
+                'file_type': 'audio'
+            }
         
-        # Generate evidence based on file type and prediction
-        evidence = self._generate_evidence_by_type(file_type, prediction, confidence)
+        scores = np.array([w['confidence'] for w in windows['timeline']])
+        confidence = float(scores.mean())
         
-        # Select appropriate models based on file type
-        models_used = {
-            'image': ['cnn_v2', 'face_detector', 'texture_analyzer'],
-            'video': ['temporal_v1', '3d_cnn', 'optical_flow'],
-            'audio': ['audio_v3', 'spectral_analyzer', 'voice_consistency']
-        }.get(file_type, ['ensemble'])
+        # Audio-specific evidence
+        with stage('evidence'):
+            audio_evidence = self._generate_audio_evidence(scores, confidence)
         
         return {
-            'prediction': prediction,
+            'prediction': 'deepfake' if confidence > 0.5 else 'authentic',
             'confidence': confidence,
-            'is_authentic': is_authentic,
-            'models_used': models_used,
-            'evidence': evidence,
-            'file_type': file_type
+            'is_authentic': confidence <= 0.5,
+            'models_used': ['audio_v3', 'spectral_analyzer', 'voice_activity'],
+            'evidence': audio_evidence,
+            'speech_detected': True,
+            'timeline': windows['timeline'],
+            'windows_analyzed': len(windows['timeline']),
+            'peak_confidence': float(scores.max()),
+            'duration_analyzed': windows['duration'],
+            'truncated': windows['truncated'],
+            'voice_activity': vad_summary,
+            'file_type': 'audio'
         }
     
-    def _generate_evidence_by_type(self, file_type: str, prediction: str, confidence: float) -> Dict:
-        """Generate realistic evidence scores based on file type and prediction"""
-        
-        evidence = {}
-        
-        # Base anomaly levels based on prediction
-        if prediction == 'authentic':
-            base_anomaly = 0.15  # Low anomalies for authentic files
-            anomaly_range = 0.25
-        else:
-            base_anomaly = 0.60  # Higher anomalies for deepfakes
-            anomaly_range = 0.35
-        
-        # Confidence correlation
-        confidence_factor = (confidence - 0.5) * 0.3
-        
-        if file_type == 'image':
-            evidence = {
-                'facial_inconsistencies': np.clip(
-                    base_anomaly + np.random.uniform(-anomaly_range/2, anomaly_range/2) + 
-                    (confidence_factor if prediction == 'deepfake' else -confidence_factor), 0, 1
-                ),
-                'texture_artifacts': np.clip(
-                    base_anomaly + np.random.uniform(-anomaly_range/2, anomaly_range/2) +
-                    (confidence_factor if prediction == 'deepfake' else -confidence_factor), 0, 1
-                ),
-                'compression_anomalies': np.clip(
-                    base_anomaly * 0.8 + np.random.uniform(0, anomaly_range), 0, 1
-                )
-            }
-        elif file_type == 'video':
-            evidence = {
-                'temporal_artifacts': np.clip(
-                    base_anomaly + np.random.uniform(-anomaly_range/2, anomaly_range/2) +
-                    (confidence_factor if prediction == 'deepfake' else -confidence_factor), 0, 1
-                ),
-                'frame_consistency': np.clip(
-                    1 - (base_anomaly + np.random.uniform(-anomaly_range/2, anomaly_range/2)), 0, 1
-                ),
-                'compression_anomalies': np.clip(
-                    base_anomaly * 0.7 + np.random.uniform(0, anomaly_range), 0, 1
-                )
-            }
-        elif file_type == 'audio':
-            evidence = {
-                'spectral_anomalies': np.clip(
-                    base_anomaly + np.random.uniform(-anomaly_range/2, anomaly_range/2) +
-                    (confidence_factor if prediction == 'deepfake' else -confidence_factor), 0, 1
-                ),
-                'voice_consistency': np.clip(
-                    1 - (base_anomaly + np.random.uniform(-anomaly_range/2, anomaly_range/2)), 0, 1
-                ),
-                'synthesis_artifacts': np.clip(
-                    base_anomaly * 0.9 + np.random.uniform(0, anomaly_range), 0, 1
-                )
-            }
-        
-        return evidence
+    def _generate_realistic_result(self, file_type: str, features=None) -> Dict:
+        """Generate realistic mock results from the seeded synthetic backend"""
+        result = self._synthetic.result(file_type)
+        del result['simulated_latency']
+        return result
     
     # Preprocessing and utility methods
     
     def _preprocess_image(self, file_path: str) -> np.ndarray:
         """Preprocess image for model input"""
         try:
-            image = cv2.imread(file_path)
-            if image is None:
-                raise ValueError("Could not load image")
+            with stage('read'):
+                data = np.fromfile(file_path, dtype=np.uint8)
+            
+            size = self._image_size(data)
+            
+            # Charge the pixels from the header, so oversized images are
+            # refused before the decoder allocates them
+            budget = current_budget()
+            held = 0
+            if budget is not None:
+                budget.check()
+                if size is not None:
+                    held = size[0] * size[1] * 3
+                    budget.charge('pixels', size[0] * size[1])
+                    budget.hold(held)
             
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            image = cv2.resize(image, (224, 224))
-            image = image.astype(np.float32) / 255.0
-            return np.expand_dims(image, axis=0)
+            # Large images decode downscaled by up to 8x, still at least the
+            # model input size; JPEG scales in the DCT domain at a fraction
+            # of the cost of a full decode
+            flag = cv2.IMREAD_COLOR
+            if size is not None:
+                for factor, reduced in ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4),
+                                        (2, cv2.IMREAD_REDUCED_COLOR_2)):
+                    if min(size) // factor >= 224:
+                        flag = reduced
+                        break
+            
+            try:
+                with stage('decode'):
+                    image = cv2.imdecode(data, flag)
+                if image is None:
+                    raise ValueError("Could not load image")
+                if budget is not None and not held:
+                    held = image.nbytes
+                    budget.charge('pixels', image.shape[0] * image.shape[1])
+                    budget.hold(held)
+                
+                with stage('preprocessing'):
+                    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+                    image = cv2.resize(image, (224, 224))
+                    image = image.astype(np.float32) / 255.0
+                    return np.expand_dims(image, axis=0)
+            finally:
+                if held:
+                    budget.release(held)
         except Exception as e:
             logger.error(f"Image preprocessing failed: {e}")
             raise
     
+    @staticmethod
+    def _image_size(data: np.ndarray) -> Optional[Tuple[int, int]]:
+        """(width, height) from an encoded image's header, or None if unreadable"""
+        try:
+            with Image.open(io.BytesIO(data.tobytes())) as header:
+                return header.size
+        except Exception:
+            return None
+    
+    def _generate_image_evidence(self, image: np.ndarray, faces: List, confidence: float) -> Dict:
+        """Evidence scores for a single image from the model score and pixel statistics"""
+        gray = cv2.cvtColor((image[0] * 255).astype(np.uint8), cv2.COLOR_RGB2GRAY)
+        
+        # Over-smoothed or over-sharpened texture shows up in the Laplacian spread
+        sharpness = float(cv2.Laplacian(gray, cv2.CV_32F).var())
+        texture = float(np.clip(abs(np.log10(sharpness + 1e-6) - 2.5) / 2.5, 0, 1))
+        
+        # 8x8 grid discontinuities hint at recompression
+        block = gray.astype(np.float32)
+        edges = np.abs(np.diff(block, axis=1))
+        grid = edges[:, 7::8].mean() / (edges.mean() + 1e-6)
+        
+        return {
+            'facial_inconsistencies': float(confidence) if faces else 0.0,
+            'texture_artifacts': texture,
+            'compression_anomalies': float(np.clip(grid - 1.0, 0, 1))
+        }
+    
     def _detect_faces(self, file_path: str) -> List:
         """Detect faces in image"""
+        with stage('face_detection'):
+            return self._find_faces(file_path)
+    
+    def _find_faces(self, file_path: str) -> List:
         if FACE_RECOGNITION_AVAILABLE:
             try:
                 image = face_recognition.load_image_file(file_path)
@@ -483,16 +1550,7 @@ class DeepFakeDetector:
         # Fallback using OpenCV for basic face detection
         try:
             image = cv2.imread(file_path)
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Use OpenCV's built-in face detector as fallback
-            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-            faces = face_cascade.detectMultiScale(gray, 1.3, 5)
-            
-            # Convert to face_recognition format (top, right, bottom, left)
-            face_locations = []
-            for (x, y, w, h) in faces:
-                face_locations.append((y, x + w, y + h, x))
+            face_locations = self._detect_faces_cascade(image)
             
             return face_locations if face_locations else [(50, 200, 150, 100)]  # Mock if no faces found
         except Exception as e:
@@ -500,53 +1558,426 @@ class DeepFakeDetector:
             # Return mock face detection for demo
             return [(50, 200, 150, 100)]  # Mock face coordinates
     
-    def _extract_video_frames(self, file_path: str, max_frames: int = 16) -> List:
+    def _detect_faces_cascade(self, image: np.ndarray) -> List:
+        """Detect faces in a BGR array with OpenCV's Haar cascade"""
+        if self._face_cascade is None:
+            self._face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        faces = self._face_cascade.detectMultiScale(gray, 1.3, 5)
+        
+        # Convert to face_recognition format (top, right, bottom, left)
+        return [(y, x + w, y + h, x) for (x, y, w, h) in faces]
+    
+    def _detect_faces_in_frame(self, frame: np.ndarray) -> List:
+        """Detect faces in a decoded BGR video frame (no mock fallback)"""
+        if FACE_RECOGNITION_AVAILABLE:
+            try:
+                return face_recognition.face_locations(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            except Exception as e:
+                logger.warning(f"Face recognition failed: {e}, using fallback")
+        
+        try:
+            return self._detect_faces_cascade(frame)
+        except Exception as e:
+            logger.warning(f"OpenCV face detection failed: {e}")
+            return []
+    
+    def _preprocess_video_frames(self, frames: List) -> np.ndarray:
+        """Resize whole frames into a single (1, frames_per_clip, H, W, 3) clip"""
+        video_config = self.model_config['video_model']
+        frames_per_clip = video_config['frames_per_clip']
+        height, width = video_config['input_size'][:2]
+        
+        clip = np.zeros((1, frames_per_clip, height, width, 3), dtype=np.float32)
+        if not frames:
+            return clip
+        
+        picks = np.linspace(0, len(frames) - 1, frames_per_clip).round().astype(int)
+        for i, pick in enumerate(picks):
+            frame = cv2.resize(frames[pick], (width, height), interpolation=cv2.INTER_AREA)
+            clip[0, i] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return clip / 255.0
+    
+    def _extract_video_frames(self, file_path: str, max_frames: int = 16, probe: Dict = None) -> List:
         """Extract frames from video"""
         try:
-            cap = cv2.VideoCapture(file_path)
-            frames = []
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            
-            # Sample frames evenly
-            step = max(1, frame_count // max_frames)
-            
-            for i in range(0, frame_count, step):
-                cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-                ret, frame = cap.read()
-                if ret:
-                    frames.append(frame)
-                if len(frames) >= max_frames:
-                    break
+            video_config = self.model_config['video_model']
+            probe = probe or probe_video(file_path)
+            max_side = video_config.get('decode_max_side')
             
-            cap.release()
-            return frames
+            # Sample fewer frames, still spread over the whole video, when
+            # the pixel or memory budget cannot take them all
+            budget = current_budget()
+            if budget is not None:
+                width, height = output_shape(probe['width'], probe['height'], max_side)
+                wanted = len(sample_indices(probe['frame_count'], max_frames))
+                max_frames = budget.fit(wanted, pixels=width * height, memory_bytes=width * height * 3)
+                budget.charge('pixels', max_frames * width * height)
+                budget.hold(max_frames * width * height * 3)
+            
+            # Sample frames evenly; long videos decode in parallel ranges
+            return decode_frames(
+                file_path,
+                sample_indices(probe['frame_count'], max_frames),
+                workers=video_config.get('decode_workers'),
+                max_side=max_side,
+                parallel_min_frames=video_config.get('parallel_min_frames', 600),
+                probe=probe
+            )
+        except BudgetExceeded:
+            raise
         except:
             # Return mock frames for demo
             return [np.zeros((224, 224, 3), dtype=np.uint8) for _ in range(max_frames)]
     
+    def _analyze_temporal_consistency(self, frames: List) -> Dict:
+        """Score frame-to-frame motion, flow coherence and codec blockiness"""
+        # Failures propagate to _analyze_video's error result rather than
+        # being reported as clean evidence
+        return analyze_temporal_consistency(
+            frames,
+            size=self.model_config['video_model'].get('temporal_size', 64),
+            flow_block=self.model_config['video_model'].get('flow_block', 8)
+        )
+    
     def _preprocess_audio(self, file_path: str) -> np.ndarray:
         """Preprocess audio for model input"""
         try:
             # Load audio file
-            y, sr = librosa.load(file_path, sr=16000, duration=10)  # 10 seconds max
+            audio_config = self.model_config['audio_model']
+            sr = audio_config['sample_rate']
+            max_samples = 10 * sr  # 10 seconds max
             
-            # Extract mel-spectrogram features
-            mel_spec = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=128)
-            mel_spec_db = librosa.power_to_db(mel_spec, ref=np.max)
-            
-            # Normalize and reshape
-            features = (mel_spec_db - np.mean(mel_spec_db)) / np.std(mel_spec_db)
-            
-            # Pad or truncate to fixed size
-            if features.shape[1] < 128:
-                features = np.pad(features, ((0, 0), (0, 128 - features.shape[1])), mode='constant')
-            else:
-                features = features[:, :128]
+            budget = current_budget()
+            if budget is not None:
+                max_samples = budget.fit(max_samples, audio_samples=1, memory_bytes=4)
+            y = load_audio(file_path, sr=sr, max_seconds=max_samples / sr,
+                           res_type=audio_config.get('resample_type', 'soxr_hq'))
+            if budget is None:
+                return self._audio_features(y, sr)
             
-            return np.expand_dims(features.T, axis=(0, -1))
+            budget.charge('audio_samples', len(y))
+            budget.hold(y.nbytes)
+            try:
+                checkpoint()
+                return self._audio_features(y, sr)
+            finally:
+                budget.release(y.nbytes)
+        except BudgetExceeded:
+            raise
         except:
             # Return mock audio features for demo
-            return np.random.randn(1, 128, 1)
+            return np.zeros((1, 128, 1), dtype=np.float32)
+    
+    def _audio_features(self, y: np.ndarray, sr: int) -> np.ndarray:
+        """Normalized (1, 128, n_mels, 1) mel-spectrogram features from PCM"""
+        engine = self._mel_engine
+        if sr != engine.sr:
+            engine = MelFeatureEngine(sr=sr, n_mels=engine.n_mels)
+        return engine.compute([y])
+    
+    def _predict_images(self, images: np.ndarray) -> np.ndarray:
+        """Score a batch of preprocessed images"""
+        with stage('inference'):
+            return self.models['image'].predict(images, batch_size=len(images), verbose=0)[:, 0]
+    
+    def _predict_clips(self, clips: np.ndarray) -> np.ndarray:
+        """Score a batch of video clips"""
+        with stage('inference'):
+            return self.models['video'].predict(clips, batch_size=len(clips), verbose=0)[:, 0]
+    
+    def _predict_audio(self, features: np.ndarray) -> float:
+        """Score audio features with the 1D model, one mel frame per sample"""
+        return float(np.mean(self._predict_audio_windows(features)))
+    
+    def _predict_audio_windows(self, features: np.ndarray) -> np.ndarray:
+        """Score a (windows, frames, n_mels, 1) batch in one forward pass"""
+        # The model takes (n_mels, 1) mel-bin vectors; score every frame and
+        # average within each window
+        windows, frames_per_window = features.shape[:2]
+        frames = features.reshape(-1, features.shape[-2], 1)
+        with stage('inference'):
+            prediction = self.models['audio'].predict(frames, batch_size=len(frames), verbose=0)
+        return prediction.reshape(windows, frames_per_window).mean(axis=1)
+    
+    def _score_audio_windows(self, file_path: str, vad: Dict = None) -> Dict:
+        """
+        Stream a recording in fixed windows and score the speech in batches
+        
+        Args:
+            file_path: Audio file
+            vad: Gate settings from voice_activity.resolve_settings
+        
+        Returns:
+            Dictionary with the per-window timeline of scored windows, the
+            number of skipped windows, analyzed duration and whether
+            max_windows cut the recording short
+        """
+        totals = {}
+        timeline = []
+        for features, spans in self._iter_speech_windows(file_path, vad, totals):
+            if len(features):
+                timeline.extend(self._window_timeline(spans, self._predict_audio_windows(features)))
+        return {'timeline': timeline, **totals}
+    
+    def _window_timeline(self, spans: List[Tuple[int, int]], scores: np.ndarray) -> List[Dict]:
+        """Timeline entries for scored windows given their sample spans"""
+        sr = self.model_config['audio_model']['sample_rate']
+        return [
+            {'start': start / sr, 'end': end / sr, 'confidence': float(score)}
+            for (start, end), score in zip(spans, scores)
+        ]
+    
+    def _iter_speech_windows(self, file_path: str, vad: Dict,
+                             totals: Dict) -> Iterator[Tuple[np.ndarray, List[Tuple[int, int]]]]:
+        """
+        Featurize a recording batch by batch and yield the windows that hold speech
+        
+        Windows the voice-activity gate rejects are dropped before inference.
+        Decoded PCM, and optionally the mel features, come from the audio
+        cache when this content was analyzed before with the same settings.
+        
+        Args:
+            file_path: Audio file
+            vad: Gate settings from voice_activity.resolve_settings
+            totals: Filled with 'skipped', 'duration' and 'truncated' as the
+                recording is consumed
+        
+        Yields:
+            (features, spans): a (windows, frames, n_mels, 1) array of speech
+            windows, possibly empty, and their sample spans
+        """
+        audio_config = self.model_config['audio_model']
+        sr = audio_config['sample_rate']
+        window_samples = int(audio_config['window_seconds'] * sr)
+        batch_size = audio_config.get('batch_size', 16)
+        max_windows = audio_config.get('max_windows', 900)
+        
+        cache = self._audio_cache
+        key = cache.key(file_path, self._audio_cache_params()) if cache else None
+        cache_features = cache is not None and audio_config.get('cache', {}).get('features', False)
+        
+        totals.update(skipped=0, duration=0.0, truncated=False)
+        
+        def gate(features, energy_db, flux, spans):
+            speech = speech_windows(energy_db, flux, vad)
+            totals['skipped'] += int(np.count_nonzero(~speech))
+            return features[speech], [span for span, keep in zip(spans, speech) if keep]
+        
+        if cache_features:
+            cached = cache.get(key, FEATURE_ARRAYS)
+            if cached is not None:
+                count = min(len(cached['spans']), max_windows)
+                for start in range(0, count, batch_size):
+                    rows = slice(start, min(start + batch_size, count))
+                    with stage('read'):
+                        features = np.asarray(cached['features'][rows])
+                        energy = [e[~np.isnan(e)] for e in cached['energy'][rows]]
+                        flux = [f[~np.isnan(f)] for f in cached['flux'][rows]]
+                    yield gate(features, energy, flux,
+                               [tuple(span) for span in cached['spans'][rows].tolist()])
+                totals['duration'] = float(cached['spans'][count - 1][1]) / sr if count else 0.0
+                totals['truncated'] = count < len(cached['spans'])
+                return
+        
+        batch, spans = [], []
+        collected = {name: [] for name in FEATURE_ARRAYS} if cache_features else None
+        windows_seen = 0
+        analyzed_samples = 0
+        
+        def flush():
+            with stage('preprocessing'):
+                features, energy_db, flux = self._mel_engine.compute_with_activity(batch)
+                if collected is not None:
+                    collected['features'].append(features)
+                    collected['energy'].extend(energy_db)
+                    collected['flux'].extend(flux)
+                    collected['spans'].extend(spans)
+                gated = gate(features, energy_db, flux, list(spans))
+            batch.clear()
+            spans.clear()
+            return gated
+        
+        budget = current_budget()
+        blocks, cached_pcm = self._pcm_blocks(file_path, key)
+        windows = iter_windows(blocks, window_samples, min_samples=window_samples // 4)
+        try:
+            # Pulling windows drives the decode, or page-ins of cached PCM
+            for window in timed_iter(windows, 'read' if cached_pcm else 'decode'):
+                if windows_seen >= max_windows:
+                    totals['truncated'] = True
+                    break
+                
+                if budget is not None:
+                    # Out of time or samples: score what was decoded so far,
+                    # or fail if that is nothing
+                    if not windows_seen:
+                        budget.check()
+                    elif budget.expired():
+                        budget.truncate('wall_seconds')
+                        totals['truncated'] = True
+                        break
+                    elif not budget.fits('audio_samples', len(window)):
+                        budget.truncate('audio_samples')
+                        totals['truncated'] = True
+                        break
+                    budget.charge('audio_samples', len(window))
+                
+                windows_seen += 1
+                spans.append((analyzed_samples, analyzed_samples + len(window)))
+                analyzed_samples += len(window)
+                totals['duration'] = analyzed_samples / sr
+                batch.append(window)
+                if len(batch) == batch_size:
+                    yield flush()
+        finally:
+            # Stops the decode and discards a partially spooled cache entry
+            windows.close()
+            blocks.close()
+        
+        if batch:
+            yield flush()
+        
+        if collected is not None and not totals['truncated'] and collected['spans']:
+            cache.put(key, self._pack_feature_entry(collected))
+    
+    def _pcm_blocks(self, file_path: str, key: Optional[str]) -> Tuple[Iterator[np.ndarray], bool]:
+        """
+        Decoded PCM blocks, memory-mapped from the cache or decoded and spooled into it
+        
+        Returns:
+            (blocks, whether they come from the cache)
+        """
+        audio_config = self.model_config['audio_model']
+        sr = audio_config['sample_rate']
+        block_seconds = audio_config.get('block_seconds', 30.0)
+        
+        if key is not None:
+            cached = self._audio_cache.get(key)
+            if cached is not None:
+                pcm = cached['pcm']
+                step = max(1, int(block_seconds * sr))
+                return (pcm[start:start + step] for start in range(0, len(pcm), step)), True
+        
+        # Decode no further than the window cap, plus one window so that
+        # running into the cap still marks the analysis truncated
+        max_seconds = (audio_config.get('max_windows', 900) + 1) * audio_config['window_seconds']
+        blocks = stream_audio(file_path, sr=sr, block_seconds=block_seconds,
+                              res_type=audio_config.get('resample_type', 'soxr_hq'),
+                              max_seconds=max_seconds)
+        if key is None:
+            return blocks, False
+        return self._audio_cache.put_stream(key, 'pcm', blocks), False
+    
+    def _audio_cache_params(self) -> Dict:
+        """Everything that changes the cached PCM or features for a given file"""
+        audio_config = self.model_config['audio_model']
+        engine = self._mel_engine
+        return {
+            'sample_rate': audio_config['sample_rate'],
+            'resample_type': audio_config.get('resample_type', 'soxr_hq'),
+            'window_seconds': audio_config['window_seconds'],
+            'n_mels': engine.n_mels,
+            'n_fft': engine.n_fft,
+            'hop_length': engine.hop_length,
+            'frames': engine.frames
+        }
+    
+    @staticmethod
+    def _pack_feature_entry(collected: Dict) -> Dict[str, np.ndarray]:
+        """Stack per-window features and NaN-pad the ragged activity arrays"""
+        frames = max(len(e) for e in collected['energy'])
+        energy = np.full((len(collected['energy']), frames), np.nan, dtype=np.float32)
+        flux = np.full_like(energy, np.nan)
+        for row, (e, f) in enumerate(zip(collected['energy'], collected['flux'])):
+            energy[row, :len(e)] = e
+            flux[row, :len(f)] = f
+        return {
+            'features': np.concatenate(collected['features']),
+            'energy': energy,
+            'flux': flux,
+            'spans': np.array(collected['spans'], dtype=np.int64)
+        }
+    
+    def get_cache_stats(self) -> Dict:
+        """Decoded-audio cache counters; empty when the cache is disabled"""
+        return self._audio_cache.stats() if self._audio_cache else {}
+    
+    def get_result_cache_stats(self) -> Dict:
+        """Result cache counters; empty when the cache is disabled"""
+        return self._result_cache.stats() if self._result_cache else {}
+    
+    def open_audio_stream(self, sample_rate: int = 16000, channels: int = 1,
+                          sample_format: str = 'f32le', options: Dict = None) -> AudioStreamSession:
+        """
+        Start incremental analysis of live audio
+        
+        Args:
+            sample_rate: Sample rate of the raw PCM that will be fed
+            channels: Interleaved channel count
+            sample_format: 'f32le' or 's16le'
+            options: Per-request settings; 'vad' as for analyze_file
+        
+        Returns:
+            Session whose feed() returns a scored event per completed window
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Models not initialized")
+        
+        options = options or {}
+        audio_config = self.model_config['audio_model']
+        
+        if isinstance(self.models['audio'], str):  # Mock model
+            def score_fn(features):
+                return self._synthetic.confidences('audio', len(features))
+        else:
+            score_fn = self._predict_audio_windows
+        
+        return AudioStreamSession(
+            self._mel_engine,
+            score_fn,
+            window_samples=int(audio_config['window_seconds'] * audio_config['sample_rate']),
+            sample_rate=sample_rate,
+            channels=channels,
+            sample_format=sample_format,
+            vad=resolve_settings(audio_config.get('vad'), options.get('vad'))
+        )
+    
+    def _generate_audio_evidence(self, window_scores: np.ndarray, confidence: float) -> Dict:
+        """Summarize per-window scores as evidence"""
+        threshold = self.model_config['audio_model']['threshold']
+        return {
+            'spectral_anomalies': float(np.max(window_scores)),
+            'voice_consistency': float(np.clip(1 - 2 * np.std(window_scores), 0, 1)),
+            'synthesis_artifacts': float(np.mean(window_scores > threshold))
+        }
+    
+    def _analyze_soundtrack(self, file_path: str) -> Optional[Dict]:
+        """Score a video's audio track; None when it has no usable audio"""
+        soundtrack = self._soundtrack_features(file_path)
+        if soundtrack is None:
+            return None
+        features, duration = soundtrack
+        return {'confidence': self._predict_audio(features), 'duration': duration}
+    
+    def _soundtrack_features(self, file_path: str) -> Optional[Tuple[np.ndarray, float]]:
+        """Audio-model features and duration of a video's audio track, or None"""
+        try:
+            sr = self.model_config['audio_model']['sample_rate']
+            with stage('decode'):
+                pcm = demux_audio_track(file_path, sr=sr, max_seconds=10,
+                                        res_type=self.model_config['audio_model'].get('resample_type', 'soxr_hq'))
+            if pcm is None or not np.any(pcm):
+                return None
+            budget = current_budget()
+            if budget is not None:
+                budget.charge('audio_samples', len(pcm))
+            with stage('preprocessing'):
+                return self._audio_features(pcm, sr), len(pcm) / sr
+        except Exception as e:
+            logger.warning(f"Soundtrack analysis failed: {e}")
+            return None
     
     def _generate_error_result(self, error_message: str) -> Dict:
         """Generate error result"""
@@ -562,54 +1993,76 @@ class DeepFakeDetector:
     
     def _update_prediction_history(self, result: Dict):
         """Update prediction history for analytics"""
-        self.prediction_history.append({
-            'timestamp': datetime.now().isoformat(),
-            'prediction': result['prediction'],
-            'confidence': result['confidence'],
-            'file_type': result.get('file_type', 'unknown')
-        })
+        self.prediction_history.append(
+            result['prediction'],
+            float(result['confidence']),
+            result.get('file_type', 'unknown')
+        )
         
-        # Keep only recent predictions (last 1000)
-        if len(self.prediction_history) > 1000:
-            self.prediction_history = self.prediction_history[-1000:]
+        if self._history_store is not None:
+            try:
+                self._history_store.append(result['prediction'], result['confidence'],
+                                           result.get('file_type', 'unknown'))
+            except sqlite3.Error as e:
+                logger.warning(f"Could not log prediction: {e}")
+    
+    def get_history_summary(self, since: float = None, until: float = None) -> Dict:
+        """Totals over a time range from the durable log, shared by all worker processes"""
+        return self._history_store.summary(since, until) if self._history_store else {}
+    
+    def get_history_series(self, resolution: str = 'hour', since: float = None,
+                           until: float = None) -> List[Dict]:
+        """Per-bucket counts from the durable log; see HistoryStore.series"""
+        return self._history_store.series(resolution, since, until) if self._history_store else []
     
     def get_model_performance(self) -> Dict:
         """Get current model performance metrics"""
         return self.model_performance
     
-    def get_prediction_stats(self) -> Dict:
-        """Get prediction statistics"""
-        if not self.prediction_history:
-            return {}
-        
-        recent_predictions = self.prediction_history[-100:]  # Last 100 predictions
-        
-        total = len(recent_predictions)
-        authentic_count = sum(1 for p in recent_predictions if p['prediction'] == 'authentic')
-        deepfake_count = sum(1 for p in recent_predictions if p['prediction'] == 'deepfake')
+    def get_prediction_stats(self, last: int = 100, seconds: float = None) -> Dict:
+        """
+        Get prediction statistics
         
-        avg_confidence = np.mean([p['confidence'] for p in recent_predictions])
+        Args:
+            last: Window of most recent predictions (default 100)
+            seconds: Optionally, only predictions from the last T seconds
+        """
+        if not len(self.prediction_history):
+            return {}
         
+        stats = self.prediction_history.stats(last=last, seconds=seconds)
         return {
-            'total_predictions': total,
-            'authentic_percentage': (authentic_count / total) * 100 if total > 0 else 0,
-            'deepfake_percentage': (deepfake_count / total) * 100 if total > 0 else 0,
-            'average_confidence': avg_confidence,
+            'total_predictions': stats['total'],
+            'authentic_percentage': stats['authentic_percentage'],
+            'deepfake_percentage': stats['deepfake_percentage'],
+            'average_confidence': stats['average_confidence'],
+            'by_file_type': stats['by_file_type'],
             'last_updated': datetime.now().isoformat()
         }
 
 
 # Singleton instance for global use
 _detector_instance = None
+_detector_lock = threading.Lock()
 
 def get_detector() -> DeepFakeDetector:
-    """Get singleton detector instance"""
+    """
+    Get singleton detector instance
+    
+    Double-checked locking: after startup the lock is never taken, and a
+    burst of first requests waits for one model build instead of each
+    building its own. A failed build is not cached, so the next call retries.
+    """
     global _detector_instance
-    if _detector_instance is None:
-        _detector_instance = DeepFakeDetector()
-    return _detector_instance
+    detector = _detector_instance
+    if detector is None:
+        with _detector_lock:
+            detector = _detector_instance
+            if detector is None:
+                detector = _detector_instance = DeepFakeDetector()
+    return detector
 
-def analyze_file(file_path: str, file_type: str) -> Dict:
+def analyze_file(file_path: str, file_type: str, options: Dict = None) -> Dict:
     """Convenience function to analyze a file"""
     detector = get_detector()
-    return detector.analyze_file(file_path, file_type)
\ No newline at end of file
+    return detector.analyze_file(file_path, file_type, options)
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Ensemble Engine
+Runs a file's analysis branches concurrently on a shared pool and fuses their scores
+"""
+
+import time
+import logging
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EnsembleRun:
+    """
+    The branches of one analysis
+
+    Branches may be submitted at different points, e.g. the audio track as
+    soon as the request starts and the frame branches once frames are
+    decoded, so total latency tracks the slowest branch rather than the sum.
+    """
+
+    def __init__(self, engine: 'EnsembleEngine'):
+        self.engine = engine
+        self.started = time.perf_counter()
+        self._futures: Dict[str, Future] = {}
+
+    def submit(self, name: str, fn: Callable[..., Optional[Dict]], *args, **kwargs) -> Future:
+        """
+        Start a branch on the shared pool
+
+        The branch returns a dict with at least 'confidence', or None when it
+        does not apply to this file (e.g. a video without an audio track).
+        """
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            result = fn(*args, **kwargs)
+            return result, started - submitted, time.perf_counter() - started
+
+        # Branches see the caller's context, e.g. its stage timer
+        future = self.engine.executor.submit(contextvars.copy_context().run, timed)
+        self._futures[name] = future
+        return future
+
+    def cancel(self):
+        """Cancel branches that have not started yet"""
+        for future in self._futures.values():
+            future.cancel()
+
+    def collect(self) -> Dict:
+        """
+        Wait for every branch and fuse the ones that produced a score
+
+        Returns:
+            Dictionary with the fused 'confidence', per-branch results with
+            'latency' and 'queued' seconds, failed branches under 'errors',
+            and the wall-clock 'latency' since the run started
+
+        Raises:
+            RuntimeError: If branches were submitted and all of them failed
+        """
+        branches, errors = {}, {}
+        for name, future in self._futures.items():
+            try:
+                result, queued, latency = future.result()
+            except Exception as e:
+                logger.warning(f"Ensemble branch '{name}' failed: {e}")
+                errors[name] = str(e)
+                continue
+            if result is None:
+                continue
+            branches[name] = {**result, 'latency': round(latency, 4), 'queued': round(queued, 4)}
+
+        if not branches and errors:
+            raise RuntimeError(f"All analysis branches failed: {errors}")
+
+        scores = {name: branch['confidence'] for name, branch in branches.items()}
+        return {
+            'confidence': self.engine.fuse(scores) if scores else None,
+            'branches': branches,
+            'errors': errors,
+            'latency': round(time.perf_counter() - self.started, 4)
+        }
+
+
+class EnsembleEngine:
+    """Shared branch pool plus the configured fusion rule"""
+
+    def __init__(self, weights: Dict[str, float], voting_method: str = 'weighted_average',
+                 max_workers: int = 4):
+        self.weights = weights
+        self.voting_method = voting_method
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='analysis-branch')
+            return self._executor
+
+    def start(self) -> EnsembleRun:
+        return EnsembleRun(self)
+
+    def fuse(self, scores: Dict[str, float]) -> float:
+        """Combine per-branch deepfake scores with the configured voting method"""
+        if len(scores) == 1:
+            return next(iter(scores.values()))
+
+        if self.voting_method == 'max':
+            return max(scores.values())
+
+        # Weighted average, renormalized over the branches present
+        weights = {name: self.weights.get(name, 0.0) for name in scores}
+        total = sum(weights.values())
+        if total <= 0:
+            return sum(scores.values()) / len(scores)
+        return float(sum(scores[name] * weights[name] for name in scores) / total)
@@ -0,0 +1,202 @@
+"""
+Face Tracking for Video
+Keyframe face detection with template-matching tracking and face-centred clip building
+"""
+
+import numpy as np
+import cv2
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Boxes use the face_recognition convention: (top, right, bottom, left)
+Box = Tuple[int, int, int, int]
+
+# Run the face detector on every Nth frame; track in between
+KEYFRAME_INTERVAL = 4
+
+# Tracking runs on frames downscaled by this factor
+TRACK_SCALE = 0.5
+
+# Matching thresholds
+IOU_THRESHOLD = 0.3
+MIN_MATCH_SCORE = 0.4
+
+# Fraction of the box size searched around the previous position
+SEARCH_MARGIN = 0.5
+
+# Keyframes a track may go undetected before it is dropped
+MAX_MISSES = 1
+
+
+def box_iou(a: Box, b: Box) -> float:
+    """Intersection over union of two (top, right, bottom, left) boxes"""
+    top, bottom = max(a[0], b[0]), min(a[2], b[2])
+    left, right = max(a[3], b[3]), min(a[1], b[1])
+    inter = max(0, bottom - top) * max(0, right - left)
+    area_a = (a[2] - a[0]) * (a[1] - a[3])
+    area_b = (b[2] - b[0]) * (b[1] - b[3])
+    union = area_a + area_b - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _to_track_gray(frame: np.ndarray, scale: float) -> np.ndarray:
+    """Grayscale, downscaled copy of a frame for template matching"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    if scale != 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return gray
+
+
+def _scale_box(box: Box, scale: float) -> Box:
+    return tuple(int(round(v * scale)) for v in box)
+
+
+def _follow(prev_gray: np.ndarray, gray: np.ndarray, box: Box) -> Optional[Box]:
+    """Locate the patch under box from prev_gray inside a window of gray"""
+    top, right, bottom, left = box
+    h, w = bottom - top, right - left
+    if h < 4 or w < 4:
+        return None
+
+    template = prev_gray[top:bottom, left:right]
+    my, mx = int(h * SEARCH_MARGIN), int(w * SEARCH_MARGIN)
+    s_top, s_left = max(0, top - my), max(0, left - mx)
+    s_bottom = min(gray.shape[0], bottom + my)
+    s_right = min(gray.shape[1], right + mx)
+    window = gray[s_top:s_bottom, s_left:s_right]
+    if window.shape[0] < h or window.shape[1] < w or template.shape != (h, w):
+        return None
+
+    scores = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+    _, best, _, (x, y) = cv2.minMaxLoc(scores)
+    if best < MIN_MATCH_SCORE:
+        return None
+    return (s_top + y, s_left + x + w, s_top + y + h, s_left + x)
+
+
+def track_faces(frames: List[np.ndarray], detect_fn: Callable[[np.ndarray], List[Box]],
+                keyframe_interval: int = KEYFRAME_INTERVAL,
+                scale: float = TRACK_SCALE) -> Tuple[List[Dict], int]:
+    """
+    Follow faces through a frame sequence
+
+    The detector runs only on keyframes; between them each track is moved by
+    template matching on downscaled grayscale frames. On a keyframe,
+    detections are matched to tracks by IoU; matches re-anchor the track and
+    unmatched detections start new identities.
+
+    Args:
+        frames: BGR frames in temporal order
+        detect_fn: Returns face boxes (top, right, bottom, left) for one frame
+        keyframe_interval: Run detect_fn on every Nth frame
+        scale: Downscale factor for tracking
+
+    Returns:
+        (tracks, detector_calls) where each track is a dict with an integer
+        'id' and 'boxes' mapping frame index to a full-resolution box
+    """
+    tracks: List[Dict] = []
+    active: List[Dict] = []
+    detector_calls = 0
+    prev_gray = None
+
+    for idx, frame in enumerate(frames):
+        gray = _to_track_gray(frame, scale)
+
+        # Propagate every live track into this frame
+        if prev_gray is not None:
+            still_active = []
+            for track in active:
+                moved = _follow(prev_gray, gray, track['small_box'])
+                if moved is not None:
+                    track['small_box'] = moved
+                    track['boxes'][idx] = _scale_box(moved, 1.0 / scale)
+                    still_active.append(track)
+            active = still_active
+
+        if idx % keyframe_interval == 0:
+            detections = detect_fn(frame)
+            detector_calls += 1
+
+            unmatched = list(active)
+            for det in detections:
+                best = max(unmatched, key=lambda t: box_iou(t['boxes'].get(idx, (0, 0, 0, 0)), det),
+                           default=None)
+                if best is not None and box_iou(best['boxes'].get(idx, (0, 0, 0, 0)), det) >= IOU_THRESHOLD:
+                    unmatched.remove(best)
+                    track = best
+                    track['misses'] = 0
+                else:
+                    track = {'id': len(tracks), 'boxes': {}, 'misses': 0}
+                    tracks.append(track)
+                    active.append(track)
+                track['boxes'][idx] = tuple(int(v) for v in det)
+                track['small_box'] = _scale_box(det, scale)
+
+            for track in unmatched:
+                track['misses'] += 1
+            active = [t for t in active if t['misses'] <= MAX_MISSES]
+
+        prev_gray = gray
+
+    return [{'id': t['id'], 'boxes': t['boxes']} for t in tracks], detector_calls
+
+
+def _crop_face(frame: np.ndarray, box: Box, size: Tuple[int, int], margin: float) -> np.ndarray:
+    """Square crop centred on box with a relative margin, resized to size"""
+    top, right, bottom, left = box
+    cy, cx = (top + bottom) / 2, (left + right) / 2
+    half = max(bottom - top, right - left) * (1 + margin) / 2
+    h, w = frame.shape[:2]
+    y0, y1 = int(max(0, cy - half)), int(min(h, cy + half))
+    x0, x1 = int(max(0, cx - half)), int(min(w, cx + half))
+    crop = frame[y0:y1, x0:x1]
+    if crop.size == 0:
+        crop = frame
+    return cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+
+
+def build_face_clips(frames: List[np.ndarray], tracks: List[Dict], frames_per_clip: int,
+                     size: Tuple[int, int] = (112, 112), margin: float = 0.25) -> np.ndarray:
+    """
+    Build one face-centred clip per track
+
+    Tracks shorter or longer than frames_per_clip are resampled evenly over
+    the frames they cover.
+
+    Returns:
+        float32 array (len(tracks), frames_per_clip, size[1], size[0], 3), RGB in [0, 1]
+    """
+    clips = np.empty((len(tracks), frames_per_clip, size[1], size[0], 3), dtype=np.float32)
+    for i, track in enumerate(tracks):
+        indices = sorted(track['boxes'])
+        picks = np.linspace(0, len(indices) - 1, frames_per_clip).round().astype(int)
+        for j, pick in enumerate(picks):
+            frame_idx = indices[pick]
+            crop = _crop_face(frames[frame_idx], track['boxes'][frame_idx], size, margin)
+            clips[i, j] = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB) if crop.ndim == 3 else crop[..., None]
+    clips *= 1.0 / 255.0
+    return clips
+
+
+def build_face_images(frames: List[np.ndarray], tracks: List[Dict], per_track: int,
+                      size: Tuple[int, int] = (224, 224), margin: float = 0.25) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample still face crops from each track for a per-image model
+
+    Returns:
+        (images, owners): float32 array (n, size[1], size[0], 3) RGB in [0, 1],
+        and the index into tracks of each image
+    """
+    images, owners = [], []
+    for i, track in enumerate(tracks):
+        indices = sorted(track['boxes'])
+        picks = np.unique(np.linspace(0, len(indices) - 1, per_track).round().astype(int))
+        for pick in picks:
+            frame_idx = indices[pick]
+            crop = _crop_face(frames[frame_idx], track['boxes'][frame_idx], size, margin)
+            images.append(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+            owners.append(i)
+
+    if not images:
+        return np.empty((0, size[1], size[0], 3), dtype=np.float32), np.empty(0, dtype=int)
+    return np.stack(images).astype(np.float32) * (1.0 / 255.0), np.array(owners)
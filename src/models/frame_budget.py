@@ -0,0 +1,99 @@
+"""
+Adaptive Frame Budget
+Chooses how many frames and clips a video analysis can afford within its latency target
+"""
+
+import threading
+from typing import Dict, Optional
+
+# Default latency target for one video analysis, well inside gunicorn's 300 s timeout
+LATENCY_TARGET = 30.0
+
+# Frames sampled per second of video when time allows
+SAMPLE_FPS = 2.0
+
+# Initial cost estimates, refined from observed analyses
+DECODE_SECONDS_PER_MEGAPIXEL = 0.006
+ANALYSIS_SECONDS_PER_FRAME = 0.002
+INFERENCE_SECONDS_PER_CLIP = 0.2
+
+# Weight of the newest observation in the running cost estimates
+SMOOTHING = 0.2
+
+# Share of the time budget inference may take before frames are counted
+INFERENCE_SHARE = 0.5
+
+
+class FrameBudgetPlanner:
+    """
+    Derives a per-video frame and clip budget from duration, resolution,
+    latency target and queue load
+
+    Cost estimates start from conservative defaults and track observed
+    decode and inference times with an exponential moving average.
+    """
+
+    def __init__(self, min_frames: int = 8, max_frames: int = 256, max_clips: int = 4,
+                 sample_fps: float = SAMPLE_FPS, latency_target: float = LATENCY_TARGET):
+        self.min_frames = min_frames
+        self.max_frames = max_frames
+        self.max_clips = max_clips
+        self.sample_fps = sample_fps
+        self.latency_target = latency_target
+
+        self.decode_per_megapixel = DECODE_SECONDS_PER_MEGAPIXEL
+        self.analysis_per_frame = ANALYSIS_SECONDS_PER_FRAME
+        self.inference_per_clip = INFERENCE_SECONDS_PER_CLIP
+        self._lock = threading.Lock()
+
+    def plan(self, probe: Dict, latency_target: Optional[float] = None, queue_depth: int = 0) -> Dict:
+        """
+        Choose the frame and clip budget for one video
+
+        Args:
+            probe: Output of video_decode.probe_video
+            latency_target: Seconds this request may take; defaults to the planner's
+            queue_depth: Analyses ahead of or alongside this one on the same worker
+
+        Returns:
+            Dictionary with max_frames, max_clips, the inputs used and whether
+            the budget was degraded below the desired sampling density
+        """
+        target = latency_target or self.latency_target
+
+        # Work already queued shares the worker, so this request gets a slice
+        available = target / (1 + max(queue_depth, 0))
+
+        megapixels = max(probe.get('width', 0) * probe.get('height', 0), 1) / 1e6
+        per_frame = self.decode_per_megapixel * megapixels + self.analysis_per_frame
+
+        clips = int(available * INFERENCE_SHARE / self.inference_per_clip)
+        clips = max(1, min(self.max_clips, clips))
+
+        affordable = int(max(available - clips * self.inference_per_clip, 0) / per_frame)
+        wanted = max(self.min_frames, int(probe.get('duration', 0) * self.sample_fps))
+        frames = max(self.min_frames, min(wanted, affordable, self.max_frames))
+        if probe.get('frame_count', 0) > 0:
+            frames = min(frames, probe['frame_count'])
+
+        return {
+            'max_frames': frames,
+            'max_clips': clips,
+            'latency_target': target,
+            'queue_depth': queue_depth,
+            'duration': probe.get('duration', 0.0),
+            'resolution': (probe.get('width', 0), probe.get('height', 0)),
+            'estimated_seconds': round(frames * per_frame + clips * self.inference_per_clip, 3),
+            'degraded': affordable < min(wanted, self.max_frames)
+        }
+
+    def observe(self, frames: int = 0, megapixels: float = 0.0, decode_seconds: float = 0.0,
+                clips: int = 0, inference_seconds: float = 0.0):
+        """Fold measured decode and inference times into the cost estimates"""
+        with self._lock:
+            if frames > 0 and megapixels > 0 and decode_seconds > 0:
+                sample = decode_seconds / (frames * megapixels)
+                self.decode_per_megapixel += SMOOTHING * (sample - self.decode_per_megapixel)
+            if clips > 0 and inference_seconds > 0:
+                sample = inference_seconds / clips
+                self.inference_per_clip += SMOOTHING * (sample - self.inference_per_clip)
@@ -0,0 +1,282 @@
+"""
+Durable Prediction History
+Append-only SQLite log of predictions with per-minute and per-hour rollups shared across processes
+"""
+
+import os
+import math
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MINUTE = 60
+HOUR = 3600
+RESOLUTIONS = {'minute': MINUTE, 'hour': HOUR}
+
+# Seconds between background rollups
+ROLLUP_INTERVAL = 10.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    file_type TEXT NOT NULL,
+    prediction TEXT NOT NULL,
+    confidence REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS predictions_ts ON predictions (ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    file_type TEXT NOT NULL,
+    prediction TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    confidence_sum REAL NOT NULL,
+    PRIMARY KEY (resolution, bucket, file_type, prediction)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_state (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    last_id INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO rollup_state (id, last_id) VALUES (0, 0);
+"""
+
+
+class HistoryStore:
+    """
+    Prediction log on local disk, readable by every worker process
+
+    Each analysis appends one row to 'predictions'. A background thread
+    folds rows past the rollup high-water mark into minute and hour
+    buckets per file type and verdict, in one IMMEDIATE transaction so
+    concurrent processes never count a row twice. Queries read the
+    buckets plus the few raw rows not rolled up yet, so a week of history
+    costs a few hundred bucket rows rather than a scan of every
+    prediction. WAL mode lets readers run alongside the writer.
+    """
+
+    def __init__(self, path: str, rollup_interval: float = ROLLUP_INTERVAL,
+                 raw_retention_days: Optional[float] = None):
+        """
+        Args:
+            path: SQLite database file, created if missing
+            rollup_interval: Seconds between background rollups; 0 disables
+                the thread (call rollup() yourself)
+            raw_retention_days: Delete rolled-up raw rows older than this;
+                None keeps them
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.raw_retention_days = raw_retention_days
+
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+        self._stop = threading.Event()
+        self._thread = None
+        if rollup_interval > 0:
+            self._thread = threading.Thread(target=self._rollup_loop, args=(rollup_interval,),
+                                            name='history-rollup', daemon=True)
+            self._thread.start()
+
+    def append(self, prediction: str, confidence: float, file_type: str,
+               timestamp: Optional[float] = None):
+        """Log one prediction"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO predictions (ts, file_type, prediction, confidence) VALUES (?, ?, ?, ?)",
+                (time.time() if timestamp is None else timestamp, file_type or 'unknown',
+                 prediction, float(confidence))
+            )
+
+    def rollup(self) -> int:
+        """
+        Fold new raw rows into the minute and hour buckets
+
+        Returns:
+            Number of raw rows rolled up
+        """
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                last_id = conn.execute("SELECT last_id FROM rollup_state").fetchone()[0]
+                max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM predictions").fetchone()[0]
+                if max_id > last_id:
+                    for seconds in RESOLUTIONS.values():
+                        conn.execute(
+                            """
+                            INSERT INTO rollups (resolution, bucket, file_type, prediction, count, confidence_sum)
+                            SELECT ?, CAST(ts / ? AS INTEGER) * ?, file_type, prediction, COUNT(*), SUM(confidence)
+                            FROM predictions WHERE id > ? AND id <= ?
+                            GROUP BY 2, file_type, prediction
+                            ON CONFLICT (resolution, bucket, file_type, prediction) DO UPDATE SET
+                                count = count + excluded.count,
+                                confidence_sum = confidence_sum + excluded.confidence_sum
+                            """,
+                            (seconds, seconds, seconds, last_id, max_id)
+                        )
+                    conn.execute("UPDATE rollup_state SET last_id = ?", (max_id,))
+                    if self.raw_retention_days is not None:
+                        conn.execute("DELETE FROM predictions WHERE id <= ? AND ts < ?",
+                                     (max_id, time.time() - self.raw_retention_days * 86400))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return max_id - last_id
+
+    def _rollup_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.rollup()
+            except sqlite3.Error as e:
+                logger.warning(f"History rollup failed: {e}")
+
+    @contextmanager
+    def _snapshot(self):
+        """One read transaction, so buckets and the raw tail agree on the rollup mark"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield
+            finally:
+                self._conn.execute("COMMIT")
+
+    def _bucket_rows(self, resolution: int, start: float, end: float) -> List:
+        return self._conn.execute(
+            "SELECT bucket, file_type, prediction, count, confidence_sum FROM rollups "
+            "WHERE resolution = ? AND bucket >= ? AND bucket < ?",
+            (resolution, start, end)
+        ).fetchall()
+
+    def _tail_rows(self, resolution: int, start: float, end: float) -> List:
+        """Raw rows past the rollup mark, grouped like bucket rows"""
+        last_id = self._conn.execute("SELECT last_id FROM rollup_state").fetchone()[0]
+        # Unary + keeps the planner on the short rowid range past the mark
+        # instead of the ts index, which would cover every row in the range
+        return self._conn.execute(
+            """
+            SELECT CAST(ts / ? AS INTEGER) * ?, file_type, prediction, COUNT(*), SUM(confidence)
+            FROM predictions
+            WHERE id > ? AND +ts >= ? AND +ts < ?
+            GROUP BY 1, file_type, prediction
+            """,
+            (resolution, resolution, last_id, start, end)
+        ).fetchall()
+
+    def series(self, resolution: str = 'hour', since: Optional[float] = None,
+               until: Optional[float] = None) -> List[Dict]:
+        """
+        Counts and mean confidence per time bucket, file type and verdict
+
+        Args:
+            resolution: 'minute' or 'hour'
+            since: Start time (Unix seconds), rounded down to the bucket;
+                default one day before 'until'
+            until: End time, default now
+
+        Returns:
+            Bucket dicts ordered by time
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"resolution must be one of: {', '.join(RESOLUTIONS)}")
+        seconds = RESOLUTIONS[resolution]
+        until = time.time() if until is None else until
+        since = until - 86400 if since is None else since
+        start = math.floor(since / seconds) * seconds
+
+        merged = {}
+        with self._snapshot():
+            rows = self._bucket_rows(seconds, start, until) + self._tail_rows(seconds, start, until)
+        for bucket, file_type, prediction, count, confidence_sum in rows:
+            key = (int(bucket), file_type, prediction)
+            total = merged.get(key, (0, 0.0))
+            merged[key] = (total[0] + count, total[1] + confidence_sum)
+
+        return [
+            {
+                'bucket': bucket,
+                'file_type': file_type,
+                'prediction': prediction,
+                'count': count,
+                'average_confidence': confidence_sum / count
+            }
+            for (bucket, file_type, prediction), (count, confidence_sum) in sorted(merged.items())
+        ]
+
+    def summary(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict:
+        """
+        Totals over a time range from the coarsest buckets that fit
+
+        Whole hours come from hour buckets, the partial hours at either end
+        from minute buckets and the newest predictions from raw rows, so
+        'since' is effectively rounded down to the minute.
+
+        Returns:
+            Dictionary with 'total', 'counts' per verdict, the authentic and
+            deepfake percentages, 'average_confidence' and the same per
+            file type under 'by_file_type'
+        """
+        until = time.time() if until is None else until
+        since = until - 86400 if since is None else since
+        start = math.floor(since / MINUTE) * MINUTE
+        first_hour = math.ceil(start / HOUR) * HOUR
+        last_hour = math.floor(until / HOUR) * HOUR
+
+        with self._snapshot():
+            if first_hour < last_hour:
+                rows = (self._bucket_rows(MINUTE, start, first_hour)
+                        + self._bucket_rows(HOUR, first_hour, last_hour)
+                        + self._bucket_rows(MINUTE, last_hour, until))
+            else:
+                rows = self._bucket_rows(MINUTE, start, until)
+            rows += self._tail_rows(MINUTE, start, until)
+
+        by_type = {}
+        for _, file_type, prediction, count, confidence_sum in rows:
+            entry = by_type.setdefault(file_type, {'counts': {}, 'confidence_sum': 0.0})
+            entry['counts'][prediction] = entry['counts'].get(prediction, 0) + count
+            entry['confidence_sum'] += confidence_sum
+
+        overall = {'counts': {}, 'confidence_sum': 0.0}
+        for entry in by_type.values():
+            for prediction, count in entry['counts'].items():
+                overall['counts'][prediction] = overall['counts'].get(prediction, 0) + count
+            overall['confidence_sum'] += entry['confidence_sum']
+
+        summary = self._summarize(overall)
+        summary['by_file_type'] = {file_type: self._summarize(entry) for file_type, entry in by_type.items()}
+        return summary
+
+    @staticmethod
+    def _summarize(entry: Dict) -> Dict:
+        counts = entry['counts']
+        total = sum(counts.values())
+        return {
+            'total': total,
+            'counts': counts,
+            'authentic_percentage': counts.get('authentic', 0) / total * 100 if total else 0,
+            'deepfake_percentage': counts.get('deepfake', 0) / total * 100 if total else 0,
+            'average_confidence': entry['confidence_sum'] / total if total else 0.0
+        }
+
+    def close(self):
+        """Stop the rollup thread, roll up what is left and close the database"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self.rollup()
+        finally:
+            self._conn.close()
@@ -0,0 +1,181 @@
+"""
+Perceptual Hash Index
+64-bit DCT perceptual hashes and a multi-index hash table for near-duplicate lookup by Hamming distance
+"""
+
+import threading
+from array import array
+from itertools import combinations
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Hamming distance up to which two images count as the same picture
+MAX_DISTANCE = 6
+
+# 16-bit substrings the 64-bit hashes are indexed by
+CHUNKS = 4
+CHUNK_BITS = 64 // CHUNKS
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def perceptual_hash(image: np.ndarray) -> int:
+    """
+    DCT pHash of an image
+
+    The image is reduced to 32x32 grey, and each of the 64 lowest-frequency
+    DCT coefficients becomes one bit: above or below their median. The
+    hash survives re-encoding, rescaling and small crops or colour shifts.
+
+    Args:
+        image: HxW grey or HxWx3 RGB array, uint8 or float in [0, 1]
+    """
+    image = np.asarray(image, dtype=np.float32)
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    small = cv2.resize(image, (32, 32), interpolation=cv2.INTER_AREA)
+    low = cv2.dct(small)[:8, :8].reshape(-1)
+    # The DC term only measures brightness
+    bits = low > np.median(low[1:])
+    return int(np.packbits(bits).view('>u8')[0])
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    return _POPCOUNT[values.view(np.uint8).reshape(-1, 8)].sum(axis=1)
+
+
+class PerceptualIndex:
+    """
+    Near-duplicate index over 64-bit perceptual hashes
+
+    Each hash is split into four 16-bit chunks with one table per chunk
+    position. By the pigeonhole principle, two hashes within distance d
+    agree to within d // 4 bits on at least one chunk. A query therefore
+    probes every chunk value within that radius (17 buckets per table at
+    d = 6) and checks the exact distance of the candidates in one
+    vectorized pass. The work grows with bucket size, about n / 65536
+    entries per bucket, rather than with n. A BK-tree, by contrast,
+    visits a large share of its nodes at these radii. Buckets are compact
+    uint32 arrays, so a million entries take about 24 MB besides their
+    payloads. Payloads must be hashable: remove() drops every entry of a
+    payload by marking it dead, and the tables are rebuilt from the live
+    entries once more than half are dead.
+    """
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self.max_distance = max_distance
+        radius = max_distance // CHUNKS
+        self._probes = [
+            sum(1 << bit for bit in flipped)
+            for r in range(radius + 1)
+            for flipped in combinations(range(CHUNK_BITS), r)
+        ]
+        self._tables = [dict() for _ in range(CHUNKS)]
+        self._hashes = np.empty(1024, dtype=np.uint64)
+        self._live = np.zeros(1024, dtype=bool)
+        self._payloads: List[Any] = []
+        self._positions: Dict[Hashable, List[int]] = {}
+        self._dead = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._payloads) - self._dead
+
+    @staticmethod
+    def _chunks(value: int) -> List[int]:
+        mask = (1 << CHUNK_BITS) - 1
+        return [(value >> (CHUNK_BITS * i)) & mask for i in range(CHUNKS)]
+
+    def add(self, value: int, payload: Hashable):
+        """Index a hash with the payload a match should return"""
+        with self._lock:
+            self._append(value, payload)
+
+    def _append(self, value: int, payload: Hashable):
+        index = len(self._payloads)
+        if index == len(self._hashes):
+            self._hashes = np.concatenate([self._hashes, np.empty_like(self._hashes)])
+            self._live = np.concatenate([self._live, np.zeros_like(self._live)])
+        self._hashes[index] = value
+        self._live[index] = True
+        self._payloads.append(payload)
+        self._positions.setdefault(payload, []).append(index)
+        for table, chunk in zip(self._tables, self._chunks(value)):
+            bucket = table.get(chunk)
+            if bucket is None:
+                bucket = table[chunk] = array('I')
+            bucket.append(index)
+
+    def remove(self, payloads: Iterable[Hashable]) -> int:
+        """
+        Stop matching the given payloads
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        with self._lock:
+            for payload in payloads:
+                for index in self._positions.pop(payload, ()):
+                    self._live[index] = False
+                    self._payloads[index] = None
+                    removed += 1
+            self._dead += removed
+            if self._dead > len(self._payloads) // 2:
+                self._compact()
+        return removed
+
+    def _compact(self):
+        """Rebuild the tables from the live entries, in insertion order"""
+        live = np.flatnonzero(self._live[:len(self._payloads)])
+        entries = [(int(self._hashes[i]), self._payloads[i]) for i in live]
+        self._tables = [dict() for _ in range(CHUNKS)]
+        self._hashes = np.empty(max(1024, len(entries)), dtype=np.uint64)
+        self._live = np.zeros(len(self._hashes), dtype=bool)
+        self._payloads = []
+        self._positions = {}
+        self._dead = 0
+        for value, payload in entries:
+            self._append(value, payload)
+
+    def query(self, value: int, max_distance: Optional[int] = None) -> Optional[Tuple[Any, int]]:
+        """
+        Closest indexed hash within a Hamming distance
+
+        Args:
+            value: Query hash
+            max_distance: At most the index's max_distance; defaults to it
+
+        Returns:
+            (payload, distance) of the nearest match, the newest on ties,
+            or None
+        """
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        with self._lock:
+            candidates = []
+            for table, chunk in zip(self._tables, self._chunks(value)):
+                for probe in self._probes:
+                    bucket = table.get(chunk ^ probe)
+                    if bucket is not None:
+                        candidates.append(np.array(bucket, dtype=np.uint32))
+            if not candidates:
+                return None
+
+            ids = np.concatenate(candidates)
+            ids = ids[self._live[ids]]
+            if not len(ids):
+                return None
+            distances = _popcount(self._hashes[ids] ^ np.uint64(value))
+            best = int(distances.min())
+            if best > limit:
+                return None
+            index = int(ids[distances == best].max())
+            return self._payloads[index], best
@@ -0,0 +1,168 @@
+"""
+Prediction History
+Fixed-capacity ring buffer of recent predictions with constant-time window statistics
+"""
+
+import time
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+PREDICTIONS = ('authentic', 'deepfake', 'other')
+FILE_TYPES = ('image', 'video', 'audio', 'unknown')
+
+CAPACITY = 1000
+
+
+class PredictionHistory:
+    """
+    Array-backed ring buffer of (timestamp, confidence, prediction, file type)
+
+    Besides the raw columns, every slot stores running totals up to and
+    including its record: counts per file type and verdict, and confidence
+    sums per file type. Aggregates over the last N records are then the
+    difference of two slots, and over the last T seconds the same after a
+    binary search on the timestamps, so stats() costs O(1) or O(log n)
+    however large the buffer is, and appending never reallocates. One spare
+    slot keeps the totals just before the oldest record, so a window may
+    span the whole buffer.
+    """
+
+    def __init__(self, capacity: int = CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        slots = capacity + 1
+
+        self._timestamps = np.zeros(slots, dtype=np.float64)
+        self._confidences = np.zeros(slots, dtype=np.float64)
+        self._predictions = np.zeros(slots, dtype=np.int8)
+        self._file_types = np.zeros(slots, dtype=np.int8)
+        self._counts = np.zeros((slots, len(FILE_TYPES), len(PREDICTIONS)), dtype=np.int64)
+        self._confidence_sums = np.zeros((slots, len(FILE_TYPES)), dtype=np.float64)
+
+        # Scratch for window differences
+        self._window_counts = np.zeros((len(FILE_TYPES), len(PREDICTIONS)), dtype=np.int64)
+        self._window_sums = np.zeros(len(FILE_TYPES), dtype=np.float64)
+
+        self._appended = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._appended, self.capacity)
+
+    def append(self, prediction: str, confidence: float, file_type: str,
+               timestamp: Optional[float] = None):
+        """Record one prediction, overwriting the oldest once full"""
+        p = PREDICTIONS.index(prediction) if prediction in PREDICTIONS else len(PREDICTIONS) - 1
+        t = FILE_TYPES.index(file_type) if file_type in FILE_TYPES else len(FILE_TYPES) - 1
+        slots = self.capacity + 1
+
+        with self._lock:
+            index = self._appended
+            slot = index % slots
+            previous = (index - 1) % slots
+            # Timestamps stay sorted for the time-window search even if the clock steps back
+            now = time.time() if timestamp is None else timestamp
+            if index:
+                now = max(now, self._timestamps[previous])
+
+            self._timestamps[slot] = now
+            self._confidences[slot] = confidence
+            self._predictions[slot] = p
+            self._file_types[slot] = t
+            if index:
+                self._counts[slot] = self._counts[previous]
+                self._confidence_sums[slot] = self._confidence_sums[previous]
+            else:
+                self._counts[slot] = 0
+                self._confidence_sums[slot] = 0.0
+            self._counts[slot, t, p] += 1
+            self._confidence_sums[slot, t] += confidence
+            self._appended = index + 1
+
+    def _first_since(self, oldest: int, newest: int, since: float) -> int:
+        """Absolute index of the first record at or after a timestamp"""
+        slots = self.capacity + 1
+        lo, hi = oldest, newest + 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamps[mid % slots] < since:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def stats(self, last: Optional[int] = None, seconds: Optional[float] = None,
+              now: Optional[float] = None) -> Dict:
+        """
+        Aggregates over the most recent records
+
+        Args:
+            last: Only the last N records
+            seconds: Only records from the last T seconds; with both, the
+                narrower window applies
+            now: Reference time for 'seconds', default time.time()
+
+        Returns:
+            Dictionary with 'total', 'counts' per verdict, the authentic and
+            deepfake percentages, 'average_confidence' and the same per
+            file type under 'by_file_type'
+        """
+        slots = self.capacity + 1
+        with self._lock:
+            newest = self._appended - 1
+            oldest = max(0, self._appended - self.capacity)
+            first = oldest
+            if last is not None:
+                first = max(first, newest - last + 1)
+            if seconds is not None and newest >= 0:
+                since = (time.time() if now is None else now) - seconds
+                first = max(first, self._first_since(first, newest, since))
+
+            counts, sums = self._window_counts, self._window_sums
+            if newest < first:
+                counts[:] = 0
+                sums[:] = 0.0
+            elif first == 0:
+                counts[:] = self._counts[newest % slots]
+                sums[:] = self._confidence_sums[newest % slots]
+            else:
+                np.subtract(self._counts[newest % slots], self._counts[(first - 1) % slots], out=counts)
+                np.subtract(self._confidence_sums[newest % slots],
+                            self._confidence_sums[(first - 1) % slots], out=sums)
+
+            summary = self._summarize(counts.sum(axis=0), float(sums.sum()))
+            summary['by_file_type'] = {
+                file_type: self._summarize(counts[t], float(sums[t]))
+                for t, file_type in enumerate(FILE_TYPES) if counts[t].any()
+            }
+            return summary
+
+    @staticmethod
+    def _summarize(counts: np.ndarray, confidence_sum: float) -> Dict:
+        total = int(counts.sum())
+        return {
+            'total': total,
+            'counts': {name: int(n) for name, n in zip(PREDICTIONS, counts)},
+            'authentic_percentage': float(counts[0]) / total * 100 if total else 0,
+            'deepfake_percentage': float(counts[1]) / total * 100 if total else 0,
+            'average_confidence': confidence_sum / total if total else 0.0
+        }
+
+    def recent(self, n: int = 10) -> List[Dict]:
+        """The last n records, oldest first"""
+        slots = self.capacity + 1
+        with self._lock:
+            first = max(0, self._appended - min(n, self.capacity))
+            return [
+                {
+                    'timestamp': datetime.fromtimestamp(self._timestamps[i % slots]).isoformat(),
+                    'prediction': PREDICTIONS[self._predictions[i % slots]],
+                    'confidence': float(self._confidences[i % slots]),
+                    'file_type': FILE_TYPES[self._file_types[i % slots]]
+                }
+                for i in range(first, self._appended)
+            ]
@@ -0,0 +1,195 @@
+"""
+Analysis Result Cache
+Content-addressed cache of finished results: an in-process LRU in front of a size-bounded SQLite file shared by workers
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MEMORY_ENTRIES = 1024
+MAX_BYTES = 256 * 1024 ** 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+CREATE TABLE IF NOT EXISTS cache_state (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_state (id, bytes) VALUES (0, 0);
+"""
+
+
+def cache_key(digest: str, *parts) -> str:
+    """Key for a file's content hash under a model version, config and request options"""
+    encoded = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(f"{digest}:{encoded}".encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier LRU cache of analysis results by key
+
+    Hits in the in-memory tier cost a dict lookup and a copy. Misses fall
+    through to a SQLite table of JSON results that every worker process
+    opens in WAL mode, and disk hits are promoted into memory. The disk
+    tier tracks its total size in a state row updated in the same
+    transaction as each insert, and evicts least recently used rows
+    until it fits max_bytes.
+    """
+
+    def __init__(self, path: str, memory_entries: int = MEMORY_ENTRIES, max_bytes: int = MAX_BYTES,
+                 on_evict: Optional[Callable[[List[str]], None]] = None):
+        """
+        Args:
+            path: SQLite database file, created if missing
+            memory_entries: Results kept in this process
+            max_bytes: Bound on the JSON stored on disk
+            on_evict: Called with the keys this process evicted from disk,
+                after the eviction commits
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+        self._memory: OrderedDict = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a result
+
+        Returns:
+            A copy of the stored result with 'cache_tier' set to 'memory'
+            or 'disk', or None on a miss
+        """
+        with self._lock:
+            encoded = self._memory.get(key)
+            if encoded is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                tier = 'memory'
+            else:
+                try:
+                    row = self._conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        self._conn.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+                except sqlite3.Error as e:
+                    logger.warning(f"Result cache read failed: {e}")
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return None
+                encoded = row[0]
+                self._remember(key, encoded)
+                self.disk_hits += 1
+                tier = 'disk'
+
+        result = json.loads(encoded)
+        result['cache_tier'] = tier
+        return result
+
+    def put(self, key: str, result: Dict):
+        """Store a JSON-serializable result in both tiers"""
+        encoded = json.dumps(result)
+        size = len(encoded)
+        with self._lock:
+            self._remember(key, encoded)
+            if size > self.max_bytes:
+                return
+            conn = self._conn
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    old = conn.execute("SELECT bytes FROM results WHERE key = ?", (key,)).fetchone()
+                    conn.execute("INSERT OR REPLACE INTO results (key, result, bytes, used) VALUES (?, ?, ?, ?)",
+                                 (key, encoded, size, time.time()))
+                    conn.execute("UPDATE cache_state SET bytes = bytes + ?", (size - (old[0] if old else 0),))
+                    evicted = self._evict()
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache write failed: {e}")
+                return
+            for gone in evicted:
+                self._memory.pop(gone, None)
+        if evicted and self.on_evict is not None:
+            self.on_evict(evicted)
+
+    def _remember(self, key: str, encoded: str):
+        self._memory[key] = encoded
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> List[str]:
+        """Drop least recently used rows until the disk tier fits; inside the write transaction"""
+        conn = self._conn
+        evicted = []
+        total = conn.execute("SELECT bytes FROM cache_state").fetchone()[0]
+        while total > self.max_bytes:
+            rows = conn.execute("SELECT key, bytes FROM results ORDER BY used LIMIT 64").fetchall()
+            if not rows:
+                break
+            freed = 0
+            for key, size in rows:
+                if total - freed <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                evicted.append(key)
+                freed += size
+                self.evictions += 1
+            conn.execute("UPDATE cache_state SET bytes = bytes - ?", (freed,))
+            total -= freed
+        return evicted
+
+    def stats(self) -> Dict:
+        """Hit/miss counters per tier and current sizes"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM results), bytes FROM cache_state").fetchone()
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'memory_entries': len(self._memory),
+                'disk_entries': entries,
+                'bytes': size,
+                'max_bytes': self.max_bytes
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
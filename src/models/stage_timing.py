@@ -0,0 +1,143 @@
+"""
+Stage Timing
+Monotonic per-stage timers for one analysis and latency histograms across analyses
+"""
+
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator
+
+import numpy as np
+
+# Pipeline stages, in the order they usually run
+STAGES = ('read', 'decode', 'face_detection', 'preprocessing', 'inference', 'evidence', 'serialization')
+
+# Histogram bucket upper bounds in seconds: 1 ms to 100 s, four per decade
+BUCKETS = tuple(10 ** (exponent / 4) for exponent in range(-12, 9))
+
+_current_timer = contextvars.ContextVar('stage_timer', default=None)
+
+
+class StageTimer:
+    """
+    Seconds spent per stage in one analysis
+
+    Stages may be entered many times (e.g. decode per audio block) and
+    accumulate. Branches that run concurrently each add their full time,
+    so the stage sum can exceed the wall-clock total; a total well above
+    the stage sum means time went to queueing.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def breakdown(self) -> Dict[str, float]:
+        """Seconds per stage that ran, plus the wall-clock 'total'"""
+        with self._lock:
+            timing = {name: round(self.stages[name], 6) for name in STAGES if name in self.stages}
+            timing.update({name: round(s, 6) for name, s in self.stages.items() if name not in timing})
+        timing['total'] = round(self.elapsed(), 6)
+        return timing
+
+
+@contextmanager
+def timing(timer: StageTimer) -> Iterator[StageTimer]:
+    """Make a timer the one stage() records into for the current context"""
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block into the active timer; a no-op outside timing()"""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - start)
+
+
+def timed_iter(iterable: Iterable, name: str) -> Iterator:
+    """Yield from an iterable, timing each step under a stage name"""
+    iterator = iter(iterable)
+    while True:
+        with stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+class StageHistograms:
+    """
+    Per file type and stage latency histograms
+
+    Counts live in fixed log-spaced buckets, so memory is constant and
+    percentiles are estimated as the upper bound of the bucket holding them.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = np.asarray(buckets, dtype=np.float64)
+        self._lock = threading.Lock()
+        self._series: Dict[str, Dict[str, Dict]] = {}
+
+    def observe(self, file_type: str, breakdown: Dict[str, float]):
+        """Add one analysis' stage breakdown"""
+        with self._lock:
+            series = self._series.setdefault(file_type or 'unknown', {})
+            for name, seconds in breakdown.items():
+                s = series.get(name)
+                if s is None:
+                    s = series[name] = {
+                        'counts': np.zeros(len(self.buckets) + 1, dtype=np.int64),
+                        'count': 0, 'sum': 0.0, 'max': 0.0
+                    }
+                s['counts'][np.searchsorted(self.buckets, seconds)] += 1
+                s['count'] += 1
+                s['sum'] += seconds
+                s['max'] = max(s['max'], seconds)
+
+    def _quantile(self, s: Dict, q: float) -> float:
+        rank = q * s['count']
+        index = int(np.searchsorted(np.cumsum(s['counts']), rank))
+        return min(float(self.buckets[index]), s['max']) if index < len(self.buckets) else s['max']
+
+    def snapshot(self) -> Dict:
+        """Count, mean, p50, p95, max and non-empty buckets per file type and stage"""
+        with self._lock:
+            return {
+                file_type: {
+                    name: {
+                        'count': s['count'],
+                        'mean': s['sum'] / s['count'],
+                        'p50': self._quantile(s, 0.5),
+                        'p95': self._quantile(s, 0.95),
+                        'max': s['max'],
+                        'buckets': [
+                            [float(self.buckets[i]) if i < len(self.buckets) else None, int(c)]
+                            for i, c in enumerate(s['counts']) if c
+                        ]
+                    }
+                    for name, s in series.items()
+                }
+                for file_type, series in self._series.items()
+            }
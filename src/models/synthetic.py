@@ -0,0 +1,204 @@
+"""
+Synthetic Backend
+Seeded, vectorized stand-in for the detection models with simulated per-modality latency
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Draws computed at once per thread and file type
+BLOCK_SIZE = 256
+
+FILE_TYPES = ('image', 'video', 'audio', 'unknown')
+
+# Share of results that come out authentic, before per-result jitter
+AUTHENTIC_PROBABILITY = {'image': 0.65, 'video': 0.55, 'audio': 0.70, 'unknown': 0.60}
+
+MODELS_USED = {
+    'image': ['cnn_v2', 'face_detector', 'texture_analyzer'],
+    'video': ['temporal_v1', '3d_cnn', 'optical_flow'],
+    'audio': ['audio_v3', 'spectral_analyzer', 'voice_consistency'],
+    'unknown': ['ensemble']
+}
+
+# Evidence fields per file type: (name, kind, scale). 'signed' anomalies
+# move with the verdict's confidence, 'consistency' is one minus an anomaly
+# and 'compression' is a scaled anomaly plus noise
+EVIDENCE = {
+    'image': (('facial_inconsistencies', 'signed', 1.0), ('texture_artifacts', 'signed', 1.0),
+              ('compression_anomalies', 'compression', 0.8)),
+    'video': (('temporal_artifacts', 'signed', 1.0), ('frame_consistency', 'consistency', 1.0),
+              ('compression_anomalies', 'compression', 0.7)),
+    'audio': (('spectral_anomalies', 'signed', 1.0), ('voice_consistency', 'consistency', 1.0),
+              ('synthesis_artifacts', 'compression', 0.9)),
+    'unknown': ()
+}
+
+# Log-normal processing time per file type: median seconds and log-space spread
+LATENCY = {
+    'image': {'median': 0.8, 'sigma': 0.4},
+    'video': {'median': 6.0, 'sigma': 0.6},
+    'audio': {'median': 2.0, 'sigma': 0.5},
+    'unknown': {'median': 1.0, 'sigma': 0.5}
+}
+
+
+class SyntheticBackend:
+    """
+    Deterministic fake analysis results for demos and load tests
+
+    Every (worker, thread, file type) has its own generator seeded from
+    (seed, worker, thread slot, file type), so threads never share RNG
+    state and a worker replays the same results for the same sequence of
+    requests. Slots are numbered in order of each thread's first draw in
+    each process. Without an explicit worker, the index comes from the
+    SYNTHETIC_WORKER environment variable, which gunicorn.conf.py sets
+    per forked worker. Failing that, it is 0 in the process that built the
+    backend and the pid in processes forked from it, so workers forked
+    after a --preload never replay one another's stream.
+    Results are computed a block at a time with whole-array draws, and a
+    request takes the next row. Each result also carries a simulated
+    'simulated_latency' drawn from the file type's log-normal
+    distribution. Nothing here sleeps: the async API awaits it and the job
+    queue's analysis workers sleep it off, so neither holds a request
+    thread, while direct synchronous calls only report it. Mock-mode
+    results and cache hits carry no simulated latency.
+    """
+
+    def __init__(self, seed: int = 0, worker: Optional[int] = None, latency: Optional[Dict] = None,
+                 block_size: int = BLOCK_SIZE):
+        """
+        Args:
+            seed: Base seed shared by all workers of a run
+            worker: Index of this worker process, so workers draw distinct
+                streams; None derives it in each process as above
+            latency: Per file type overrides of LATENCY
+            block_size: Results drawn per vectorized step
+        """
+        self.seed = seed
+        self.worker = worker
+        self.latency = {name: {**LATENCY[name], **(latency or {}).get(name, {})} for name in LATENCY}
+        self.block_size = block_size
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._slots = 0
+        self._slots_pid = self._pid
+        self._lock = threading.Lock()
+
+    def worker_index(self) -> int:
+        """Index of the current process's stream"""
+        if self.worker is not None:
+            return self.worker
+        configured = os.environ.get('SYNTHETIC_WORKER')
+        if configured:
+            return int(configured)
+        pid = os.getpid()
+        return 0 if pid == self._pid else pid
+
+    def _streams(self) -> Dict:
+        """This thread's generators and pending blocks, rebuilt after a fork"""
+        local = self._local
+        pid = os.getpid()
+        if getattr(local, 'pid', None) != pid:
+            with self._lock:
+                if self._slots_pid != pid:
+                    self._slots, self._slots_pid = 0, pid
+                slot = self._slots
+                self._slots += 1
+            worker = self.worker_index()
+            local.streams = {
+                file_type: {
+                    'rng': np.random.default_rng(np.random.SeedSequence(
+                        self.seed, spawn_key=(worker, slot, index))),
+                    'block': None,
+                    'position': 0
+                }
+                for index, file_type in enumerate(FILE_TYPES)
+            }
+            local.pid = pid
+        return local.streams
+
+    def _draw_block(self, rng: np.random.Generator, file_type: str, n: int) -> Dict[str, np.ndarray]:
+        """n results as columns, from two whole-array draws"""
+        fields = EVIDENCE[file_type]
+        uniform = rng.random((n, 4 + len(fields)))
+        normal = rng.standard_normal((n, 2))
+
+        authentic_probability = np.clip(AUTHENTIC_PROBABILITY[file_type] + 0.15 * normal[:, 0], 0.1, 0.9)
+        authentic = uniform[:, 0] < authentic_probability
+        confidence = np.where(authentic, 0.75 + 0.20 * uniform[:, 1], 0.60 + 0.30 * uniform[:, 1])
+        # Some uncertain edge cases
+        uncertain = uniform[:, 2] < 0.15
+        confidence = np.clip(np.where(uncertain, 0.45 + 0.20 * uniform[:, 3], confidence), 0.01, 0.99)
+
+        base = np.where(authentic, 0.15, 0.60)
+        spread = np.where(authentic, 0.25, 0.35)
+        lean = np.where(authentic, -1.0, 1.0) * (confidence - 0.5) * 0.3
+        columns = {'authentic': authentic, 'confidence': confidence}
+        for i, (name, kind, scale) in enumerate(fields):
+            noise = uniform[:, 4 + i]
+            if kind == 'signed':
+                value = base + spread * (noise - 0.5) + lean
+            elif kind == 'consistency':
+                value = 1 - (base + spread * (noise - 0.5))
+            else:
+                value = base * scale + spread * noise
+            columns[name] = np.clip(value, 0, 1)
+
+        latency = self.latency[file_type]
+        columns['latency'] = latency['median'] * np.exp(latency['sigma'] * normal[:, 1])
+        return columns
+
+    def _take(self, file_type: str, n: int) -> Dict[str, np.ndarray]:
+        """The next n rows of this thread's stream for a file type"""
+        stream = self._streams()[file_type]
+        parts = []
+        while n > 0:
+            block = stream['block']
+            if block is None or stream['position'] == len(block['confidence']):
+                block = stream['block'] = self._draw_block(stream['rng'], file_type, self.block_size)
+                stream['position'] = 0
+            start = stream['position']
+            stop = min(start + n, len(block['confidence']))
+            parts.append({name: column[start:stop] for name, column in block.items()})
+            stream['position'] = stop
+            n -= stop - start
+        if len(parts) == 1:
+            return parts[0]
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+    def results(self, file_type: str, n: int) -> List[Dict]:
+        """n synthetic analysis results"""
+        if file_type not in FILE_TYPES:
+            file_type = 'unknown'
+        rows = self._take(file_type, n)
+        fields = [name for name, _, _ in EVIDENCE[file_type]]
+        authentic = rows['authentic'].tolist()
+        confidence = rows['confidence'].tolist()
+        latency = rows['latency'].tolist()
+        evidence = {name: rows[name].tolist() for name in fields}
+        return [
+            {
+                'prediction': 'authentic' if authentic[i] else 'deepfake',
+                'confidence': confidence[i],
+                'is_authentic': authentic[i],
+                'models_used': list(MODELS_USED[file_type]),
+                'evidence': {name: evidence[name][i] for name in fields},
+                'file_type': file_type,
+                'simulated_latency': latency[i]
+            }
+            for i in range(n)
+        ]
+
+    def result(self, file_type: str) -> Dict:
+        """One synthetic analysis result"""
+        return self.results(file_type, 1)[0]
+
+    def confidences(self, file_type: str, n: int) -> np.ndarray:
+        """Just the confidences of n results, e.g. as per-window scores"""
+        if file_type not in FILE_TYPES:
+            file_type = 'unknown'
+        return self._take(file_type, n)['confidence'].copy()
@@ -0,0 +1,207 @@
+"""
+Temporal Consistency Analysis
+Vectorized frame-difference, optical-flow and blockiness statistics for video clips
+"""
+
+import numpy as np
+import cv2
+from typing import Dict, List, Tuple
+
+# Side length of the grayscale stack used for motion statistics
+TEMPORAL_SIZE = 64
+
+# Block size for the Lucas-Kanade flow estimate on the downscaled stack
+FLOW_BLOCK = 8
+
+# Codec block size, the largest crop and the number of frames sampled for
+# blockiness measurement
+CODEC_BLOCK = 8
+BLOCKINESS_CROP = 128
+BLOCKINESS_FRAMES = 8
+
+_EPS = 1e-6
+
+
+def to_gray_stack(frames: List[np.ndarray], size: int = TEMPORAL_SIZE) -> np.ndarray:
+    """Downscale frames and stack them as a float32 (T, size, size) array in [0, 1]"""
+    stack = np.empty((len(frames), size, size), dtype=np.float32)
+    for i, frame in enumerate(frames):
+        # Nearest-neighbour decimation to twice the target size keeps the
+        # colour conversion and the final INTER_AREA pass cheap on large frames
+        if min(frame.shape[:2]) > 2 * size:
+            frame = cv2.resize(frame, (2 * size, 2 * size), interpolation=cv2.INTER_NEAREST)
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        stack[i] = cv2.resize(frame, (size, size), interpolation=cv2.INTER_AREA)
+    stack *= 1.0 / 255.0
+    return stack
+
+
+def _block_sum(x: np.ndarray, block: int) -> np.ndarray:
+    """Sum a (T, H, W) array over non-overlapping block x block tiles"""
+    t, h, w = x.shape
+    return x.reshape(t, h // block, block, w // block, block).sum(axis=(2, 4))
+
+
+def frame_difference_stats(stack: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Per-pair motion energy and its irregularity
+
+    Returns:
+        (energy, jerk) where energy is the mean absolute difference of each
+        consecutive frame pair and jerk is the normalised mean change in energy
+    """
+    energy = np.abs(np.diff(stack, axis=0)).mean(axis=(1, 2))
+    if energy.size < 2:
+        return energy, 0.0
+    jerk = float(np.abs(np.diff(energy)).mean() / (energy.mean() + _EPS))
+    return energy, jerk
+
+
+def block_optical_flow(stack: np.ndarray, block: int = FLOW_BLOCK) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Block-wise Lucas-Kanade flow between every consecutive frame pair
+
+    All pairs are solved at once from block-summed structure tensors.
+
+    Returns:
+        (flow, unexplained) where flow has shape (T-1, H/block, W/block, 2) and
+        unexplained is the fraction of temporal change per pair that the local
+        translational model cannot account for
+    """
+    t, h, w = stack.shape
+    h, w = h - h % block, w - w % block
+    stack = stack[:, :h, :w]
+
+    prev, nxt = stack[:-1], stack[1:]
+    avg = 0.5 * (prev + nxt)
+    ix = np.gradient(avg, axis=2)
+    iy = np.gradient(avg, axis=1)
+    it = nxt - prev
+
+    sxx = _block_sum(ix * ix, block)
+    syy = _block_sum(iy * iy, block)
+    sxy = _block_sum(ix * iy, block)
+    sxt = _block_sum(ix * it, block)
+    syt = _block_sum(iy * it, block)
+    stt = _block_sum(it * it, block)
+
+    det = sxx * syy - sxy * sxy
+    valid = det > _EPS
+    safe_det = np.where(valid, det, 1.0)
+    u = np.where(valid, (-syy * sxt + sxy * syt) / safe_det, 0.0)
+    v = np.where(valid, (sxy * sxt - sxx * syt) / safe_det, 0.0)
+
+    # Brightness-constancy residual of the fitted motion, in closed form
+    residual = (stt + 2 * u * sxt + 2 * v * syt
+                + u * u * sxx + 2 * u * v * sxy + v * v * syy)
+    unexplained = np.clip(residual.sum(axis=(1, 2)) / (stt.sum(axis=(1, 2)) + _EPS), 0.0, 1.0)
+
+    return np.stack([u, v], axis=-1), unexplained
+
+
+def blockiness_profile(frames: List[np.ndarray], block: int = CODEC_BLOCK,
+                       crop: int = BLOCKINESS_CROP,
+                       max_frames: int = BLOCKINESS_FRAMES) -> np.ndarray:
+    """
+    Ratio of gradient energy on codec block boundaries to the interior
+
+    Measured on a grid-aligned centre crop at native resolution, since any
+    resampling would smear the block grid, for at most max_frames evenly
+    spaced frames. A value of 0 means no visible grid.
+    """
+    if len(frames) > max_frames:
+        frames = [frames[i] for i in np.linspace(0, len(frames) - 1, max_frames).astype(int)]
+
+    h, w = frames[0].shape[:2]
+    ch = min(crop, h) // block * block
+    cw = min(crop, w) // block * block
+    if ch < 2 * block or cw < 2 * block:
+        return np.zeros(len(frames), dtype=np.float32)
+
+    top = (h - ch) // 2 // block * block
+    left = (w - cw) // 2 // block * block
+
+    stack = np.empty((len(frames), ch, cw), dtype=np.int16)
+    for i, frame in enumerate(frames):
+        region = frame[top:top + ch, left:left + cw]
+        stack[i] = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY) if region.ndim == 3 else region
+
+    # Gradient energy per column boundary and per row boundary
+    col_energy = np.abs(np.diff(stack, axis=2)).sum(axis=1, dtype=np.float32)
+    row_energy = np.abs(np.diff(stack, axis=1)).sum(axis=2, dtype=np.float32)
+
+    boundary_sum = (col_energy[:, block - 1::block].sum(axis=1)
+                    + row_energy[:, block - 1::block].sum(axis=1))
+    boundary_count = (col_energy[0, block - 1::block].size * ch
+                      + row_energy[0, block - 1::block].size * cw)
+    total_sum = col_energy.sum(axis=1) + row_energy.sum(axis=1)
+    total_count = (cw - 1) * ch + (ch - 1) * cw
+
+    boundary = boundary_sum / boundary_count
+    interior = (total_sum - boundary_sum) / (total_count - boundary_count)
+
+    return np.maximum(boundary / (interior + _EPS) - 1.0, 0.0)
+
+
+def analyze_temporal_consistency(frames: List[np.ndarray], size: int = TEMPORAL_SIZE,
+                                 flow_block: int = FLOW_BLOCK) -> Dict[str, float]:
+    """
+    Score a clip for temporal artifacts
+
+    Args:
+        frames: BGR (or grayscale) frames of equal size, in temporal order
+        size: Side length of the downscaled grayscale stack
+        flow_block: Block size for the flow estimate; must divide size
+
+    Raises:
+        ValueError: If size and flow_block are incompatible or the frames
+            differ in shape
+
+    Returns:
+        Dictionary with temporal_score, consistency_score and compression_score,
+        each in [0, 1]. Higher temporal and compression scores are more
+        suspicious; higher consistency is more natural.
+    """
+    if flow_block < 2 or size < flow_block or size % flow_block:
+        raise ValueError(
+            f"temporal size {size} must be a multiple of flow block {flow_block}, "
+            f"and the flow block must be at least 2"
+        )
+
+    if not frames:
+        return {'temporal_score': 0.0, 'consistency_score': 1.0, 'compression_score': 0.0}
+
+    shapes = {frame.shape for frame in frames}
+    if len(shapes) > 1:
+        raise ValueError(f"Frames must share one shape, got {sorted(shapes)}")
+
+    blockiness = blockiness_profile(frames)
+    compression = 0.7 * np.tanh(2.0 * blockiness.mean()) + 0.3 * np.tanh(4.0 * blockiness.std())
+
+    if len(frames) < 2:
+        return {
+            'temporal_score': 0.0,
+            'consistency_score': 1.0,
+            'compression_score': float(np.clip(compression, 0.0, 1.0))
+        }
+
+    stack = to_gray_stack(frames, size)
+
+    _, jerk = frame_difference_stats(stack)
+
+    flow, unexplained = block_optical_flow(stack, flow_block)
+    if flow.shape[0] > 1:
+        magnitude = np.linalg.norm(flow, axis=-1).mean()
+        jitter = np.linalg.norm(np.diff(flow, axis=0), axis=-1).mean() / (magnitude + _EPS)
+    else:
+        jitter = 0.0
+
+    temporal = 1.0 - np.exp(-jerk)
+    inconsistency = 0.5 * unexplained.mean() + 0.5 * np.tanh(jitter)
+
+    return {
+        'temporal_score': float(np.clip(temporal, 0.0, 1.0)),
+        'consistency_score': float(np.clip(1.0 - inconsistency, 0.0, 1.0)),
+        'compression_score': float(np.clip(compression, 0.0, 1.0))
+    }
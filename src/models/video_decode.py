@@ -0,0 +1,192 @@
+"""
+Parallel Video Decoding
+Splits long videos into frame ranges decoded by a process pool into shared memory
+"""
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+# Forward decoding beats a seek when the next wanted frame is this close
+SEEK_GAP = 64
+
+# Videos with fewer frames than this are decoded in-process
+PARALLEL_MIN_FRAMES = 600
+
+MAX_DECODE_WORKERS = 16
+
+# One pool per configured worker count, never replaced while in use
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pool_lock = threading.Lock()
+
+
+def probe_video(file_path: str) -> Dict:
+    """Read frame count, fps, resolution and duration without decoding"""
+    cap = cv2.VideoCapture(file_path)
+    try:
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = float(cap.get(cv2.CAP_PROP_FPS)) or 0.0
+        return {
+            'frame_count': max(frame_count, 0),
+            'fps': fps,
+            'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'duration': frame_count / fps if fps > 0 else 0.0
+        }
+    finally:
+        cap.release()
+
+
+def output_shape(width: int, height: int, max_side: Optional[int]) -> Tuple[int, int]:
+    """Frame size after capping the long side, preserving aspect ratio"""
+    if not max_side or max(width, height) <= max_side:
+        return width, height
+    scale = max_side / max(width, height)
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def sample_indices(frame_count: int, max_frames: int) -> List[int]:
+    """Evenly spaced frame indices covering the whole video"""
+    if frame_count <= 0 or max_frames <= 0:
+        return []
+    if frame_count <= max_frames:
+        return list(range(frame_count))
+    return np.linspace(0, frame_count - 1, max_frames).round().astype(int).tolist()
+
+
+def _decode_range(file_path: str, indices: List[int], slots: List[int], out: np.ndarray,
+                  size: Tuple[int, int]) -> List[int]:
+    """
+    Decode sorted frame indices with one capture into out[slots]
+
+    The capture seeks once to the first index (OpenCV lands on the preceding
+    keyframe and decodes forward) and then grabs forward, seeking again only
+    across gaps wider than SEEK_GAP.
+
+    Returns:
+        Slots that were filled
+    """
+    cap = cv2.VideoCapture(file_path)
+    filled = []
+    try:
+        position = None
+        for index, slot in zip(indices, slots):
+            if position is None or index < position or index - position > SEEK_GAP:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+                position = index
+            while position < index:
+                if not cap.grab():
+                    return filled
+                position += 1
+            ok, frame = cap.read()
+            position += 1
+            if not ok:
+                return filled
+            if (frame.shape[1], frame.shape[0]) != size:
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            out[slot] = frame
+            filled.append(slot)
+    finally:
+        cap.release()
+    return filled
+
+
+def _decode_range_shared(file_path: str, indices: List[int], slots: List[int], shm_name: str,
+                         shape: Tuple[int, ...], size: Tuple[int, int]) -> List[int]:
+    """Process-pool entry point: decode a range straight into shared memory"""
+    # Parallelism comes from the pool; one decode thread per worker avoids
+    # oversubscribing the host
+    cv2.setNumThreads(1)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return _decode_range(file_path, indices, slots,
+                             np.ndarray(shape, dtype=np.uint8, buffer=shm.buf), size)
+    finally:
+        shm.close()
+
+
+def get_decode_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Shared spawn-context pool; spawn keeps TensorFlow state out of the workers
+
+    Pools are keyed by the configured worker count, not by the size of one
+    request, so short clips reuse the pool and a pool is never shut down
+    under another thread's decodes.
+    """
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return pool
+
+
+def default_workers() -> int:
+    return max(1, min(os.cpu_count() or 1, MAX_DECODE_WORKERS))
+
+
+def decode_frames(file_path: str, indices: List[int], workers: int = None,
+                  max_side: Optional[int] = None,
+                  parallel_min_frames: int = PARALLEL_MIN_FRAMES,
+                  probe: Optional[Dict] = None) -> List[np.ndarray]:
+    """
+    Decode the given frame indices, in parallel for long videos
+
+    The indices are split into contiguous ranges, one per worker, and each
+    worker decodes its range with its own capture into a shared-memory block
+    so frames never pass through pickling.
+
+    Args:
+        file_path: Video file
+        indices: Frame indices to decode
+        workers: Process count; defaults to the CPU count capped at 16
+        max_side: Optional cap on the decoded frame's long side
+        parallel_min_frames: Videos shorter than this decode in-process
+        probe: Result of probe_video, if already available
+
+    Returns:
+        Decoded BGR frames in index order; frames that fail to decode are
+        omitted
+    """
+    probe = probe or probe_video(file_path)
+    indices = sorted(set(indices))
+    if not indices or probe['width'] <= 0 or probe['height'] <= 0:
+        return []
+
+    workers = workers or default_workers()
+    # Short clips and small frame budgets submit fewer ranges, not a smaller pool
+    ranges = min(workers, len(indices))
+    size = output_shape(probe['width'], probe['height'], max_side)
+    shape = (len(indices), size[1], size[0], 3)
+    slots = list(range(len(indices)))
+
+    if ranges <= 1 or probe['frame_count'] < parallel_min_frames:
+        out = np.empty(shape, dtype=np.uint8)
+        filled = _decode_range(file_path, indices, slots, out, size)
+        return [out[slot] for slot in filled]
+
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+    try:
+        pool = get_decode_pool(workers)
+        chunks = np.array_split(np.arange(len(indices)), ranges)
+        futures = [
+            pool.submit(_decode_range_shared, file_path,
+                        [indices[i] for i in chunk], chunk.tolist(), shm.name, shape, size)
+            for chunk in chunks if len(chunk)
+        ]
+        filled = sorted(slot for future in futures for slot in future.result())
+
+        # One copy out of the shared block before it is released
+        shared = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        frames = np.array(shared[filled]) if filled else np.empty((0,) + shape[1:], dtype=np.uint8)
+        del shared
+        return list(frames)
+    finally:
+        shm.close()
+        shm.unlink()
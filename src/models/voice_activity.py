@@ -0,0 +1,88 @@
+"""
+Voice Activity Gating
+Energy and spectral-flux checks that keep silent or static audio windows away from the audio model
+"""
+
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+# Frames quieter than this (mean square, dBFS) count as silence
+ENERGY_FLOOR_DB = -50.0
+
+# Mean rise in log-mel power a frame needs to count as changing. Steady
+# tones, hold music chords and stationary noise stay well under it;
+# syllable onsets exceed it
+FLUX_THRESHOLD_DB = 2.0
+
+# Share of active frames for a window to count as speech
+MIN_ACTIVE_RATIO = 0.2
+
+DEFAULTS = {
+    'enabled': True,
+    'energy_floor_db': ENERGY_FLOOR_DB,
+    'flux_threshold_db': FLUX_THRESHOLD_DB,
+    'min_active_ratio': MIN_ACTIVE_RATIO
+}
+
+
+def resolve_settings(config: Optional[Dict] = None,
+                     override: Union[bool, Dict, None] = None) -> Dict:
+    """
+    Merge gate settings: module defaults, then the model config, then the request
+
+    Args:
+        config: The audio model's 'vad' settings
+        override: Per-request value; a bool switches the gate on or off, a
+            dict replaces individual settings
+
+    Raises:
+        ValueError: If the override is neither a bool nor a dict, or names an
+            unknown setting
+    """
+    settings = dict(DEFAULTS)
+    settings.update(config or {})
+    if override is None:
+        return settings
+    if isinstance(override, bool):
+        settings['enabled'] = override
+        return settings
+    if not isinstance(override, dict):
+        raise ValueError("vad must be a boolean or an object of settings")
+
+    unknown = set(override) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown vad settings: {', '.join(sorted(unknown))}")
+    settings.update(override)
+    return settings
+
+
+def active_frames(energy_db: np.ndarray, flux: np.ndarray,
+                  energy_floor_db: float = ENERGY_FLOOR_DB,
+                  flux_threshold_db: float = FLUX_THRESHOLD_DB) -> np.ndarray:
+    """Boolean mask of frames that are both audible and changing"""
+    return (energy_db > energy_floor_db) & (flux > flux_threshold_db)
+
+
+def speech_windows(energy_db: List[np.ndarray], flux: List[np.ndarray],
+                   settings: Optional[Dict] = None) -> np.ndarray:
+    """
+    Decide per window whether it holds speech
+
+    Args:
+        energy_db: Per-window frame energies, from MelFeatureEngine.compute_with_activity
+        flux: Per-window spectral flux, from the same call
+        settings: Output of resolve_settings
+
+    Returns:
+        Boolean array, True for windows to pass to the model
+    """
+    settings = settings or DEFAULTS
+    if not settings['enabled']:
+        return np.ones(len(energy_db), dtype=bool)
+
+    return np.array([
+        active_frames(e, f, settings['energy_floor_db'], settings['flux_threshold_db']).mean()
+        >= settings['min_active_ratio']
+        for e, f in zip(energy_db, flux)
+    ], dtype=bool)
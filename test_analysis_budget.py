@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for the Analysis Budget
+Checks budget accounting and that decoders stop early with partial results or a budget error
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import cv2
+import numpy as np
+import soundfile as sf
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.analysis_budget import AnalysisBudget, BudgetExceeded, budgeting
+from models.voice_activity import resolve_settings
+
+_detector = None
+
+
+def _get_detector():
+    """One detector for these tests, without the on-disk history and audio cache"""
+    global _detector
+    if _detector is None:
+        from models.deepfake_detector import DeepFakeDetector
+        config = DeepFakeDetector._get_default_config(None)
+        config['history']['enabled'] = False
+        config['audio_model']['cache']['enabled'] = False
+        _detector = DeepFakeDetector(config)
+    return _detector
+
+
+def test_fit_truncates_and_charge_raises():
+    budget = AnalysisBudget(wall_seconds=None, pixels=1000, audio_samples=None, memory_mb=None)
+    assert budget.fit(10, pixels=300) == 3
+    assert budget.exceeded == 'pixels'
+    budget.charge('pixels', 900)
+    try:
+        budget.charge('pixels', 200)
+        assert False, "charge past the limit should raise"
+    except BudgetExceeded as e:
+        assert e.resource == 'pixels' and e.limit == 1000
+
+
+def test_wall_time_and_held_memory():
+    budget = AnalysisBudget(wall_seconds=0.01, pixels=None, audio_samples=None, memory_mb=1)
+    budget.hold(600 * 1024)
+    budget.release(600 * 1024)
+    budget.hold(600 * 1024)  # released memory is available again
+    assert budget.summary()['used']['peak_memory_mb'] == 0.586
+    time.sleep(0.02)
+    try:
+        budget.check()
+        assert False, "check after the deadline should raise"
+    except BudgetExceeded as e:
+        assert e.resource == 'wall_seconds'
+
+
+def test_oversized_image_is_refused_before_decoding():
+    """The header alone puts the image over the pixel budget; the result says why"""
+    detector = _get_detector()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'large.png')
+        cv2.imwrite(path, np.zeros((600, 800, 3), dtype=np.uint8))
+        result = detector.analyze_file(path, 'image', {'budget': {'pixels': 100_000}})
+
+    print(f"  image: {result.get('error')}")
+    assert result['prediction'] == 'error'
+    assert 'pixels budget exceeded' in result['error']
+    assert result['budget']['exceeded'] == 'pixels'
+    assert result['budget']['partial'] is False
+
+
+def test_video_decodes_fewer_frames_within_the_pixel_budget():
+    detector = _get_detector()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'clip.avi')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+        for i in range(40):
+            writer.write(np.full((48, 64, 3), i * 6, dtype=np.uint8))
+        writer.release()
+
+        budget = AnalysisBudget(pixels=64 * 48 * 5)
+        with budgeting(budget):
+            frames = detector._extract_video_frames(path, max_frames=16)
+
+    assert len(frames) == 5
+    assert budget.exceeded == 'pixels'
+    assert budget.summary()['used']['pixels'] == 64 * 48 * 5
+
+
+def test_long_audio_is_cut_at_the_sample_budget():
+    """Streaming audio scores what fits and reports the recording as truncated"""
+    detector = _get_detector()
+    sr = detector.model_config['audio_model']['sample_rate']
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'long.wav')
+        t = np.arange(60 * sr) / sr
+        sf.write(path, (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), sr)
+
+        budget = AnalysisBudget(audio_samples=10 * sr)
+        vad = resolve_settings(detector.model_config['audio_model']['vad'], False)
+        totals = {}
+        with budgeting(budget):
+            for _ in detector._iter_speech_windows(path, vad, totals):
+                pass
+
+        # The fixed 10-second excerpt shrinks to the one second left
+        short = AnalysisBudget(audio_samples=sr)
+        with budgeting(short):
+            features = detector._preprocess_audio(path)
+
+    assert totals['truncated']
+    assert totals['duration'] <= 10
+    assert budget.exceeded == 'audio_samples'
+    assert features.shape[0] == 1
+    assert short.exceeded == 'audio_samples'
+    assert short.summary()['used']['audio_samples'] == sr
+
+
+if __name__ == "__main__":
+    print("🧪 Analysis Budget Test Suite")
+    print("=" * 50)
+    test_fit_truncates_and_charge_raises()
+    test_wall_time_and_held_memory()
+    test_oversized_image_is_refused_before_decoding()
+    test_video_decodes_fewer_frames_within_the_pixel_budget()
+    test_long_audio_is_cut_at_the_sample_budget()
+    print("✅ All budget tests passed!")
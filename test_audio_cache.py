@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for the Decoded Audio Cache
+Checks content keys, memory-mapped hits, spooled writes and LRU eviction
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.audio_cache import AudioCache
+
+
+def _write(path, payload: bytes):
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+
+def test_keys_follow_content_and_params():
+    """Same bytes share a key; other bytes or parameters do not"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(os.path.join(tmp, 'cache'))
+        a, b, c = (os.path.join(tmp, name) for name in ('a.wav', 'b.wav', 'c.wav'))
+        _write(a, b'same audio')
+        _write(b, b'same audio')
+        _write(c, b'other audio')
+        params = {'sample_rate': 16000, 'n_mels': 128}
+
+        assert cache.key(a, params) == cache.key(b, params)
+        assert cache.key(a, params) != cache.key(c, params)
+        assert cache.key(a, params) != cache.key(a, {**params, 'sample_rate': 22050})
+        assert cache.key(a, params) != cache.key(a, {**params, 'n_mels': 64})
+
+
+def test_spooled_entry_round_trips_as_memmap():
+    """A fully consumed stream is stored and read back memory-mapped"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp)
+        blocks = [np.arange(i, i + 5, dtype=np.float32) for i in range(0, 20, 5)]
+
+        assert cache.get('k') is None
+        passed = list(cache.put_stream('k', 'pcm', iter(blocks)))
+        assert len(passed) == 4
+
+        pcm = cache.get('k')['pcm']
+        assert isinstance(pcm, np.memmap)
+        assert np.array_equal(pcm, np.arange(20, dtype=np.float32))
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+
+def test_abandoned_stream_leaves_no_entry():
+    """Stopping early (max_windows truncation) must not cache partial audio"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp)
+        stream = cache.put_stream('k', 'pcm', iter([np.zeros(4, np.float32)] * 3))
+        next(stream)
+        stream.close()
+
+        assert cache.get('k') is None
+        assert os.listdir(tmp) == []
+
+
+def test_lru_eviction_keeps_recently_used():
+    """Over the size bound, the least recently used entry goes first"""
+    with tempfile.TemporaryDirectory() as tmp:
+        array = np.zeros(1000, dtype=np.float32)  # ~4 KB per entry
+        cache = AudioCache(tmp, max_bytes=10_000)
+
+        cache.put('old', {'pcm': array})
+        cache.put('used', {'pcm': array})
+        past = time.time() - 60
+        os.utime(os.path.join(tmp, 'old.pcm.npy'), (past, past))
+        os.utime(os.path.join(tmp, 'used.pcm.npy'), (past + 1, past + 1))
+        assert cache.get('used') is not None  # refreshes its recency
+
+        cache.put('new', {'pcm': array})
+        assert cache.get('old') is None
+        assert cache.get('used') is not None and cache.get('new') is not None
+        assert cache.stats()['evictions'] == 1
+        assert cache.stats()['bytes'] <= 10_000
+
+
+if __name__ == "__main__":
+    print("🧪 Audio Cache Test Suite")
+    print("=" * 50)
+    test_keys_follow_content_and_params()
+    test_spooled_entry_round_trips_as_memmap()
+    test_abandoned_stream_leaves_no_entry()
+    test_lru_eviction_keeps_recently_used()
+    print("✅ All audio cache tests passed!")
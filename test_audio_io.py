@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for Audio I/O
+Checks block streaming and fixed-window slicing of decoded audio
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models import audio_io
+from models.audio_io import stream_audio, iter_windows, load_audio
+
+
+def test_windows_cover_blocks_exactly():
+    """Windows are contiguous across block boundaries, in order"""
+    signal = np.arange(10_000, dtype=np.float32)
+    blocks = (signal[i:i + 1_234] for i in range(0, len(signal), 1_234))
+    windows = list(iter_windows(blocks, 1_000))
+
+    assert [len(w) for w in windows] == [1_000] * 10
+    assert np.array_equal(np.concatenate(windows), signal)
+
+
+def test_short_tail_is_dropped_unless_it_is_everything():
+    """A trailing fragment below min_samples is skipped, but a short file still yields"""
+    windows = list(iter_windows(iter([np.zeros(2_100, dtype=np.float32)]), 1_000, min_samples=250))
+    assert [len(w) for w in windows] == [1_000, 1_000]
+
+    windows = list(iter_windows(iter([np.zeros(100, dtype=np.float32)]), 1_000, min_samples=250))
+    assert [len(w) for w in windows] == [100]
+
+
+def test_stream_audio_resamples_blocks_to_target_rate():
+    """A 44.1 kHz stereo WAV streams as mono 16 kHz of the same duration"""
+    sr = 44_100
+    t = np.arange(sr * 5) / sr
+    stereo = np.stack([np.sin(2 * np.pi * 440 * t)] * 2, axis=1).astype(np.float32) * 0.3
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tone.wav')
+        sf.write(path, stereo, sr)
+        blocks = list(stream_audio(path, sr=16_000, block_seconds=2.0))
+
+    assert len(blocks) == 3
+    assert all(b.ndim == 1 and b.dtype == np.float32 for b in blocks)
+    assert abs(sum(len(b) for b in blocks) - 5 * 16_000) <= 3
+
+
+class EndlessSource:
+    """Stand-in audioread decoder for a stream that never ends"""
+
+    samplerate = 8_000
+    channels = 2
+
+    def __init__(self):
+        self.buffers_read = 0
+        self.closed = False
+
+    def __iter__(self):
+        buffer = np.zeros(1_001 * self.channels, dtype='<i2').tobytes() + b'\x00'  # unaligned on purpose
+        while True:
+            self.buffers_read += 1
+            yield buffer
+
+    def close(self):
+        self.closed = True
+
+
+def test_max_seconds_stops_compressed_decodes_early():
+    """A capped load of a long MP3 reads only the capped frames, not the whole file"""
+    sr = 22_050
+    t = np.arange(sr * 120) / sr
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'long.mp3')
+        sf.write(path, (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), sr)
+
+        frames_read = []
+        original = audio_io.sf.blocks
+        def counting_blocks(*args, **kwargs):
+            for block in original(*args, **kwargs):
+                frames_read.append(len(block))
+                yield block
+        audio_io.sf.blocks = counting_blocks
+        try:
+            y = load_audio(path, sr=16_000, max_seconds=10)
+        finally:
+            audio_io.sf.blocks = original
+
+    print(f"  decoded {sum(frames_read) / sr:.1f}s of 120s")
+    assert len(y) == 10 * 16_000
+    assert 0 < sum(frames_read) <= 10 * sr
+
+
+def test_audioread_fallback_streams_and_stops_at_max_seconds():
+    """Formats libsndfile cannot open are decoded incrementally and the decoder closed at the cap"""
+    source = EndlessSource()
+    original = audio_io.audioread.audio_open
+    audio_io.audioread.audio_open = lambda path: source
+    try:
+        blocks = list(stream_audio('missing.m4a', sr=8_000, block_seconds=1.0, max_seconds=3))
+    finally:
+        audio_io.audioread.audio_open = original
+
+    assert [len(b) for b in blocks] == [8_000, 8_000, 8_000]
+    assert source.buffers_read <= 25
+    assert source.closed
+
+
+if __name__ == "__main__":
+    print("🧪 Audio I/O Test Suite")
+    print("=" * 50)
+    test_windows_cover_blocks_exactly()
+    test_short_tail_is_dropped_unless_it_is_everything()
+    test_stream_audio_resamples_blocks_to_target_rate()
+    test_max_seconds_stops_compressed_decodes_early()
+    test_audioread_fallback_streams_and_stops_at_max_seconds()
+    print("✅ All audio I/O tests passed!")
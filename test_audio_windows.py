@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for Windowed Audio Analysis
+Checks that the window cap bounds how much of a long compressed recording is decoded
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models import audio_io
+from models.deepfake_detector import DeepFakeDetector
+from models.voice_activity import resolve_settings
+
+
+def test_window_cap_also_caps_the_decode():
+    """A 3-window cap reads about 4 windows of a 2-minute MP3, reports truncation and caches nothing"""
+    native_sr = 22_050
+    t = np.arange(native_sr * 120) / native_sr
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'podcast.mp3')
+        sf.write(path, (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), native_sr)
+
+        config = DeepFakeDetector._get_default_config(None)
+        config['history']['enabled'] = False
+        config['audio_model']['max_windows'] = 3
+        config['audio_model']['cache'].update(enabled=True, directory=os.path.join(tmp, 'cache'))
+        detector = DeepFakeDetector(config)
+        window_seconds = config['audio_model']['window_seconds']
+
+        frames_read = []
+        original = audio_io.sf.blocks
+        def counting_blocks(*args, **kwargs):
+            for block in original(*args, **kwargs):
+                frames_read.append(len(block))
+                yield block
+        audio_io.sf.blocks = counting_blocks
+        try:
+            totals = {}
+            vad = resolve_settings(config['audio_model']['vad'], False)
+            windows = sum(len(spans) for _, spans in detector._iter_speech_windows(path, vad, totals))
+        finally:
+            audio_io.sf.blocks = original
+        entries = detector.get_cache_stats()['entries']
+
+    decoded = sum(frames_read) / native_sr
+    print(f"  decoded {decoded:.1f}s of 120s for {windows} windows")
+    assert windows == 3
+    assert totals['truncated']
+    assert 0 < decoded <= 4 * window_seconds + 0.1
+    assert entries == 0
+
+
+if __name__ == "__main__":
+    print("🧪 Audio Windows Test Suite")
+    print("=" * 50)
+    test_window_cap_also_caps_the_decode()
+    print("✅ All audio window tests passed!")
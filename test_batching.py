@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script for Cross-File Batching
+Checks full-batch packing across files, score routing and failed-batch isolation
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.batching import BatchItem, ModelBatcher, InferenceQueue
+
+
+def _item(key, **inputs):
+    """Item whose samples are their own expected scores"""
+    return BatchItem(key, {name: np.asarray(x, dtype=np.float32) for name, x in inputs.items()},
+                     finish=lambda scores: {name: s.tolist() for name, s in scores.items()})
+
+
+def test_batches_are_full_and_scores_route_back():
+    """Samples from several files share batches; each file gets its own scores back"""
+    calls = []
+
+    def identity(batch):
+        calls.append(len(batch))
+        return batch
+
+    batcher = ModelBatcher({'image': identity, 'audio': identity}, {'image': 4, 'audio': 3})
+    completed = []
+    completed += batcher.add(_item('a', image=[0.1, 0.2, 0.3], audio=[0.5]))
+    completed += batcher.add(_item('b', image=[0.4, 0.6]))
+    completed += batcher.add(_item('c', image=[0.7, 0.8, 0.9], audio=[0.2, 0.3]))
+    assert calls == [4, 4, 3], calls
+    assert [item.key for item in completed] == ['b', 'a', 'c']
+
+    completed += batcher.add(_item('d', image=[0.5]))
+    assert batcher.pending() == 1
+    completed += batcher.flush()
+    assert calls == [4, 4, 3, 1]
+    assert batcher.pending() == 0
+
+    results = {item.key: item.finish(item.scores) for item in completed}
+    assert np.allclose(results['a']['image'], [0.1, 0.2, 0.3])
+    assert np.allclose(results['b']['image'], [0.4, 0.6])
+    assert np.allclose(results['c']['image'], [0.7, 0.8, 0.9])
+    assert np.allclose(results['c']['audio'], [0.2, 0.3])
+    assert np.allclose(results['d']['image'], [0.5])
+
+
+def test_item_without_samples_completes_immediately():
+    batcher = ModelBatcher({'audio': lambda batch: batch}, {'audio': 8})
+    item = _item('silent', audio=[])
+    assert batcher.add(item) == [item]
+    assert item.done and item.error is None
+
+
+def test_failed_batch_fails_only_its_items():
+    """A raising forward pass marks the files in that batch; later batches still run"""
+    state = {'calls': 0}
+
+    def flaky(batch):
+        state['calls'] += 1
+        if state['calls'] == 1:
+            raise RuntimeError("device lost")
+        return batch
+
+    batcher = ModelBatcher({'image': flaky}, {'image': 2})
+    completed = batcher.add(_item('a', image=[0.1, 0.2, 0.3]))
+    completed += batcher.add(_item('b', image=[0.4, 0.5]))
+    completed += batcher.flush()
+
+    by_key = {item.key: item for item in completed}
+    assert set(by_key) == {'a', 'b'}
+    assert 'device lost' in by_key['a'].error
+    assert by_key['b'].error is None
+    assert np.allclose(by_key['b'].scores['image'], [0.4, 0.5])
+    assert batcher.pending() == 0
+
+
+def test_queue_batches_concurrent_callers():
+    """Items submitted from many threads share full batches; a partial one runs after max_delay"""
+    calls = []
+
+    def identity(batch):
+        calls.append(len(batch))
+        return batch
+
+    queue = InferenceQueue({'image': identity}, {'image': 8}, max_delay=0.05)
+    items = [_item(i, image=[i / 100]) for i in range(20)]
+    futures = [None] * len(items)
+
+    def submit(i):
+        futures[i] = queue.submit(items[i])
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(items))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for i, future in enumerate(futures):
+        item = future.result(timeout=2)
+        assert item.error is None
+        assert np.isclose(item.scores['image'][0], i / 100)
+    assert max(calls) == 8 and sum(calls) == 20, calls
+
+
+def test_cancelled_request_never_reaches_the_model():
+    """Cancelling the awaiting task drops the request's queued samples"""
+    seen = []
+    release = threading.Event()
+
+    def slow(batch):
+        release.wait(2)
+        seen.extend(batch.tolist())
+        return batch
+
+    queue = InferenceQueue({'audio': slow}, {'audio': 2}, max_delay=0.01)
+
+    async def scenario():
+        first = asyncio.ensure_future(asyncio.wrap_future(queue.submit(_item('a', audio=[0.1, 0.2]))))
+        await asyncio.sleep(0.05)  # 'a' now occupies the model
+        doomed = asyncio.ensure_future(asyncio.wrap_future(queue.submit(_item('b', audio=[0.9]))))
+        await asyncio.sleep(0)
+        doomed.cancel()
+        release.set()
+        await first
+        await asyncio.sleep(0.1)
+        return doomed.cancelled()
+
+    assert asyncio.run(scenario())
+    assert np.allclose(seen, [0.1, 0.2]), seen
+
+
+if __name__ == "__main__":
+    print("🧪 Cross-File Batching Test Suite")
+    print("=" * 50)
+    test_batches_are_full_and_scores_route_back()
+    test_item_without_samples_completes_immediately()
+    test_failed_batch_fails_only_its_items()
+    test_queue_batches_concurrent_callers()
+    test_cancelled_request_never_reaches_the_model()
+    print("✅ All batching tests passed!")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for Cascaded Early Exit
+Checks the uncertainty band decision, accuracy audits and the early-exit metrics
+"""
+
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.cascade import CascadeMonitor
+
+
+def test_band_decides_escalation():
+    """Scores inside the band escalate, decisive scores exit"""
+    monitor = CascadeMonitor(band=(0.3, 0.7), audit_rate=0.0)
+    assert monitor.decide(0.5) == (True, False)
+    assert monitor.decide(0.3) == (True, False)
+    assert monitor.decide(0.1) == (False, False)
+    assert monitor.decide(0.95) == (False, False)
+
+
+def test_audits_escalate_decisive_screens():
+    """With audit_rate 1 every decisive screen also runs the full model"""
+    monitor = CascadeMonitor(band=(0.3, 0.7), audit_rate=1.0)
+    assert monitor.decide(0.05) == (True, True)
+
+
+def test_stats_report_exit_fraction_and_savings():
+    monitor = CascadeMonitor(band=(0.3, 0.7), audit_rate=0.0)
+    monitor.record('video', latency=2.0, screen_latency=0.1, exited=False,
+                   screen_confidence=0.5, full_confidence=0.8)
+    monitor.record('video', latency=4.0, screen_latency=0.1, exited=False,
+                   screen_confidence=0.9, full_confidence=0.7, audited=True)
+    monitor.record('video', latency=0.2, screen_latency=0.1, exited=True, screen_confidence=0.05)
+    monitor.record('video', latency=0.4, screen_latency=0.1, exited=True, screen_confidence=0.95)
+
+    video = monitor.stats()['modalities']['video']
+    print(f"  video: {video}")
+    assert video['requests'] == 4
+    assert video['early_exit_fraction'] == 0.5
+    assert abs(video['mean_full_latency'] - 3.0) < 1e-9
+    assert abs(video['latency_saved'] - (2 * 3.0 - 0.6)) < 1e-9
+    assert video['audits'] == 1 and video['audit_agreement'] == 1.0
+
+
+def test_band_must_straddle_threshold():
+    for band in ((0.6, 0.8), (0.7, 0.3), (-0.1, 0.5)):
+        try:
+            CascadeMonitor(band=band)
+        except ValueError:
+            continue
+        raise AssertionError(f"band {band} should be rejected")
+
+
+if __name__ == "__main__":
+    print("🧪 Cascade Test Suite")
+    print("=" * 50)
+    test_band_decides_escalation()
+    test_audits_escalate_decisive_screens()
+    test_stats_report_exit_fraction_and_savings()
+    test_band_must_straddle_threshold()
+    print("✅ All cascade tests passed!")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared detector instance
+Checks that a burst of simultaneous first requests builds the models exactly once
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import models.deepfake_detector as deepfake_detector
+
+BURST = 64
+
+
+class CountingDetector:
+    """Stands in for DeepFakeDetector: slow to build, counts its builds"""
+    builds = 0
+    fail_next = False
+    lock = threading.Lock()
+
+    def __init__(self):
+        time.sleep(0.2)  # a window in which an unlocked check would let others through
+        with CountingDetector.lock:
+            if CountingDetector.fail_next:
+                CountingDetector.fail_next = False
+                raise RuntimeError("model files missing")
+            CountingDetector.builds += 1
+
+
+def _burst():
+    barrier = threading.Barrier(BURST)
+    instances, errors = [], []
+
+    def first_request():
+        barrier.wait()
+        try:
+            instances.append(deepfake_detector.get_detector())
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=first_request) for _ in range(BURST)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return instances, errors
+
+
+def _with_counting_detector(test):
+    original = deepfake_detector.DeepFakeDetector
+    deepfake_detector.DeepFakeDetector = CountingDetector
+    deepfake_detector._detector_instance = None
+    CountingDetector.builds = 0
+    try:
+        test()
+    finally:
+        deepfake_detector.DeepFakeDetector = original
+        deepfake_detector._detector_instance = None
+
+
+def test_burst_of_first_requests_builds_once():
+    def run():
+        instances, errors = _burst()
+        assert not errors
+        assert CountingDetector.builds == 1, f"{CountingDetector.builds} detectors built"
+        assert len(instances) == BURST
+        assert all(instance is instances[0] for instance in instances)
+    _with_counting_detector(run)
+
+
+def test_failed_build_is_retried():
+    """Callers waiting on a build that raises try again rather than getting a half-built detector"""
+    def run():
+        CountingDetector.fail_next = True
+        instances, errors = _burst()
+        assert len(errors) == 1
+        assert CountingDetector.builds == 1
+        assert len(instances) == BURST - 1
+        assert all(instance is instances[0] for instance in instances)
+    _with_counting_detector(run)
+
+
+if __name__ == "__main__":
+    print("🧪 Detector Singleton Test Suite")
+    print("=" * 50)
+    test_burst_of_first_requests_builds_once()
+    test_failed_build_is_retried()
+    print("✅ All singleton tests passed!")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the Ensemble Engine
+Checks concurrent branch execution, weighted fusion and branch failure handling
+"""
+
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.ensemble import EnsembleEngine
+
+WEIGHTS = {'image': 0.4, 'video': 0.4, 'audio': 0.2}
+
+
+def _branch(confidence, seconds):
+    def run():
+        time.sleep(seconds)
+        return {'confidence': confidence}
+    return run
+
+
+def test_latency_tracks_slowest_branch():
+    """Sleeping branches overlap: wall time is near the slowest, not the sum"""
+    engine = EnsembleEngine(WEIGHTS, max_workers=3)
+    run = engine.start()
+    run.submit('video', _branch(0.9, 0.3))
+    run.submit('image', _branch(0.6, 0.2))
+    run.submit('audio', _branch(0.1, 0.1))
+    result = run.collect()
+
+    total = sum(b['latency'] for b in result['branches'].values())
+    print(f"  wall {result['latency']:.3f}s, sum of branches {total:.3f}s")
+    assert result['latency'] < 0.45 < total
+    assert abs(result['branches']['video']['latency'] - 0.3) < 0.1
+
+
+def test_weighted_fusion_renormalizes_over_present_branches():
+    engine = EnsembleEngine(WEIGHTS)
+    assert abs(engine.fuse({'video': 0.9, 'image': 0.6, 'audio': 0.1}) - 0.62) < 1e-9
+    assert abs(engine.fuse({'video': 0.9, 'audio': 0.3}) - 0.7) < 1e-9
+    assert EnsembleEngine(WEIGHTS, voting_method='max').fuse({'video': 0.2, 'audio': 0.7}) == 0.7
+
+
+def test_inapplicable_and_failed_branches_are_left_out():
+    """A None branch is skipped, a raising branch is reported, the rest still fuse"""
+    def broken():
+        raise RuntimeError("decoder crashed")
+
+    run = EnsembleEngine(WEIGHTS).start()
+    run.submit('video', _branch(0.8, 0))
+    run.submit('audio', lambda: None)
+    run.submit('image', broken)
+    result = run.collect()
+
+    assert set(result['branches']) == {'video'}
+    assert result['confidence'] == 0.8
+    assert 'decoder crashed' in result['errors']['image']
+
+    run = EnsembleEngine(WEIGHTS).start()
+    run.submit('image', broken)
+    try:
+        run.collect()
+    except RuntimeError:
+        return
+    raise AssertionError("a run where every branch fails should raise")
+
+
+if __name__ == "__main__":
+    print("🧪 Ensemble Engine Test Suite")
+    print("=" * 50)
+    test_latency_tracks_slowest_branch()
+    test_weighted_fusion_renormalizes_over_present_branches()
+    test_inapplicable_and_failed_branches_are_left_out()
+    print("✅ All ensemble tests passed!")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the Adaptive Frame Budget
+Checks that budgets follow duration, latency target and queue load
+"""
+
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.frame_budget import FrameBudgetPlanner
+
+
+def _probe(duration: float, width: int = 1280, height: int = 720, fps: float = 30.0) -> dict:
+    return {'frame_count': int(duration * fps), 'fps': fps, 'width': width,
+            'height': height, 'duration': duration}
+
+
+def test_short_clip_is_sampled_densely_without_degrading():
+    """A 3-second clip gets its full sampling density"""
+    budget = FrameBudgetPlanner().plan(_probe(3))
+    print(f"  3s clip: {budget}")
+    assert budget['max_frames'] == 8
+    assert not budget['degraded']
+
+
+def test_long_video_scales_with_duration_up_to_the_cap():
+    """Longer videos get more frames, bounded by max_frames"""
+    planner = FrameBudgetPlanner()
+    one_minute = planner.plan(_probe(60))['max_frames']
+    forty_minutes = planner.plan(_probe(40 * 60))
+    assert one_minute == 120
+    assert forty_minutes['max_frames'] == planner.max_frames
+
+
+def test_load_and_tight_deadlines_degrade_gracefully():
+    """Queue load and short latency targets shrink the budget, never below min_frames"""
+    planner = FrameBudgetPlanner()
+    idle = planner.plan(_probe(40 * 60))
+    loaded = planner.plan(_probe(40 * 60), queue_depth=20)
+    tight = planner.plan(_probe(40 * 60), latency_target=0.1)
+    print(f"  idle: {idle['max_frames']}, loaded: {loaded['max_frames']}, tight: {tight['max_frames']}")
+
+    assert loaded['max_frames'] < idle['max_frames'] and loaded['degraded']
+    assert tight['max_frames'] == planner.min_frames and tight['max_clips'] == 1
+
+
+def test_observed_costs_feed_back_into_plans():
+    """Slow measured inference lowers the clip budget"""
+    planner = FrameBudgetPlanner()
+    before = planner.plan(_probe(60), latency_target=4)['max_clips']
+    for _ in range(20):
+        planner.observe(clips=1, inference_seconds=2.0)
+    after = planner.plan(_probe(60), latency_target=4)['max_clips']
+    assert after < before
+
+
+if __name__ == "__main__":
+    print("🧪 Frame Budget Test Suite")
+    print("=" * 50)
+    test_short_clip_is_sampled_densely_without_degrading()
+    test_long_video_scales_with_duration_up_to_the_cap()
+    test_load_and_tight_deadlines_degrade_gracefully()
+    test_observed_costs_feed_back_into_plans()
+    print("✅ All frame budget tests passed!")
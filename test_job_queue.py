@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Test script for the Analysis Job Queue
+Checks that /api/analyze answers 202 at once and workers carry jobs through to completed or failed
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import api.app as server
+from api.job_store import JobStore
+from models.frame_budget import FrameBudgetPlanner
+
+
+def _slow_analysis(delay, fail_on=None):
+    """Stand-in for analyze_file that takes delay seconds"""
+    def analyze_file(file_path, file_type, options=None):
+        time.sleep(delay)
+        if fail_on and file_path.endswith(fail_on):
+            raise ValueError("corrupt file")
+        return {'prediction': 'authentic', 'confidence': 0.9, 'options': options}
+    return analyze_file
+
+
+def _wait_for(client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f'/api/jobs/{job_id}').get_json()
+        if job['status'] in ('completed', 'failed'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_analyze_returns_before_the_analysis_finishes():
+    original, original_store = server.analyze_file, server._job_store
+    server.analyze_file = _slow_analysis(0.5, fail_on='bad.png')
+    client = server.app.test_client()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            server._job_store = JobStore(os.path.join(tmp, 'jobs.db'))
+            jobs = {}
+            for name in ('good.png', 'bad.png'):
+                path = os.path.join(tmp, name)
+                open(path, 'wb').close()
+                jobs[name] = server.create_job_record(name, path, 'image', 0)
+
+            start = time.perf_counter()
+            response = client.post('/api/analyze', json={'job_id': jobs['good.png'], 'cascade': False})
+            elapsed = time.perf_counter() - start
+            print(f"  /api/analyze answered in {elapsed * 1000:.1f} ms")
+
+            assert response.status_code == 202
+            assert elapsed < 0.25
+            assert response.headers['Location'] == f"/api/jobs/{jobs['good.png']}"
+            assert response.get_json()['status'] == 'pending'
+
+            # Queued once: a second request for the same job is refused
+            again = client.post('/api/analyze', json={'job_id': jobs['good.png']})
+            assert again.status_code == 400
+
+            assert client.post('/api/analyze', json={'job_id': jobs['bad.png']}).status_code == 202
+
+            good = _wait_for(client, jobs['good.png'])
+            bad = _wait_for(client, jobs['bad.png'])
+            server._job_store.close()
+    finally:
+        server.analyze_file, server._job_store = original, original_store
+
+    assert good['status'] == 'completed'
+    assert good['result']['options']['cascade'] is False
+    assert good['result']['options']['queue_depth'] >= 0
+    assert good['queued_at'] <= good['started_at'] <= good['completed_at']
+    assert bad['status'] == 'failed'
+    assert bad['error'] == 'corrupt file'
+    assert bad['completed_at'] is not None
+
+
+def test_simulated_latency_is_spent_on_the_analysis_worker():
+    """A synthetic result's latency delays the job, not the request that queued it"""
+    original, original_store = server.analyze_file, server._job_store
+    server.analyze_file = lambda file_path, file_type, options=None: {
+        'prediction': 'authentic', 'confidence': 0.9, 'simulated_latency': 0.4}
+    client = server.app.test_client()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            server._job_store = JobStore(os.path.join(tmp, 'jobs.db'))
+            path = os.path.join(tmp, 'clip.mp4')
+            open(path, 'wb').close()
+            job_id = server.create_job_record('clip.mp4', path, 'video', 0)
+
+            start = time.perf_counter()
+            response = client.post('/api/analyze', json={'job_id': job_id})
+            answered = time.perf_counter() - start
+            job = _wait_for(client, job_id)
+            finished = time.perf_counter() - start
+            server._job_store.close()
+    finally:
+        server.analyze_file, server._job_store = original, original_store
+
+    print(f"  answered in {answered * 1000:.1f} ms, finished after {finished:.2f} s")
+    assert response.status_code == 202
+    assert answered < 0.25
+    assert job['status'] == 'completed'
+    assert finished >= 0.4
+
+
+def test_deep_queue_shrinks_the_frame_budget():
+    """Jobs started behind a backlog see its depth and plan fewer frames"""
+    gate = threading.Event()
+    depths = []
+
+    def analyze_file(file_path, file_type, options=None):
+        depths.append(options['queue_depth'])
+        gate.wait(10)
+        return {'prediction': 'authentic', 'confidence': 0.9}
+
+    original, original_store = server.analyze_file, server._job_store
+    server.analyze_file = analyze_file
+    client = server.app.test_client()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            server._job_store = JobStore(os.path.join(tmp, 'jobs.db'))
+            job_ids = []
+            for i in range(server.ANALYSIS_WORKERS + 4):
+                path = os.path.join(tmp, f'clip{i}.mp4')
+                open(path, 'wb').close()
+                job_ids.append(server.create_job_record(f'clip{i}.mp4', path, 'video', 0))
+                assert client.post('/api/analyze', json={'job_id': job_ids[-1]}).status_code == 202
+            gate.set()
+            for job_id in job_ids:
+                assert _wait_for(client, job_id)['status'] == 'completed'
+            server._job_store.close()
+    finally:
+        server.analyze_file, server._job_store = original, original_store
+
+    probe = {'frame_count': 40 * 60 * 30, 'fps': 30.0, 'width': 1280, 'height': 720, 'duration': 40 * 60.0}
+    planner = FrameBudgetPlanner()
+    idle = planner.plan(probe, latency_target=5, queue_depth=min(depths))['max_frames']
+    loaded = planner.plan(probe, latency_target=5, queue_depth=max(depths))['max_frames']
+    print(f"  queue depths seen: {depths}, frames {idle} -> {loaded}")
+    assert max(depths) >= 2
+    assert loaded < idle
+
+
+def test_jobs_lost_with_their_queue_are_failed():
+    """Jobs queued past the timeout, by a process that has since exited, stop looking pending"""
+    original_store = server._job_store
+    client = server.app.test_client()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            server._job_store = JobStore(os.path.join(tmp, 'jobs.db'))
+            lost = server.create_job_record('lost.png', os.path.join(tmp, 'lost.png'), 'image', 0)
+            recent = server.create_job_record('recent.png', os.path.join(tmp, 'recent.png'), 'image', 0)
+            unqueued = server.create_job_record('new.png', os.path.join(tmp, 'new.png'), 'image', 0)
+            stale = datetime.now() - timedelta(seconds=server.QUEUED_JOB_TIMEOUT + 60)
+            server._job_store.mark_queued(lost, stale.isoformat())
+            server._job_store.mark_queued(recent, datetime.now().isoformat())
+
+            assert server.fail_stale_jobs() == 1
+            jobs = {job_id: client.get(f'/api/jobs/{job_id}').get_json() for job_id in (lost, recent, unqueued)}
+            server._job_store.close()
+    finally:
+        server._job_store = original_store
+
+    assert jobs[lost]['status'] == 'failed'
+    assert 'submit the file again' in jobs[lost]['error']
+    assert jobs[lost]['completed_at'] is not None
+    assert jobs[recent]['status'] == 'pending'
+    assert jobs[unqueued]['status'] == 'pending'
+
+
+def test_workers_start_once_under_concurrent_requests():
+    threads = [threading.Thread(target=server.start_analysis_workers) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    alive = [worker for worker in server._analysis_workers if worker.is_alive()]
+    assert len(alive) == server.ANALYSIS_WORKERS
+
+
+if __name__ == "__main__":
+    print("🧪 Job Queue Test Suite")
+    print("=" * 50)
+    test_analyze_returns_before_the_analysis_finishes()
+    test_simulated_latency_is_spent_on_the_analysis_worker()
+    test_deep_queue_shrinks_the_frame_budget()
+    test_jobs_lost_with_their_queue_are_failed()
+    test_workers_start_once_under_concurrent_requests()
+    print("✅ All job queue tests passed!")
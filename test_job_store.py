@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for the Analysis Job Store
+Checks indexed listing, maintained counts and that jobs survive reopening and are shared between processes
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from api.job_store import JobStore, LISTED
+
+START = datetime(2026, 1, 1)
+FILE_TYPES = ('image', 'video', 'audio')
+
+
+def _job(i, status='pending'):
+    return {
+        'id': f'job-{i:05d}',
+        'filename': f'file{i}.bin',
+        'file_path': f'/uploads/file{i}.bin',
+        'file_type': FILE_TYPES[i % 3],
+        'file_size': i,
+        'status': status,
+        'created_at': (START + timedelta(seconds=i)).isoformat()
+    }
+
+
+def _filled_store(path, n):
+    store = JobStore(path)
+    for i in range(n):
+        store.create(_job(i, 'completed' if i % 2 else 'pending'))
+    return store
+
+
+def test_pages_are_newest_first_and_filtered():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _filled_store(os.path.join(tmp, 'jobs.db'), 300)
+
+        jobs, total, _ = store.page(limit=5)
+        assert total == 300
+        assert [job['id'] for job in jobs] == [f'job-{i:05d}' for i in range(299, 294, -1)]
+        assert set(jobs[0]) == set(LISTED)  # no file_path
+
+        jobs, total, _ = store.page(limit=10, offset=2, status='completed', file_type='video')
+        assert total == 50
+        assert all(job['status'] == 'completed' and job['file_type'] == 'video' for job in jobs)
+        assert jobs[0]['id'] == 'job-00283'
+
+        # Walking with the cursor visits each matching job once, in order
+        seen, cursor = [], None
+        while True:
+            jobs, _, cursor = store.page(limit=40, status='pending', cursor=cursor)
+            seen.extend(job['id'] for job in jobs)
+            if cursor is None:
+                break
+        assert seen == [f'job-{i:05d}' for i in range(298, -1, -2)]
+        store.close()
+
+
+def test_listing_uses_the_indexes():
+    """Filtered, ordered pages come straight off an index with no sort step"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, 'jobs.db'))
+        for where, params, index in (("", [], 'jobs_created'),
+                                     ("WHERE status = ?", ['pending'], 'jobs_status'),
+                                     ("WHERE file_type = ? AND (created_at, id) < (?, ?)",
+                                      ['image', 'x', 'y'], 'jobs_file_type')):
+            plan = ' '.join(row[-1] for row in store._conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM jobs {where} "
+                f"ORDER BY created_at DESC, id DESC LIMIT 10", params))
+            print(f"  {where or 'unfiltered'}: {plan}")
+            assert index in plan
+            assert 'TEMP B-TREE' not in plan
+        store.close()
+
+
+def test_counts_follow_status_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _filled_store(os.path.join(tmp, 'jobs.db'), 10)
+        assert store.counts() == {'pending': 5, 'processing': 0, 'completed': 5, 'failed': 0}
+
+        assert store.mark_queued('job-00000', 'now')
+        assert not store.mark_queued('job-00000', 'again')
+        assert store.update('job-00000', expect_status='pending', status='processing')
+        assert not store.update('job-00000', expect_status='pending', status='processing')
+        assert store.update('job-00000', status='failed', error='boom')
+
+        assert store.counts() == {'pending': 4, 'processing': 0, 'completed': 5, 'failed': 1}
+        assert store.page(status='failed')[1] == 1
+        assert store.get('job-00000')['error'] == 'boom'
+        store.close()
+
+
+def test_stale_queued_jobs_fail():
+    """Only pending jobs queued before the cutoff fail, and counts follow"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _filled_store(os.path.join(tmp, 'jobs.db'), 6)
+        store.mark_queued('job-00000', '2026-01-01T00:00:00')
+        store.mark_queued('job-00002', '2026-01-01T02:00:00')
+        store.update('job-00001', queued_at='2026-01-01T00:00:00')  # completed already
+
+        failed = store.fail_stale('2026-01-01T01:00:00', completed_at='2026-01-01T03:00:00', error='lost')
+
+        assert failed == ['job-00000']
+        assert store.get('job-00000')['status'] == 'failed'
+        assert store.get('job-00000')['error'] == 'lost'
+        assert store.get('job-00002')['status'] == 'pending'
+        assert store.counts() == {'pending': 2, 'processing': 0, 'completed': 3, 'failed': 1}
+        assert store.fail_stale('2026-01-01T01:00:00', completed_at='x', error='lost') == []
+        store.close()
+
+
+def test_jobs_persist_and_are_shared():
+    """A second store on the same file, as in another worker, sees every write"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'jobs.db')
+        first = JobStore(path)
+        second = JobStore(path)
+        first.create(_job(1))
+        second.update('job-00001', status='completed', result={'prediction': 'authentic', 'confidence': 0.9})
+        assert first.get('job-00001')['result'] == {'prediction': 'authentic', 'confidence': 0.9}
+        first.close()
+        second.close()
+
+        reopened = JobStore(path)
+        assert reopened.get('job-00001')['status'] == 'completed'
+        assert reopened.counts()['completed'] == 1
+        reopened.close()
+
+
+if __name__ == "__main__":
+    print("🧪 Job Store Test Suite")
+    print("=" * 50)
+    test_pages_are_newest_first_and_filtered()
+    test_listing_uses_the_indexes()
+    test_counts_follow_status_changes()
+    test_stale_queued_jobs_fail()
+    test_jobs_persist_and_are_shared()
+    print("✅ All job store tests passed!")
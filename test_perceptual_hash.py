@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for the Perceptual Hash Index
+Checks hash robustness to re-encoding, exact agreement with a linear scan and near-duplicate reuse
+"""
+
+import os
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.perceptual_hash import PerceptualIndex, perceptual_hash, hamming
+
+
+def _picture(seed: int) -> np.ndarray:
+    """Smooth random BGR picture, structured like a photo rather than noise"""
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 255, (12, 16, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(cv2.resize(coarse, (640, 480), interpolation=cv2.INTER_CUBIC), (9, 9), 0)
+
+
+def _copies(image: np.ndarray):
+    """Re-encoded, resized and lightly cropped versions of a picture"""
+    _, jpeg = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 60])
+    yield cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+    yield cv2.resize(image, (320, 240), interpolation=cv2.INTER_AREA)
+    yield image[8:-8, 10:-10]
+
+
+def test_hash_survives_reencoding_but_separates_pictures():
+    original = _picture(1)
+    value = perceptual_hash(original)
+    distances = [hamming(value, perceptual_hash(copy)) for copy in _copies(original)]
+    others = [hamming(value, perceptual_hash(_picture(seed))) for seed in range(2, 12)]
+    print(f"  copies: {distances}, other pictures: min {min(others)}")
+    assert max(distances) <= 6
+    assert min(others) > 12
+
+
+def test_index_matches_a_linear_scan():
+    rng = np.random.default_rng(0)
+    values = [int(v) for v in rng.integers(0, 2 ** 63, 20000, dtype=np.int64)]
+    index = PerceptualIndex(max_distance=6)
+    for i, value in enumerate(values):
+        index.add(value, i)
+
+    for i in rng.integers(0, len(values), 300):
+        query = values[i]
+        for bit in rng.choice(64, size=int(rng.integers(0, 9)), replace=False):
+            query ^= 1 << int(bit)
+        distances = [hamming(query, value) for value in values]
+        best = min(distances)
+        match = index.query(query)
+        if best > 6:
+            assert match is None
+        else:
+            assert match is not None and match[1] == best
+            assert distances[match[0]] == best
+
+
+def test_removed_payloads_stop_matching():
+    rng = np.random.default_rng(1)
+    values = [int(v) for v in rng.integers(0, 2 ** 63, 1000, dtype=np.int64)]
+    index = PerceptualIndex(max_distance=6)
+    for i, value in enumerate(values):
+        index.add(value, i)
+
+    assert index.remove(range(0, 400)) == 400
+    assert len(index) == 600
+    assert index.query(values[10]) is None
+    assert index.query(values[500]) == (500, 0)
+
+    # Past half dead, the tables are rebuilt from the live entries
+    assert index.remove(range(400, 900)) == 500
+    assert len(index._payloads) == len(index) == 100
+    assert index.query(values[800]) is None
+    assert index.query(values[950]) == (950, 0)
+    assert index.remove([950, 950, 'missing']) == 1
+
+
+def test_resized_copy_reuses_the_cached_result():
+    from models.deepfake_detector import DeepFakeDetector
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = DeepFakeDetector._get_default_config(None)
+        config['history']['enabled'] = False
+        config['audio_model']['cache']['enabled'] = False
+        config['result_cache']['path'] = os.path.join(tmp, 'results.db')
+        detector = DeepFakeDetector(config)
+
+        original = os.path.join(tmp, 'original.png')
+        copy = os.path.join(tmp, 'copy.jpg')
+        unrelated = os.path.join(tmp, 'unrelated.png')
+        cv2.imwrite(original, _picture(1))
+        cv2.imwrite(copy, cv2.resize(_picture(1), (400, 300)), [cv2.IMWRITE_JPEG_QUALITY, 70])
+        cv2.imwrite(unrelated, _picture(2))
+
+        first = detector.analyze_file(original, 'image')
+        second = detector.analyze_file(copy, 'image')
+        third = detector.analyze_file(unrelated, 'image')
+
+    print(f"  near duplicate: {second.get('near_duplicate')}")
+    assert second['cached'] is True
+    assert second['near_duplicate']['phash'] == first['phash']
+    assert second['near_duplicate']['distance'] <= 6
+    assert second['confidence'] == first['confidence']
+    assert 'near_duplicate' not in third
+
+
+def test_evicted_results_leave_the_index():
+    """Once the cache evicts a result, a copy of that picture is analyzed afresh"""
+    from models.deepfake_detector import DeepFakeDetector
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = DeepFakeDetector._get_default_config(None)
+        config['history']['enabled'] = False
+        config['audio_model']['cache']['enabled'] = False
+        config['result_cache']['path'] = os.path.join(tmp, 'results.db')
+        detector = DeepFakeDetector(config)
+
+        paths = {}
+        for name, image in (('original.png', _picture(1)), ('unrelated.png', _picture(2)),
+                            ('copy.jpg', cv2.resize(_picture(1), (400, 300)))):
+            paths[name] = os.path.join(tmp, name)
+            cv2.imwrite(paths[name], image)
+
+        detector.analyze_file(paths['original.png'], 'image')
+        # Room on disk for one result only
+        detector._result_cache.max_bytes = int(detector._result_cache.stats()['bytes'] * 1.5)
+        detector.analyze_file(paths['unrelated.png'], 'image')
+        index, = detector._phash_indexes.values()
+        indexed = len(index)
+        copy = detector.analyze_file(paths['copy.jpg'], 'image')
+
+    assert detector._result_cache.evictions >= 1
+    assert indexed == 1
+    assert 'near_duplicate' not in copy
+    assert copy.get('cached') is not True
+
+
+if __name__ == "__main__":
+    print("🧪 Perceptual Hash Test Suite")
+    print("=" * 50)
+    test_hash_survives_reencoding_but_separates_pictures()
+    test_index_matches_a_linear_scan()
+    test_removed_payloads_stop_matching()
+    test_resized_copy_reuses_the_cached_result()
+    test_evicted_results_leave_the_index()
+    print("✅ All perceptual hash tests passed!")
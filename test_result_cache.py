@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the Analysis Result Cache
+Checks LRU tiers, size-bounded eviction, sharing between processes and reuse for repeated uploads
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import cv2
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.result_cache import ResultCache, cache_key
+
+
+def _result(confidence: float, padding: int = 0) -> dict:
+    return {'prediction': 'deepfake', 'confidence': confidence, 'evidence': {'note': 'x' * padding}}
+
+
+def test_memory_tier_is_lru_and_disk_tier_backs_it():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(os.path.join(tmp, 'results.db'), memory_entries=2)
+        for i in range(3):
+            cache.put(f"k{i}", _result(i / 10))
+
+        assert cache.get('k2')['cache_tier'] == 'memory'
+        hit = cache.get('k0')  # pushed out of memory by k2, still on disk
+        assert hit['cache_tier'] == 'disk' and hit['confidence'] == 0.0
+        assert cache.get('k0')['cache_tier'] == 'memory'  # promoted
+        assert cache.get('missing') is None
+
+        stats = cache.stats()
+        assert stats['memory_hits'] == 2 and stats['disk_hits'] == 1 and stats['misses'] == 1
+        cache.close()
+
+
+def test_disk_tier_evicts_least_recently_used_over_max_bytes():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'results.db')
+        cache = ResultCache(path, memory_entries=1, max_bytes=3500)
+        for i in range(3):
+            cache.put(f"k{i}", _result(0.5, padding=1000))
+            time.sleep(0.01)
+        cache.get('k0')  # most recently used now
+        cache.put('k3', _result(0.5, padding=1000))
+
+        stats = cache.stats()
+        assert stats['bytes'] <= 3500 and stats['disk_entries'] == 3, stats
+        assert stats['evictions'] == 1
+        cache.close()
+
+        reopened = ResultCache(path, memory_entries=1, max_bytes=3500)
+        assert reopened.get('k1') is None
+        assert reopened.get('k0') is not None
+        reopened.close()
+
+
+def test_workers_share_the_disk_tier():
+    """A result one worker stored is a disk hit for another opening the same file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'results.db')
+        key = cache_key('0' * 64, '2.0.0', 'config', 'image', {})
+        first, second = ResultCache(path), ResultCache(path)
+        first.put(key, _result(0.75))
+
+        hit = second.get(key)
+        assert hit['confidence'] == 0.75 and hit['cache_tier'] == 'disk'
+        first.close()
+        second.close()
+
+
+def test_repeated_upload_is_served_from_the_cache():
+    """The second analysis of the same bytes is a millisecond lookup marked as cached"""
+    from models.deepfake_detector import DeepFakeDetector
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = DeepFakeDetector._get_default_config(None)
+        config['history']['enabled'] = False
+        config['audio_model']['cache']['enabled'] = False
+        config['result_cache']['path'] = os.path.join(tmp, 'results.db')
+        detector = DeepFakeDetector(config)
+
+        path = os.path.join(tmp, 'upload.png')
+        cv2.imwrite(path, np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8))
+        first = detector.analyze_file(path, 'image')
+        second = detector.analyze_file(path, 'image')
+        # A different request setting is a different key
+        third = detector.analyze_file(path, 'image', {'cascade': True})
+
+    print(f"  miss {first['processing_time'] * 1000:.1f} ms, hit {second['processing_time'] * 1000:.2f} ms")
+    assert 'cached' not in first
+    assert second['cached'] is True and second['cache_tier'] == 'memory'
+    assert second['confidence'] == first['confidence']
+    assert second['processing_time'] < 0.05
+    assert 'cached' not in third
+
+
+def test_audio_analysis_hashes_the_file_once():
+    """The result cache and the audio cache share one content digest per analysis"""
+    import soundfile as sf
+    from models import audio_cache
+    from models.deepfake_detector import DeepFakeDetector
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = DeepFakeDetector._get_default_config(None)
+        config['history']['enabled'] = False
+        config['audio_model']['cache'].update(enabled=True, directory=os.path.join(tmp, 'audio'))
+        config['result_cache']['path'] = os.path.join(tmp, 'results.db')
+        detector = DeepFakeDetector(config)
+
+        path = os.path.join(tmp, 'speech.wav')
+        t = np.arange(5 * 16000) / 16000
+        sf.write(path, (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), 16000)
+
+        opened = []
+        def counting_open(file, *args, **kwargs):
+            opened.append(file)
+            return open(file, *args, **kwargs)
+        audio_cache.open = counting_open
+        try:
+            result = detector.analyze_file(path, 'audio')
+        finally:
+            del audio_cache.open
+
+    assert result['prediction'] != 'error'
+    assert opened.count(path) == 1
+
+
+if __name__ == "__main__":
+    print("🧪 Result Cache Test Suite")
+    print("=" * 50)
+    test_memory_tier_is_lru_and_disk_tier_backs_it()
+    test_disk_tier_evicts_least_recently_used_over_max_bytes()
+    test_workers_share_the_disk_tier()
+    test_repeated_upload_is_served_from_the_cache()
+    test_audio_analysis_hashes_the_file_once()
+    print("✅ All result cache tests passed!")
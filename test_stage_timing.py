@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for Stage Timing
+Checks per-stage accumulation, context propagation into branch threads and histogram percentiles
+"""
+
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.stage_timing import StageTimer, StageHistograms, timing, stage, timed_iter
+from models.ensemble import EnsembleEngine
+
+
+def test_stages_accumulate_into_the_active_timer():
+    timer = StageTimer()
+    with stage('decode'):
+        time.sleep(0.01)  # no active timer: not recorded anywhere
+    with timing(timer):
+        for _ in range(3):
+            with stage('decode'):
+                time.sleep(0.01)
+        with stage('inference'):
+            time.sleep(0.02)
+        assert list(timed_iter(iter([1, 2]), 'read')) == [1, 2]
+
+    breakdown = timer.breakdown()
+    print(f"  {breakdown}")
+    assert 0.03 <= breakdown['decode'] < 0.06
+    assert 0.02 <= breakdown['inference'] < 0.04
+    assert 'read' in breakdown
+    assert list(breakdown)[:3] == ['read', 'decode', 'inference']
+    assert breakdown['total'] >= breakdown['decode'] + breakdown['inference']
+
+
+def test_ensemble_branches_record_into_the_callers_timer():
+    """Branch threads inherit the submitting context, so their stages land in the request's timer"""
+    def branch():
+        with stage('inference'):
+            time.sleep(0.02)
+        return {'confidence': 0.5}
+
+    timer = StageTimer()
+    with timing(timer):
+        run = EnsembleEngine({'image': 0.5, 'video': 0.5}, max_workers=2).start()
+        run.submit('image', branch)
+        run.submit('video', branch)
+        run.collect()
+
+    # Two overlapping branches each count in full
+    assert timer.stages['inference'] >= 0.04
+
+
+def test_histogram_percentiles_follow_buckets():
+    histograms = StageHistograms()
+    for seconds in [0.001] * 90 + [1.0] * 10:
+        histograms.observe('image', {'inference': seconds, 'total': seconds * 2})
+
+    inference = histograms.snapshot()['image']['inference']
+    assert inference['count'] == 100
+    assert abs(inference['mean'] - 0.1009) < 1e-9
+    assert inference['p50'] == 0.001
+    assert inference['p95'] == 1.0
+    assert sum(count for _, count in inference['buckets']) == 100
+
+    histograms.observe('image', {'inference': 500.0})
+    assert histograms.snapshot()['image']['inference']['buckets'][-1] == [None, 1]
+
+
+if __name__ == "__main__":
+    print("🧪 Stage Timing Test Suite")
+    print("=" * 50)
+    test_stages_accumulate_into_the_active_timer()
+    test_ensemble_branches_record_into_the_callers_timer()
+    test_histogram_percentiles_follow_buckets()
+    print("✅ All stage timing tests passed!")
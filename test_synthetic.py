@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for the Synthetic Backend
+Checks seeded reproducibility, result distributions and non-blocking simulated latency
+"""
+
+import os
+import sys
+import time
+import asyncio
+import multiprocessing
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.synthetic import SyntheticBackend
+
+_preloaded = None
+
+
+def _synthetic_detector(seed: int = 7, latency: dict = None):
+    from models.deepfake_detector import DeepFakeDetector
+    config = DeepFakeDetector._get_default_config(None)
+    config['history']['enabled'] = False
+    config['result_cache']['enabled'] = False
+    config['audio_model']['cache']['enabled'] = False
+    config['synthetic'].update(enabled=True, seed=seed)
+    if latency is not None:
+        config['synthetic']['latency'] = latency
+    config['batch']['workers'] = 2
+    return DeepFakeDetector(config)
+
+
+def test_same_seed_and_worker_replay_the_same_results():
+    first = SyntheticBackend(seed=3).results('image', 300)
+    again = SyntheticBackend(seed=3)
+    replay = [again.result('image') for _ in range(300)]
+    other_worker = SyntheticBackend(seed=3, worker=1).results('image', 300)
+
+    assert first == replay  # in one call or row by row, the stream is the same
+    assert [r['confidence'] for r in other_worker] != [r['confidence'] for r in first]
+
+
+def _forked_confidences(worker_env=None):
+    """Draw from the preloaded backend in a forked process"""
+    if worker_env is not None:
+        os.environ['SYNTHETIC_WORKER'] = worker_env
+    return [r['confidence'] for r in _preloaded.results('image', 50)]
+
+
+def _in_fork(*args):
+    with multiprocessing.get_context('fork').Pool(1) as pool:
+        return pool.apply(_forked_confidences, args)
+
+
+def test_forked_workers_draw_their_own_streams():
+    """A backend built before a fork, as under gunicorn --preload, gives each child a distinct stream"""
+    global _preloaded
+    _preloaded = SyntheticBackend(seed=5)
+    os.environ.pop('SYNTHETIC_WORKER', None)
+    parent = [r['confidence'] for r in _preloaded.results('image', 50)]
+
+    first, second = _in_fork(), _in_fork()
+    assert first != parent and second != parent and first != second
+
+    numbered = _in_fork('2')
+    assert numbered == [r['confidence'] for r in SyntheticBackend(seed=5, worker=2).results('image', 50)]
+    # The parent's stream carries on where it stopped
+    assert _preloaded.results('image', 50) == SyntheticBackend(seed=5, worker=0).results('image', 100)[50:]
+
+
+def test_result_distribution_matches_the_mock_profiles():
+    backend = SyntheticBackend(seed=11)
+    start = time.perf_counter()
+    results = backend.results('video', 20000)
+    elapsed = time.perf_counter() - start
+    print(f"  20000 video results in {elapsed * 1000:.1f} ms")
+
+    authentic = np.mean([r['is_authentic'] for r in results])
+    confidence = np.array([r['confidence'] for r in results])
+    latency = np.array([r['simulated_latency'] for r in results])
+    assert 0.52 < authentic < 0.58
+    assert confidence.min() >= 0.45 and confidence.max() <= 0.95
+    assert set(results[0]['evidence']) == {'temporal_artifacts', 'frame_consistency', 'compression_anomalies'}
+    assert all(0 <= v <= 1 for r in results[:500] for v in r['evidence'].values())
+    assert abs(np.median(latency) - 6.0) < 0.3
+
+
+def test_synthetic_detector_is_deterministic_without_models():
+    a, b = _synthetic_detector(), _synthetic_detector()
+    assert a.models['image'] == 'mock_image_model'
+    runs = [[d.analyze_file(f'/nonexistent/{i}.mp4', 'video')['confidence'] for i in range(20)] for d in (a, b)]
+    assert runs[0] == runs[1]
+
+    result = a.analyze_file('/nonexistent/clip.wav', 'audio')
+    assert result['file_type'] == 'audio' and result['simulated_latency'] > 0
+
+
+def test_cached_results_carry_no_simulated_latency():
+    import tempfile
+    from models.deepfake_detector import DeepFakeDetector
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = DeepFakeDetector._get_default_config(None)
+        config['history']['enabled'] = False
+        config['audio_model']['cache']['enabled'] = False
+        config['result_cache']['path'] = os.path.join(tmp, 'results.db')
+        config['synthetic'].update(enabled=True, seed=7)
+        detector = DeepFakeDetector(config)
+
+        path = os.path.join(tmp, 'clip.wav')
+        with open(path, 'wb') as f:
+            f.write(b'RIFF')
+        fresh = detector.analyze_file(path, 'audio')
+        reused = detector.analyze_file(path, 'audio')
+
+    assert fresh['simulated_latency'] > 0
+    assert reused['cached'] is True
+    assert 'simulated_latency' not in reused
+    assert reused['confidence'] == fresh['confidence']
+
+
+def test_async_latency_does_not_hold_threads():
+    """100 requests of ~0.2 s each finish in far less than 100 x 0.2 s on two decode threads"""
+    detector = _synthetic_detector(latency={'image': {'median': 0.2, 'sigma': 0.1}})
+    paths = [f'/nonexistent/{i}.jpg' for i in range(100)]
+
+    async def run():
+        return [r async for r in detector.analyze_files_async(paths)]
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    print(f"  100 simulated analyses in {elapsed:.2f} s")
+    assert len(results) == 100
+    assert all(r['prediction'] in ('authentic', 'deepfake') for r in results)
+    assert elapsed < 2.0
+
+
+if __name__ == "__main__":
+    print("🧪 Synthetic Backend Test Suite")
+    print("=" * 50)
+    test_same_seed_and_worker_replay_the_same_results()
+    test_forked_workers_draw_their_own_streams()
+    test_result_distribution_matches_the_mock_profiles()
+    test_synthetic_detector_is_deterministic_without_models()
+    test_cached_results_carry_no_simulated_latency()
+    test_async_latency_does_not_hold_threads()
+    print("✅ All synthetic backend tests passed!")